@@ -6,29 +6,78 @@ class PerformanceMetrics:
     def __init__(self, trade_history: pd.DataFrame, 
                  market_data: pd.DataFrame,
                  initial_capital: float):
+        self._equity_curve = None
+        self._returns = None
+        self._metrics = None
         self.trade_history = trade_history
-        self.market_data = market_data.copy()  # Create a copy to avoid modifying original
+        self.market_data = market_data
         self.initial_capital = initial_capital
         
+    @property
+    def trade_history(self) -> pd.DataFrame:
+        return self._trade_history
+    
+    @trade_history.setter
+    def trade_history(self, trade_history: pd.DataFrame):
+        self._trade_history = trade_history
+        self.invalidate()
+    
+    @property
+    def market_data(self) -> pd.DataFrame:
+        return self._market_data
+    
+    @market_data.setter
+    def market_data(self, market_data: pd.DataFrame):
+        self._market_data = market_data.copy()  # Create a copy to avoid modifying original
+        
         # Ensure market data index is in the correct format
-        if not isinstance(self.market_data.index, pd.DatetimeIndex):
-            self.market_data.index = pd.to_datetime(self.market_data.index, unit='ms')
+        if not isinstance(self._market_data.index, pd.DatetimeIndex):
+            self._market_data.index = pd.to_datetime(self._market_data.index, unit='ms')
+        self.invalidate()
+    
+    @property
+    def initial_capital(self) -> float:
+        return self._initial_capital
+    
+    @initial_capital.setter
+    def initial_capital(self, initial_capital: float):
+        self._initial_capital = initial_capital
+        self.invalidate()
+    
+    def invalidate(self):
+        """Drop the cached equity curve and metrics
+        
+        Called automatically when the trade history, market data or initial
+        capital is reassigned; call it after mutating either frame in place.
+        """
+        self._equity_curve = None
+        self._returns = None
+        self._metrics = None
+    
+    @property
+    def equity_curve(self) -> pd.Series:
+        """Daily portfolio values, built once and cached"""
+        if self._equity_curve is None:
+            self._update_equity_curve()
+        return self._equity_curve
         
     def calculate_returns(self) -> pd.Series:
         """Calculate portfolio returns"""
+        if self._returns is None:
+            self._update_equity_curve()
+        return self._returns
+    
+    def _update_equity_curve(self):
+        """Build the equity curve and daily returns and cache both"""
         if len(self.trade_history) == 0:
-            return pd.Series(0, index=self.market_data.index)
+            self._equity_curve = pd.Series(float(self.initial_capital), index=self.market_data.index)
+            self._returns = pd.Series(0, index=self.market_data.index)
+            return
             
         # Sort trade history by timestamp and convert timestamps
-        self.trade_history = self.trade_history.sort_values('timestamp')
+        self._trade_history = self.trade_history.sort_values('timestamp')
         trade_dates = pd.to_datetime(self.trade_history['timestamp'], unit='ms')
         
-        # Initialize portfolio tracking
-        portfolio_value = self.initial_capital
-        portfolio_holdings = 0
-        daily_values = []
-        dates = []
-        
         # Create a date range for all trading days
         date_range = pd.date_range(
             start=self.market_data.index.min(),
@@ -36,45 +85,44 @@ class PerformanceMetrics:
             freq='D'
         )
         
-        for date in date_range:
-            # Get trades for this date
-            daily_trades = self.trade_history[
-                trade_dates.dt.date == date.date()
-            ]
-            
-            # Process trades for the day
-            for _, trade in daily_trades.iterrows():
-                if trade['type'] == 'buy':
-                    portfolio_value -= trade['quantity'] * trade['price']
-                    portfolio_holdings += trade['quantity']
-                else:  # sell
-                    portfolio_value += trade['quantity'] * trade['price']
-                    portfolio_holdings -= trade['quantity']
-            
-            # Find the closest market data point for this date
-            try:
-                closest_date = self.market_data.index[
-                    self.market_data.index.get_indexer([date], method='nearest')
-                ][0]
-                current_price = self.market_data.loc[closest_date]['price_usd_close']
-                
-                # Calculate end-of-day portfolio value including holdings
-                total_value = portfolio_value + (portfolio_holdings * current_price)
-                
-                daily_values.append(total_value)
-                dates.append(date)
-                
-            except (KeyError, IndexError):
-                continue  # Skip dates where we don't have market data
-            
+        values_series = self._build_equity_curve(trade_dates, date_range)
+        self._equity_curve = values_series
+        
         # Calculate daily returns
-        if not daily_values:  # If no valid data points
-            return pd.Series(0, index=date_range)
+        if len(values_series) == 0:  # If no valid data points
+            self._returns = pd.Series(0, index=date_range)
+            return
             
-        values_series = pd.Series(daily_values, index=dates)
-        returns = values_series.pct_change().fillna(0)
+        self._returns = values_series.pct_change().fillna(0)
+    
+    def _build_equity_curve(self, trade_dates: pd.Series,
+                            date_range: pd.DatetimeIndex) -> pd.Series:
+        """Build end-of-day portfolio values from cumulative trade deltas"""
+        trade_days = trade_dates.dt.normalize().to_numpy()
+        days = date_range.normalize().to_numpy()
+        
+        # Only trades that fall on a day in the range are ever applied
+        in_range = (trade_days >= days[0]) & (trade_days <= days[-1])
+        trades = self.trade_history[in_range]
+        is_buy = (trades['type'] == 'buy').to_numpy()
+        quantity = trades['quantity'].to_numpy(dtype=float)
+        value = quantity * trades['price'].to_numpy(dtype=float)
+        
+        # Running cash and holdings after each trade, accumulated in trade order
+        cash = np.cumsum(np.concatenate(([self.initial_capital], np.where(is_buy, -value, value))))
+        holdings = np.cumsum(np.concatenate(([0.0], np.where(is_buy, quantity, -quantity))))
+        
+        # Number of trades applied by the end of each day
+        applied = np.searchsorted(trade_days[in_range], days, side='right')
         
-        return returns
+        # Price at the market data point closest to each day, in one lookup
+        closest = self.market_data.index.get_indexer(date_range, method='nearest')
+        prices = self.market_data['price_usd_close'].to_numpy(dtype=float)[closest]
+        
+        # Calculate end-of-day portfolio value including holdings
+        total_value = cash[applied] + (holdings[applied] * prices)
+        
+        return pd.Series(total_value, index=pd.DatetimeIndex(date_range.to_numpy()))
     
     def calculate_sharpe_ratio(self, risk_free_rate: float = 0.02) -> float:
         """Calculate Sharpe ratio"""
@@ -117,6 +165,9 @@ class PerformanceMetrics:
     
     def calculate_metrics(self) -> Dict[str, float]:
         """Calculate all performance metrics"""
+        if self._metrics is not None:
+            return dict(self._metrics)
+            
         returns = self.calculate_returns()
         total_return = float((1 + returns).prod() - 1) if len(returns) > 0 else 0.0
         
@@ -134,7 +185,8 @@ class PerformanceMetrics:
             if not np.isfinite(metrics[key]):
                 metrics[key] = 0.0
                 
-        return metrics
+        self._metrics = metrics
+        return dict(metrics)
     
     def generate_report(self) -> str:
         """Generate a performance report"""
@@ -151,4 +203,47 @@ Win Rate: {metrics['win_rate']:.2%}
 Total Trades: {metrics['total_trades']}
 Average Trade Return: ${metrics['avg_trade_return']:,.2f}
 """
-        return report
\ No newline at end of file
+        return report
+
+class PortfolioMetrics(PerformanceMetrics):
+    """Performance metrics of a multi-asset portfolio
+
+    market_data holds one close price column per symbol; trades are
+    marked to market against the column of their symbol.
+    """
+    
+    def _build_equity_curve(self, trade_dates: pd.Series,
+                            date_range: pd.DatetimeIndex) -> pd.Series:
+        """Build end-of-day portfolio values from cumulative trade deltas"""
+        trade_days = trade_dates.dt.normalize().to_numpy()
+        days = date_range.normalize().to_numpy()
+        
+        # Only trades that fall on a day in the range are ever applied
+        in_range = (trade_days >= days[0]) & (trade_days <= days[-1])
+        trades = self.trade_history[in_range]
+        is_buy = (trades['type'] == 'buy').to_numpy()
+        quantity = trades['quantity'].to_numpy(dtype=float)
+        value = quantity * trades['price'].to_numpy(dtype=float)
+        
+        # Running cash, and holdings per symbol, after each trade
+        cash = np.cumsum(np.concatenate(([self.initial_capital], np.where(is_buy, -value, value))))
+        symbols = list(self.market_data.columns)
+        column = pd.Categorical(trades['symbol'], categories=symbols).codes
+        if (column < 0).any():
+            raise ValueError("Trades for symbols without price data: "
+                             f"{sorted(set(trades['symbol'][column < 0]))}")
+        deltas = np.zeros((len(trades) + 1, len(symbols)))
+        deltas[np.arange(1, len(trades) + 1), column] = np.where(is_buy, quantity, -quantity)
+        holdings = np.cumsum(deltas, axis=0)
+        
+        # Number of trades applied by the end of each day
+        applied = np.searchsorted(trade_days[in_range], days, side='right')
+        
+        # Prices closest to each day; an asset is worth its last price after
+        # its data ends and nothing before it starts
+        closest = self.market_data.index.get_indexer(date_range, method='nearest')
+        prices = self.market_data.ffill().fillna(0).to_numpy(dtype=float)[closest]
+        
+        total_value = cash[applied] + (holdings[applied] * prices).sum(axis=1)
+        
+        return pd.Series(total_value, index=pd.DatetimeIndex(date_range.to_numpy()))
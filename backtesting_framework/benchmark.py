@@ -0,0 +1,253 @@
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+import pandas as pd
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Union
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from backtesting_framework.analysis.metrics import PerformanceMetrics
+
+DATA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'market_data'
+STAGES = ('load', 'featurize', 'signal', 'execute', 'metrics')
+DEFAULT_SCALES = (1, 10, 100, 1000)
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def make_scaled_dataset(data_path: Union[str, Path], target: Union[str, Path],
+                        scale: int, symbol: str = 'BTC') -> Path:
+    """Write a copy of a symbol's source files with every file repeated scale times
+
+    Each repetition is shifted forward by the span of the whole dataset,
+    and the result is squeezed back into that span by dividing the offsets
+    by scale: longer spans would run past the datetimes pandas can hold
+    (year 2262). Equal timestamps stay equal, so the files stay aligned on
+    start_time, with scale times as many bars. Values are repeated as they
+    are.
+    """
+    target = Path(target)
+    target.mkdir(parents=True, exist_ok=True)
+    files = DataLoader(data_path).source_files(symbol)
+    frames = {file: pd.read_csv(file) for file in files if file.exists()}
+
+    first = min(int(df['start_time'].min()) for df in frames.values())
+    last = max(int(df['start_time'].max()) for df in frames.values())
+    span = last - first + DAY_MS
+
+    for file, df in frames.items():
+        copies = np.repeat(np.arange(scale, dtype=np.int64), len(df))
+        scaled = df.iloc[np.tile(np.arange(len(df)), scale)].reset_index(drop=True)
+        offsets = scaled['start_time'].to_numpy(dtype=np.int64) - first + copies * span
+        scaled['start_time'] = first + offsets // scale
+        scaled.to_csv(target / file.name, index=False)
+    return target
+
+
+def _measure(func: Callable[[], Any], trace_memory: bool):
+    """Run func once, returning its result, wall seconds and peak traced bytes"""
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        result = func()
+    finally:
+        seconds = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+        if trace_memory:
+            tracemalloc.stop()
+    return result, seconds, peak
+
+
+def _run_pipeline(data_path: Path, symbol: str, execution: str,
+                  trace_memory: bool) -> Dict[str, Any]:
+    """Run every stage once on fresh objects, so no cache is reused"""
+    strategy = NetworkMetricsStrategy()
+    loader = DataLoader(data_path)
+    preprocessor = DataPreprocessor()
+    engine = BacktestingEngine(str(data_path))
+    timings, peaks = {}, {}
+
+    data, timings['load'], peaks['load'] = _measure(
+        lambda: loader.load_all_data(symbol), trace_memory)
+    features, timings['featurize'], peaks['featurize'] = _measure(
+        lambda: preprocessor.create_features(data['market'], data['network'], data['miner'],
+                                             columns=strategy.required_features),
+        trace_memory)
+    # Same dispatch as BacktestingEngine.run_backtest_on_features
+    generate = strategy.generate_event_signals if execution == 'event' else strategy.generate_signals
+    signals, timings['signal'], peaks['signal'] = _measure(
+        lambda: generate(features), trace_memory)
+
+    execute = engine._execute_loop if execution == 'loop' else engine._execute_vectorized
+    _, timings['execute'], peaks['execute'] = _measure(
+        lambda: execute(strategy, signals, features), trace_memory)
+
+    _, timings['metrics'], peaks['metrics'] = _measure(
+        lambda: PerformanceMetrics(engine.order_manager.get_trade_history(),
+                                   data['market'], engine.initial_capital).calculate_metrics(),
+        trace_memory)
+
+    return {'bars': len(features), 'trades': len(engine.order_manager.ledger),
+            'seconds': timings, 'peak_bytes': peaks}
+
+
+def benchmark_dataset(data_path: Union[str, Path], symbol: str = 'BTC',
+                      execution: str = 'vectorized', repeat: int = 3,
+                      trace_memory: bool = True) -> Dict[str, Any]:
+    """Time each stage of a backtest on one dataset
+
+    Latency is the best of repeat runs; peak memory comes from one extra
+    run under tracemalloc, which would otherwise skew the timings.
+    """
+    runs = [_run_pipeline(Path(data_path), symbol, execution, False) for _ in range(repeat)]
+    memory = _run_pipeline(Path(data_path), symbol, execution, True)['peak_bytes'] \
+        if trace_memory else dict.fromkeys(STAGES)
+
+    bars = runs[0]['bars']
+    stages = {}
+    for stage in STAGES:
+        samples = [run['seconds'][stage] for run in runs]
+        best = min(samples)
+        stages[stage] = {
+            'seconds': best,
+            'mean_seconds': sum(samples) / len(samples),
+            'bars_per_second': bars / best if best > 0 else None,
+            'peak_bytes': memory[stage]
+        }
+
+    total = sum(stage['seconds'] for stage in stages.values())
+    return {
+        'bars': bars,
+        'trades': runs[0]['trades'],
+        'stages': stages,
+        'total_seconds': total,
+        'bars_per_second': bars / total if total > 0 else None
+    }
+
+
+def run_suite(data_path: Union[str, Path] = DATA_PATH, scales: Sequence[int] = DEFAULT_SCALES,
+              symbol: str = 'BTC', execution: str = 'vectorized', repeat: int = 3,
+              work_dir: Optional[Union[str, Path]] = None) -> Dict[str, Any]:
+    """Benchmark the bundled data (scale 1) and synthetic copies scaled up from it"""
+    if execution not in BacktestingEngine.EXECUTION_MODES:
+        raise ValueError(f"Unknown execution mode '{execution}', "
+                         f"expected one of {BacktestingEngine.EXECUTION_MODES}")
+
+    results = []
+    scratch = Path(tempfile.mkdtemp(prefix='backtest_bench_', dir=work_dir))
+    try:
+        for scale in scales:
+            path = Path(data_path)
+            if scale != 1:
+                path = make_scaled_dataset(data_path, scratch / f"x{scale}", scale, symbol)
+            print(f"Benchmarking {symbol} x{scale}...", file=sys.stderr)
+            results.append({'dataset': f"{symbol}x{scale}", 'scale': scale,
+                            **benchmark_dataset(path, symbol, execution, repeat)})
+            if scale != 1:
+                shutil.rmtree(path, ignore_errors=True)
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    return {
+        'meta': {
+            'created': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'pandas': pd.__version__,
+            'machine': platform.machine(),
+            'cpu_count': os.cpu_count(),
+            'execution': execution,
+            'repeat': repeat
+        },
+        'results': results
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any],
+            tolerance: float = 0.2) -> List[Dict[str, Any]]:
+    """Stage latencies of current against a baseline suite, matched by dataset
+
+    A stage regresses when it is more than tolerance (a fraction) slower
+    than the baseline.
+    """
+    if current['meta'].get('execution') != baseline['meta'].get('execution'):
+        print(f"Warning: comparing '{current['meta'].get('execution')}' execution against "
+              f"a '{baseline['meta'].get('execution')}' baseline", file=sys.stderr)
+
+    previous = {result['dataset']: result for result in baseline['results']}
+    rows = []
+    for result in current['results']:
+        base = previous.get(result['dataset'])
+        if base is None:
+            continue
+        for stage in STAGES:
+            now = result['stages'][stage]['seconds']
+            before = base['stages'][stage]['seconds']
+            ratio = now / before if before > 0 else float('inf')
+            rows.append({
+                'dataset': result['dataset'],
+                'stage': stage,
+                'baseline_seconds': before,
+                'seconds': now,
+                'ratio': ratio,
+                'regression': ratio > 1 + tolerance
+            })
+    return rows
+
+
+def format_results(suite: Dict[str, Any]) -> str:
+    lines = [f"{'dataset':<12}{'stage':<11}{'bars':>10}{'latency (s)':>14}"
+             f"{'bars/s':>14}{'peak MB':>10}"]
+    for result in suite['results']:
+        for stage in STAGES:
+            timing = result['stages'][stage]
+            peak = timing['peak_bytes']
+            lines.append(
+                f"{result['dataset']:<12}{stage:<11}{result['bars']:>10}"
+                f"{timing['seconds']:>14.4f}{timing['bars_per_second'] or 0:>14,.0f}"
+                f"{'' if peak is None else f'{peak / 2**20:.1f}':>10}"
+            )
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark each stage of a backtest")
+    parser.add_argument('--data-path', default=str(DATA_PATH))
+    parser.add_argument('--symbol', default='BTC')
+    parser.add_argument('--scales', type=int, nargs='+', default=list(DEFAULT_SCALES),
+                        help="Row multipliers of the synthetic datasets (1 is the data as is)")
+    parser.add_argument('--execution', default='vectorized', choices=BacktestingEngine.EXECUTION_MODES)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--work-dir', help="Where to write the synthetic datasets")
+    parser.add_argument('--output', default='benchmark_results.json')
+    parser.add_argument('--baseline', help="Earlier results to compare against")
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help="Allowed slowdown against the baseline, as a fraction")
+    args = parser.parse_args()
+
+    suite = run_suite(args.data_path, args.scales, args.symbol, args.execution,
+                      args.repeat, args.work_dir)
+    with open(args.output, 'w') as f:
+        json.dump(suite, f, indent=2)
+    print(format_results(suite))
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            rows = compare(suite, json.load(f), args.tolerance)
+        regressions = [row for row in rows if row['regression']]
+        for row in rows:
+            flag = '  REGRESSION' if row['regression'] else ''
+            print(f"{row['dataset']:<12}{row['stage']:<11}{row['baseline_seconds']:>10.4f}"
+                  f" -> {row['seconds']:.4f} ({row['ratio']:.2f}x){flag}")
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,129 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, Optional, Union
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.data.exporter import FeatureExporter
+from backtesting_framework.data.imputation import CausalImputer
+from backtesting_framework.data.incremental import IncrementalFeatureEngine
+from backtesting_framework.data.streaming import ChunkedDataSource
+from backtesting_framework.strategies.base import Strategy
+from backtesting_framework.analysis.metrics import PerformanceMetrics
+from backtesting_framework.instrumentation import NullInstrumentation
+from backtesting_framework.log import EventSink
+
+
+class ChunkedBacktestingEngine(BacktestingEngine):
+    """Out-of-core backtests that stream the history in time-ordered chunks
+
+    Each chunk of chunk_size bars is read from the columnar cache, then
+    featurized, filled, turned into signals and executed before the next
+    one is read. Feature state (previous values, rolling windows), fill
+    state, capital and position carry over from chunk to chunk. Only the
+    bar timestamps and close prices of the whole history are kept for
+    the metrics, so memory grows with chunk_size rather than with the
+    history.
+
+    Results equal BacktestingEngine with the same causal fill_method and
+    'vectorized' execution. The whole-history column-mean fill has no
+    chunked equivalent. Signals must follow from each bar's features
+    alone, as generate_signals is called once per chunk.
+
+    Chunks are always read through the columnar cache in cache_dir, and
+    no full feature frame is ever built, so the feature cache (use_cache)
+    and feature export (feature_export) of BacktestingEngine are not
+    supported.
+    """
+
+    def __init__(self, data_path: str, initial_capital: float = 100000,
+                 chunk_size: int = 100000, symbol: str = 'BTC',
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 fill_method: str = 'ffill', fill_window: int = 20,
+                 use_cache: bool = False,
+                 feature_export: Optional[FeatureExporter] = None,
+                 instrumentation: Optional[NullInstrumentation] = None,
+                 event_sink: Optional[EventSink] = None):
+        if fill_method not in CausalImputer.METHODS:
+            raise ValueError(f"Chunked backtests need a causal fill_method, "
+                             f"one of {CausalImputer.METHODS}")
+        if use_cache:
+            raise ValueError("Chunked backtests do not cache features; "
+                             "the columnar cache in cache_dir is always used")
+        if feature_export is not None:
+            raise ValueError("Chunked backtests cannot export features, "
+                             "as the full feature frame is never built")
+        super().__init__(data_path, initial_capital,
+                         instrumentation=instrumentation, event_sink=event_sink,
+                         fill_method=fill_method, fill_window=fill_window)
+        self.chunk_size = chunk_size
+        self.source = ChunkedDataSource(data_path, symbol, cache_dir)
+
+    def run_backtest(self, strategy: Strategy,
+                     start_timestamp: int = None,
+                     end_timestamp: int = None,
+                     execution: str = 'vectorized') -> Dict[str, Any]:
+        """Run a backtest chunk by chunk; only 'vectorized' execution is supported"""
+        if execution != 'vectorized':
+            raise ValueError("Chunked backtests only support 'vectorized' execution")
+
+        instrumentation = self.instrumentation
+        feature_engine = IncrementalFeatureEngine(strategy.required_features)
+        imputer = self.preprocessor.imputer()
+        bar_times, closes = [], []
+        bars = chunks = 0
+
+        source = iter(self.source.chunks(self.chunk_size))
+        while True:
+            with instrumentation.stage('load'):
+                chunk = next(source, None)
+            if chunk is None:
+                break
+            chunks += 1
+            market_data = chunk['market']
+            bar_times.append(market_data.index.to_numpy())
+            closes.append(market_data['price_usd_close'].to_numpy(dtype=float))
+
+            with instrumentation.stage('featurize'):
+                features = imputer.transform(feature_engine.update_chunk(
+                    market_data, chunk['network'], chunk['miner']))
+
+            # Filter by timestamp range if specified
+            if start_timestamp:
+                features = features[features.index >= start_timestamp]
+            if end_timestamp:
+                features = features[features.index <= end_timestamp]
+            if len(features) == 0:
+                continue
+            bars += len(features)
+            instrumentation.count('bars', len(features))
+
+            with instrumentation.stage('signals'):
+                signals = strategy.generate_signals(features)
+            with instrumentation.stage('execution'):
+                self._execute_vectorized(strategy, signals, features)
+
+        if bars == 0:
+            raise ValueError("No data available for the specified timestamp range")
+
+        # Metrics only need the bar timestamps and close prices
+        market_data = pd.DataFrame(
+            {'price_usd_close': np.concatenate(closes)},
+            index=pd.Index(np.concatenate(bar_times), name='start_time')
+        )
+        with instrumentation.stage('metrics'):
+            metrics = PerformanceMetrics(
+                self.order_manager.get_trade_history(),
+                market_data,
+                self.initial_capital
+            )
+            calculated = metrics.calculate_metrics()
+            report = metrics.generate_report()
+
+        return {
+            'metrics': calculated,
+            'report': report,
+            'trade_history': self.order_manager.get_trade_history(),
+            'equity_curve': metrics.equity_curve,
+            'final_capital': self.current_capital,
+            'chunks': chunks
+        }
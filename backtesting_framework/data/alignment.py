@@ -0,0 +1,154 @@
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+
+def _as_int64(times) -> np.ndarray:
+    times = np.asarray(times)
+    if np.issubdtype(times.dtype, np.datetime64):
+        return times.astype('datetime64[ms]').astype(np.int64)
+    return times.astype(np.int64, copy=False)
+
+
+def sort_source(times, keep: str = 'last') -> np.ndarray:
+    """Row order that sorts times, keeping one row per duplicate timestamp
+
+    Returns positions into the original rows. keep='last' keeps the last
+    row of each timestamp, as the loader does for duplicated market rows.
+    """
+    times = _as_int64(times)
+    order = np.argsort(times, kind='stable')
+    sorted_times = times[order]
+    if keep == 'last':
+        unique = np.append(sorted_times[1:] != sorted_times[:-1], True)
+    else:
+        unique = np.insert(sorted_times[1:] != sorted_times[:-1], 0, True)
+    return order[unique]
+
+
+def infer_interval(times) -> int:
+    """Most common spacing between sorted, unique timestamps (0 for fewer than two)"""
+    steps = np.diff(_as_int64(times))
+    steps = steps[steps > 0]
+    if len(steps) == 0:
+        return 0
+    values, counts = np.unique(steps, return_counts=True)
+    return int(values[np.argmax(counts)])
+
+
+def asof_indexer(source_times, target_times, limit: Optional[int] = None,
+                 tolerance: Optional[int] = None,
+                 allow_exact_matches: bool = True,
+                 lag: int = 0) -> np.ndarray:
+    """Position of the latest source row known at each target time, or -1
+
+    source_times must be sorted and unique (see sort_source). A source
+    row becomes known lag time units after its timestamp. For rows stamped
+    with the start of the interval they aggregate, such as start_time,
+    lag should be the source interval. A target time only sees rows known
+    at or before it (strictly before with allow_exact_matches=False), so
+    nothing is taken from the future. limit caps how many consecutive
+    target rows may reuse one source row after the first, like a
+    forward-fill limit. tolerance caps how long ago the source row became
+    known, in timestamp units (milliseconds for start_time).
+    """
+    source_times = _as_int64(source_times) + lag
+    target_times = _as_int64(target_times)
+    side = 'right' if allow_exact_matches else 'left'
+    positions = np.searchsorted(source_times, target_times, side=side) - 1
+
+    if tolerance is not None and len(source_times):
+        found = positions >= 0
+        age = target_times - source_times[np.where(found, positions, 0)]
+        positions[found & (age > tolerance)] = -1
+
+    if limit is not None and len(positions):
+        # Rows since the target row that first saw the current source row
+        steps = np.arange(len(positions))
+        fresh = np.empty(len(positions), dtype=bool)
+        fresh[0] = True
+        fresh[1:] = positions[1:] != positions[:-1]
+        run_start = np.maximum.accumulate(np.where(fresh, steps, 0))
+        positions[(steps - run_start) > limit] = -1
+
+    return positions
+
+
+def take(values: np.ndarray, positions: np.ndarray) -> np.ndarray:
+    """values[positions] with NaN where positions is -1; works on 1-D and 2-D values"""
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.floating):
+        values = values.astype(float)
+    missing = positions < 0
+    taken = values[np.where(missing, 0, positions)] if len(values) else \
+        np.full((len(positions),) + values.shape[1:], np.nan)
+    taken[missing] = np.nan
+    return taken
+
+
+class AsofAligner:
+    """As-of alignment of many series onto one target index
+
+    Each distinct source index is sorted and searched once; every column
+    of a frame on that index is then a single take() of its values. The
+    searches are kept until clear(), so features that read several
+    columns of the same frame share one.
+
+    Source rows are taken to be stamped with the start of the interval
+    they cover, so a row only becomes known source_interval after its
+    timestamp. When source_interval is None, each source's interval is
+    inferred from its timestamps (see infer_interval). source_interval=0
+    treats timestamps as the time the value is known.
+    """
+
+    def __init__(self, limit: Optional[int] = None, tolerance: Optional[int] = None,
+                 allow_exact_matches: bool = True,
+                 source_interval: Optional[int] = None):
+        self.limit = limit
+        self.tolerance = tolerance
+        self.allow_exact_matches = allow_exact_matches
+        self.source_interval = source_interval
+        self._indexers: Dict[int, tuple] = {}
+
+    def settings(self) -> tuple:
+        return (self.limit, self.tolerance, self.allow_exact_matches, self.source_interval)
+
+    def indexer(self, source_index: pd.Index, target_index: pd.Index) -> tuple:
+        """(source row order, positions into it) for source_index onto target_index"""
+        key = (id(source_index), id(target_index))
+        cached = self._indexers.get(key)
+        if cached is None or cached[0] is not source_index or cached[1] is not target_index:
+            times = _as_int64(source_index)
+            if len(times) > 1 and (times[1:] > times[:-1]).all():
+                order = None
+            else:
+                order = sort_source(times)
+                times = times[order]
+            lag = infer_interval(times) if self.source_interval is None else self.source_interval
+            positions = asof_indexer(times, target_index, self.limit, self.tolerance,
+                                     self.allow_exact_matches, lag)
+            cached = self._indexers[key] = (source_index, target_index, order, positions)
+        return cached[2], cached[3]
+
+    def align(self, series: pd.Series, target_index: pd.Index) -> pd.Series:
+        """One series aligned as-of onto target_index"""
+        order, positions = self.indexer(series.index, target_index)
+        values = series.to_numpy()
+        if order is not None:
+            values = values[order]
+        return pd.Series(take(values, positions), index=target_index, name=series.name)
+
+    def align_frame(self, frame: pd.DataFrame, target_index: pd.Index,
+                    columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+        """Numeric columns of a frame aligned as-of onto target_index in one take"""
+        if columns is None:
+            columns = frame.select_dtypes(include=[np.number]).columns
+        columns = list(columns)
+        order, positions = self.indexer(frame.index, target_index)
+        values = frame[columns].to_numpy(dtype=float)
+        if order is not None:
+            values = values[order]
+        return pd.DataFrame(take(values, positions), index=target_index, columns=columns)
+
+    def clear(self):
+        self._indexers.clear()
@@ -0,0 +1,151 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+class ColumnStore:
+    """Columnar on-disk cache of the market data CSVs
+
+    Every CSV is stored under its file stem as one .npy file per column,
+    with start_time kept as int64 milliseconds. Cached columns are opened
+    as read-only memory maps. An entry is rebuilt when the source CSV's
+    size or content hash changes; a changed mtime alone only triggers a
+    hash check.
+    """
+
+    META_FILE = 'meta.json'
+
+    def __init__(self, cache_dir: Union[str, Path]):
+        self.cache_dir = Path(cache_dir)
+
+    def read_csv(self, csv_path: Union[str, Path]) -> pd.DataFrame:
+        """Drop-in replacement for pd.read_csv backed by the cache"""
+        return self.frame(self.open_columns(csv_path))
+
+    def open_columns(self, csv_path: Union[str, Path]) -> Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]:
+        """Cached columns of a CSV as read-only memory maps, building them if needed
+
+        Maps each column name to (values, nulls). Text columns are stored
+        fixed-width with a null mask; numeric columns have nulls None.
+        Nothing is read into memory until the arrays are indexed.
+        """
+        csv_path = Path(csv_path)
+        stat = csv_path.stat()
+        entry = self.cache_dir / csv_path.stem
+        meta = self._read_meta(entry)
+
+        if meta is None or not self._is_fresh(meta, csv_path, stat):
+            meta = self._build(csv_path, stat, entry)
+
+        version_dir = entry / meta['version']
+        columns = {}
+        for i, column in enumerate(meta['columns']):
+            values = np.load(version_dir / column['file'], mmap_mode='r')
+            nulls = np.load(version_dir / f"col_{i}_nulls.npy", mmap_mode='r') \
+                if column['text'] else None
+            columns[column['name']] = (values, nulls)
+        return columns
+
+    @staticmethod
+    def frame(columns: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]],
+              rows: Union[slice, np.ndarray] = slice(None)) -> pd.DataFrame:
+        """DataFrame of the given rows of opened columns, as pd.read_csv would give them
+
+        Numeric columns stay memory-mapped when rows is the full slice.
+        """
+        data = {}
+        for name, (values, nulls) in columns.items():
+            if nulls is not None:
+                text = values[rows].astype(object)
+                text[np.asarray(nulls[rows])] = np.nan
+                data[name] = text
+            elif isinstance(rows, slice) and rows == slice(None):
+                data[name] = values
+            else:
+                data[name] = np.asarray(values[rows])
+        return pd.DataFrame(data, copy=False)
+
+    def _is_fresh(self, meta: Dict[str, Any], csv_path: Path,
+                  stat: os.stat_result) -> bool:
+        """Check a cache entry against the source file"""
+        if meta['size'] != stat.st_size:
+            return False
+        if meta['mtime_ns'] == stat.st_mtime_ns:
+            return True
+
+        # Touched but possibly unchanged: compare content before rebuilding
+        if meta['sha1'] != self._file_hash(csv_path):
+            return False
+        meta['mtime_ns'] = stat.st_mtime_ns
+        self._write_meta(csv_path.stem, meta)
+        return True
+
+    def _build(self, csv_path: Path, stat: os.stat_result,
+               entry: Path) -> Dict[str, Any]:
+        """Parse the CSV once and write its columns as .npy files"""
+        df = pd.read_csv(csv_path)
+        if 'start_time' in df.columns and df['start_time'].notna().all():
+            df['start_time'] = pd.to_numeric(df['start_time']).astype(np.int64)
+
+        digest = self._file_hash(csv_path)
+        version = f"{digest[:16]}-{stat.st_mtime_ns}"
+        version_dir = entry / version
+        version_dir.mkdir(parents=True, exist_ok=True)
+
+        columns = []
+        for i, col in enumerate(df.columns):
+            values = df[col].to_numpy()
+            column = {'name': col, 'file': f"col_{i}.npy", 'text': False}
+            if values.dtype == object:
+                # Text columns are stored fixed-width with a separate null mask
+                nulls = pd.isna(values)
+                text = np.where(nulls, '', values).astype(str)
+                np.save(version_dir / f"col_{i}_nulls.npy", nulls)
+                values = text
+                column['text'] = True
+            np.save(version_dir / column['file'], values)
+            columns.append(column)
+
+        meta = {
+            'source': csv_path.name,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha1': digest,
+            'version': version,
+            'columns': columns
+        }
+        self._write_meta(csv_path.stem, meta)
+
+        # Older versions are dropped only after the new one is published
+        for old_dir in entry.iterdir():
+            if old_dir.is_dir() and old_dir.name != version:
+                shutil.rmtree(old_dir, ignore_errors=True)
+        return meta
+
+    def _read_meta(self, entry: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(entry / self.META_FILE) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def _write_meta(self, stem: str, meta: Dict[str, Any]):
+        """Publish the entry metadata atomically"""
+        entry = self.cache_dir / stem
+        entry.mkdir(parents=True, exist_ok=True)
+        tmp_path = entry / f"{self.META_FILE}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, entry / self.META_FILE)
+
+    @staticmethod
+    def _file_hash(path: Path) -> str:
+        sha1 = hashlib.sha1()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                sha1.update(block)
+        return sha1.hexdigest()
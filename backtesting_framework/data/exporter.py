@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Union
+
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+class FeatureExporter:
+    """Optional sink that writes feature frames to disk off the hot path
+
+    Frames are hashed and written on a background thread, and only when
+    their content differs from what was last written to path. The hash of
+    the written frame is kept next to it in a .sha1 file so unchanged
+    features are not rewritten across runs either. Supported formats are
+    'pickle' (default), 'parquet' (requires pyarrow) and 'csv'.
+    """
+
+    FORMATS = ('pickle', 'parquet', 'csv')
+
+    def __init__(self, path: Union[str, Path] = 'features.pkl',
+                 format: Optional[str] = None,
+                 background: bool = True):
+        self.path = Path(path)
+        self.format = format or self._format_from_suffix(self.path)
+        if self.format not in self.FORMATS:
+            raise ValueError(f"Unknown export format '{self.format}', "
+                             f"expected one of {self.FORMATS}")
+        if self.format == 'parquet' and not HAS_PARQUET:
+            raise ImportError("Parquet export requires pyarrow")
+
+        self.background = background
+        self.writes = 0
+        self.skipped = 0
+        self._last_hash = self._read_hash()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1) if background else None
+        self._pending: Optional[Future] = None
+
+    def submit(self, features: pd.DataFrame) -> Optional[Future]:
+        """Queue a frame for export; the caller may keep mutating its own copy"""
+        snapshot = features.copy()
+        if self._executor is None:
+            self._export(snapshot)
+            return None
+        self._pending = self._executor.submit(self._export, snapshot)
+        return self._pending
+
+    def flush(self):
+        """Wait for queued exports and re-raise any write error"""
+        if self._pending is not None:
+            self._pending.result()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _export(self, features: pd.DataFrame) -> bool:
+        digest = self.content_hash(features)
+        with self._lock:
+            if digest == self._last_hash and self.path.exists():
+                self.skipped += 1
+                return False
+
+            tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+            if self.format == 'pickle':
+                features.to_pickle(tmp_path)
+            elif self.format == 'parquet':
+                features.to_parquet(tmp_path, index=True)
+            else:
+                features.to_csv(tmp_path, index=True)
+            os.replace(tmp_path, self.path)
+
+            self._hash_path().write_text(digest)
+            self._last_hash = digest
+            self.writes += 1
+            return True
+
+    @staticmethod
+    def content_hash(features: pd.DataFrame) -> str:
+        """Hash of the values, index, column names and dtypes of a frame"""
+        sha1 = hashlib.sha1()
+        sha1.update(repr([(str(col), str(dtype)) for col, dtype in features.dtypes.items()]).encode())
+        sha1.update(pd.util.hash_pandas_object(features, index=True).to_numpy().tobytes())
+        return sha1.hexdigest()
+
+    def _hash_path(self) -> Path:
+        return self.path.with_name(self.path.name + '.sha1')
+
+    def _read_hash(self) -> Optional[str]:
+        try:
+            return self._hash_path().read_text().strip()
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _format_from_suffix(path: Path) -> str:
+        return {'.parquet': 'parquet', '.csv': 'csv'}.get(path.suffix, 'pickle')
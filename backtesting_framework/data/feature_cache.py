@@ -0,0 +1,117 @@
+import os
+import pandas as pd
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+class FeatureCache:
+    """Two-level cache of feature frames keyed by content hash
+
+    The first level is an in-memory LRU holding at most max_entries
+    frames. The optional second level pickles every frame to cache_dir
+    so features survive across processes and notebook sessions; it keeps
+    the max_disk_entries most recently used files (by modification time,
+    which disk hits refresh) and deletes older ones, or grows without
+    bound for None. Frames are copied in and out, so callers can't
+    corrupt cached entries.
+    """
+
+    def __init__(self, max_entries: int = 8,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 max_disk_entries: Optional[int] = 32):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else None
+        self.max_disk_entries = max_disk_entries
+        self._entries: 'OrderedDict[str, pd.DataFrame]' = OrderedDict()
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @property
+    def hits(self) -> int:
+        return self.stats['memory_hits'] + self.stats['disk_hits']
+
+    @property
+    def misses(self) -> int:
+        return self.stats['misses']
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Return a copy of the cached frame, or None on a miss"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.stats['memory_hits'] += 1
+            return self._entries[key].copy()
+
+        path = self._disk_path(key)
+        if path is not None and path.exists():
+            try:
+                frame = pd.read_pickle(path)
+            except Exception:
+                # A corrupt entry is treated as a miss and rewritten
+                frame = None
+            if frame is not None:
+                self._touch(path)
+                self._remember(key, frame)
+                self.stats['disk_hits'] += 1
+                return frame.copy()
+
+        self.stats['misses'] += 1
+        return None
+
+    def put(self, key: str, frame: pd.DataFrame):
+        """Store a copy of frame under key in both levels"""
+        frame = frame.copy()
+        self._remember(key, frame)
+
+        path = self._disk_path(key)
+        if path is not None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            frame.to_pickle(tmp_path)
+            os.replace(tmp_path, path)
+            self._prune_disk(keep=path)
+
+    def clear(self, disk: bool = False):
+        """Drop the in-memory entries, and optionally the on-disk ones"""
+        self._entries.clear()
+        if disk and self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob('*.pkl'):
+                path.unlink()
+
+    def info(self) -> Dict[str, int]:
+        return {**self.stats, 'hits': self.hits, 'entries': len(self._entries)}
+
+    def _remember(self, key: str, frame: pd.DataFrame):
+        self._entries[key] = frame
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _prune_disk(self, keep: Path):
+        """Delete the least recently used files beyond max_disk_entries, except keep"""
+        if self.max_disk_entries is None:
+            return
+        entries = []
+        for path in self.cache_dir.glob('*.pkl'):
+            if path == keep:
+                continue
+            try:
+                entries.append((path.stat().st_mtime_ns, path))
+            except FileNotFoundError:
+                pass  # Pruned by another process
+        entries.sort(reverse=True)
+        for _, path in entries[max(self.max_disk_entries - 1, 0):]:
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+    @staticmethod
+    def _touch(path: Path):
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # A read-only cache still serves hits
+
+    def _disk_path(self, key: str) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / f"{key}.pkl"
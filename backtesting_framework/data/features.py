@@ -0,0 +1,151 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+from backtesting_framework.data.alignment import AsofAligner
+from backtesting_framework.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class Feature(NamedTuple):
+    """A derived column and the inputs it is computed from
+
+    A feature either reads one column of a loaded frame (source is a
+    (group, frame, column) tuple with group 'market', 'network' or 'miner')
+    or applies func to the series of the features it depends on.
+    """
+    name: str
+    depends: Tuple[str, ...] = ()
+    func: Optional[Callable[..., pd.Series]] = None
+    source: Optional[Tuple[str, str, str]] = None
+
+
+# Registry in output column order
+FEATURES: Dict[str, Feature] = {feature.name: feature for feature in [
+    # Technical indicators
+    Feature('price_close', source=('market', '', 'price_usd_close')),
+    Feature('returns', ('price_close',), lambda price: price.pct_change()),
+    Feature('log_returns', ('price_close',), lambda price: np.log(price).diff()),
+    Feature('volatility', ('returns',), lambda returns: returns.rolling(window=20).std()),
+
+    # Network features
+    Feature('active_addresses', source=('network', 'AddressesCount', 'tokens_transferred_total')),
+    Feature('address_growth', ('active_addresses',), lambda addresses: addresses.pct_change()),
+    Feature('network_velocity', source=('network', 'Velocity', 'velocity_supply_total')),
+
+    # Miner features
+    Feature('hash_rate', source=('miner', 'HashRate', 'v')),
+    Feature('hash_rate_growth', ('hash_rate',), lambda hash_rate: hash_rate.pct_change()),
+    # Feature('miner_fees', source=('miner', 'Fees', 'v')),
+    # Feature('volume', source=('market', '', 'volume')),
+    # Feature('fee_ratio', ('miner_fees', 'volume'), lambda fees, volume: fees / volume),
+]}
+
+# Inputs that are already market columns and never added to the output
+INTERNAL_FEATURES = {'price_close'}
+
+
+class FeaturePipeline:
+    """Computes registered features by resolving their dependency DAG
+
+    Only the requested features and what they depend on are computed.
+    Features within one level of the DAG are independent of each other
+    and run on a thread pool when max_workers > 1.
+    """
+
+    def __init__(self, registry: Dict[str, Feature] = FEATURES,
+                 max_workers: int = 1,
+                 aligner: Optional[AsofAligner] = None):
+        self.registry = registry
+        self.max_workers = max_workers
+        # Source columns are matched on exact timestamps unless an aligner is given
+        self.aligner = aligner
+
+    def resolve(self, columns: Optional[Iterable[str]] = None) -> List[List[str]]:
+        """Order the features needed for columns into levels of independent features"""
+        if columns is None:
+            wanted = list(self.registry)
+        else:
+            wanted = [col for col in columns if col in self.registry]
+
+        levels: Dict[str, int] = {}
+
+        def visit(name: str, path: Tuple[str, ...]) -> int:
+            if name in levels:
+                return levels[name]
+            if name in path:
+                raise ValueError(f"Feature dependency cycle: {' -> '.join(path + (name,))}")
+            if name not in self.registry:
+                raise ValueError(f"Unknown feature '{name}'")
+            feature = self.registry[name]
+            levels[name] = 1 + max((visit(dep, path + (name,)) for dep in feature.depends),
+                                   default=-1)
+            return levels[name]
+
+        for name in wanted:
+            visit(name, ())
+
+        # Keep registry order within a level so output columns are stable
+        order = {name: i for i, name in enumerate(self.registry)}
+        resolved = [[] for _ in range(max(levels.values(), default=-1) + 1)]
+        for name in sorted(levels, key=order.get):
+            resolved[levels[name]].append(name)
+        return resolved
+
+    def compute(self, market_data: pd.DataFrame,
+                network_data: Dict[str, pd.DataFrame],
+                miner_data: Dict[str, pd.DataFrame],
+                columns: Optional[Iterable[str]] = None) -> Dict[str, pd.Series]:
+        """Compute the requested features, aligned to the market data index
+
+        Features whose source frame is missing are skipped along with
+        everything that depends on them. Results are returned in registry
+        order.
+        """
+        columns = None if columns is None else list(columns)
+        unknown = [col for col in columns or []
+                   if col not in self.registry and col not in market_data.columns]
+        if unknown:
+            raise ValueError(f"Unknown features requested: {unknown}")
+
+        frames = {'market': {'': market_data}, 'network': network_data, 'miner': miner_data}
+        values: Dict[str, pd.Series] = {}
+
+        def evaluate(name: str) -> Optional[pd.Series]:
+            feature = self.registry[name]
+            if feature.source is not None:
+                group, frame_name, column = feature.source
+                frame = frames[group].get(frame_name)
+                if frame is None:
+                    return None
+                if column not in frame.columns:
+                    logger.warning("'%s' not found in %s data.", column, frame_name or 'market')
+                    return None
+                if self.aligner is not None:
+                    return self.aligner.align(frame[column], market_data.index)
+                return frame[column].reindex(market_data.index)
+            if any(dep not in values for dep in feature.depends):
+                return None
+            return feature.func(*(values[dep] for dep in feature.depends))
+
+        levels = self.resolve(columns)
+        executor = ThreadPoolExecutor(self.max_workers) if self.max_workers > 1 else None
+        try:
+            for level in levels:
+                if executor is not None and len(level) > 1:
+                    results = list(executor.map(evaluate, level))
+                else:
+                    results = [evaluate(name) for name in level]
+                for name, result in zip(level, results):
+                    if result is not None:
+                        values[name] = result
+        finally:
+            if executor is not None:
+                executor.shutdown()
+            if self.aligner is not None:
+                self.aligner.clear()
+
+        requested = set(self.registry) if columns is None else set(columns)
+        return {name: values[name] for name in self.registry
+                if name in values and name in requested and name not in INTERNAL_FEATURES}
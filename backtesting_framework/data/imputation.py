@@ -0,0 +1,116 @@
+import numpy as np
+import pandas as pd
+from typing import List, Optional
+
+# Columns that are never imputed, as in the column-mean fill
+EXCLUDED_COLUMNS = ['start_time', 'date_x', 'date_y']
+
+
+class CausalImputer:
+    """Fill missing feature values using only earlier bars
+
+    method is one of:
+      'ffill'           the last valid value of the column
+      'expanding_mean'  the mean of all earlier valid values
+      'rolling_median'  the median of the valid values in the previous
+                        window bars
+
+    Bars with no earlier valid value stay missing. The imputer keeps the
+    state it needs between calls to transform(), so a dataset fed in
+    consecutive chunks is filled exactly as when it is filled in one
+    batch with fill(). Integer columns cannot hold missing values and
+    keep their dtype.
+    """
+
+    METHODS = ('ffill', 'expanding_mean', 'rolling_median')
+
+    def __init__(self, method: str = 'ffill', window: int = 20,
+                 columns: Optional[List[str]] = None):
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown fill method '{method}', expected one of {self.METHODS}")
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        self.method = method
+        self.window = window
+        self.columns = columns
+        self.reset()
+
+    def reset(self):
+        """Forget everything seen so far"""
+        self._columns = self.columns
+        self._last = None        # ffill: last valid value per column
+        self._sum = None         # expanding_mean: running sum per column
+        self._count = None       # expanding_mean: running count per column
+        self._tail = None        # rolling_median: the previous window bars
+
+    def fill(self, features: pd.DataFrame) -> pd.DataFrame:
+        """Impute a whole dataset in one batch"""
+        self.reset()
+        return self.transform(features)
+
+    def transform(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Impute the next chunk of bars, continuing from the previous chunk"""
+        if self._columns is None:
+            self._columns = [col for col in chunk.columns
+                             if col not in EXCLUDED_COLUMNS
+                             and pd.api.types.is_numeric_dtype(chunk[col])]
+        values = chunk[self._columns].to_numpy(dtype=float)
+
+        if self.method == 'ffill':
+            filled = self._ffill(values)
+        elif self.method == 'expanding_mean':
+            filled = self._expanding_mean(values)
+        else:
+            filled = self._rolling_median(values)
+
+        chunk = chunk.copy()
+        missing = np.isnan(values).any(axis=0)
+        for i in np.flatnonzero(missing):
+            chunk[self._columns[i]] = filled[:, i]
+        return chunk
+
+    def _ffill(self, values: np.ndarray) -> np.ndarray:
+        if self._last is None:
+            self._last = np.full(values.shape[1], np.nan)
+        if len(values) == 0:
+            return values
+
+        rows = np.arange(len(values))[:, None]
+        latest = np.maximum.accumulate(np.where(np.isnan(values), -1, rows), axis=0)
+        filled = np.take_along_axis(values, np.maximum(latest, 0), axis=0)
+        filled = np.where(latest < 0, self._last, filled)
+        self._last = filled[-1].copy()
+        return filled
+
+    def _expanding_mean(self, values: np.ndarray) -> np.ndarray:
+        if self._sum is None:
+            self._sum = np.zeros(values.shape[1])
+            self._count = np.zeros(values.shape[1])
+        valid = ~np.isnan(values)
+
+        # Sequential sums carried over from the previous chunk, so chunking
+        # does not change the order of additions
+        sums = np.cumsum(np.vstack([self._sum, np.where(valid, values, 0.0)]), axis=0)
+        counts = np.cumsum(np.vstack([self._count, valid]), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            earlier_mean = np.where(counts[:-1] > 0, sums[:-1] / counts[:-1], np.nan)
+
+        self._sum, self._count = sums[-1], counts[-1]
+        return np.where(valid, values, earlier_mean)
+
+    def _rolling_median(self, values: np.ndarray) -> np.ndarray:
+        if self._tail is None:
+            self._tail = np.empty((0, values.shape[1]))
+        history = np.vstack([self._tail, values])
+        medians = pd.DataFrame(history).rolling(self.window, min_periods=1).median().to_numpy()
+
+        # The median of the window ending one bar earlier
+        start = len(self._tail)
+        earlier = np.full(values.shape, np.nan)
+        if start > 0:
+            earlier[:] = medians[start - 1:start - 1 + len(values)]
+        elif len(values) > 1:
+            earlier[1:] = medians[:len(values) - 1]
+
+        self._tail = history[-self.window:]
+        return np.where(np.isnan(values), earlier, values)
@@ -0,0 +1,386 @@
+import math
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from backtesting_framework.data.features import FEATURES, INTERNAL_FEATURES, Feature, FeaturePipeline
+
+NaN = float('nan')
+
+
+def _divide(numerator: float, denominator: float) -> float:
+    """IEEE division as NumPy does it, without ZeroDivisionError"""
+    if denominator == 0:
+        if numerator == 0 or numerator != numerator:
+            return NaN
+        return math.copysign(math.inf, numerator) * math.copysign(1.0, denominator)
+    return numerator / denominator
+
+
+class PctChange:
+    """Streaming Series.pct_change() with pandas' default forward fill
+
+    Missing values are padded with the last valid one, so a gap after a
+    valid value gives 0 and leading gaps stay NaN.
+    """
+
+    def __init__(self):
+        self.previous = NaN
+
+    def update(self, value: float) -> float:
+        if value != value:
+            value = self.previous
+        result = _divide(value, self.previous) - 1
+        self.previous = value
+        return result
+
+    def update_many(self, values: np.ndarray) -> np.ndarray:
+        """update() over a chunk of values, vectorized"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return values
+        rows = np.arange(len(values))
+        latest = np.maximum.accumulate(np.where(np.isnan(values), -1, rows))
+        padded = np.where(latest < 0, self.previous, values[np.maximum(latest, 0)])
+        previous = np.concatenate(([self.previous], padded[:-1]))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = padded / previous - 1
+        self.previous = float(padded[-1])
+        return result
+
+
+class LogDiff:
+    """Streaming np.log(series).diff()"""
+
+    def __init__(self):
+        self.previous = NaN
+
+    def update(self, value: float) -> float:
+        # np.log on the scalar keeps results bit-identical to the vectorized call
+        if value > 0:
+            log_value = float(np.log(value))
+        elif value == 0:
+            log_value = -math.inf
+        else:
+            log_value = NaN
+        result = log_value - self.previous
+        self.previous = log_value
+        return result
+
+    def update_many(self, values: np.ndarray) -> np.ndarray:
+        """update() over a chunk of values, vectorized"""
+        values = np.asarray(values, dtype=float)
+        if len(values) == 0:
+            return values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            log_values = np.log(values)
+        result = log_values - np.concatenate(([self.previous], log_values[:-1]))
+        self.previous = float(log_values[-1])
+        return result
+
+
+class RollingMean:
+    """Streaming Series.rolling(window).mean() with O(1) updates
+
+    Mirrors pandas' online mean (Kahan compensated sums for adds and
+    removes, with its sign and repeated-value corrections) so results
+    match the batch computation exactly.
+    """
+
+    def __init__(self, window: int = 20, min_periods: Optional[int] = None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque()
+        self._reset()
+
+    def _reset(self, first_value: Optional[float] = None):
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.consecutive_same = 0
+        self.last_value = first_value
+
+    def update(self, value: float) -> float:
+        # Rolling windows treat infinities as missing
+        if math.isinf(value):
+            value = NaN
+        if self.last_value is None or self.window == 1:
+            # pandas restarts the sums whenever consecutive windows don't overlap
+            self.values.clear()
+            self._reset(value)
+
+        if len(self.values) == self.window:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        self._add(value)
+        return self._mean()
+
+    def _add(self, value: float):
+        if value != value:
+            return
+        self.nobs += 1
+        y = value - self.compensation_add
+        t = self.sum_x + y
+        self.compensation_add = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct += 1
+
+        if value == self.last_value:
+            self.consecutive_same += 1
+        else:
+            self.consecutive_same = 1
+        self.last_value = value
+
+    def _remove(self, value: float):
+        if value != value:
+            return
+        self.nobs -= 1
+        y = -value - self.compensation_remove
+        t = self.sum_x + y
+        self.compensation_remove = t - self.sum_x - y
+        self.sum_x = t
+        if math.copysign(1.0, value) < 0:
+            self.neg_ct -= 1
+
+    def _mean(self) -> float:
+        if self.nobs < self.min_periods or self.nobs == 0:
+            return NaN
+        if self.consecutive_same >= self.nobs:
+            return self.last_value
+        result = self.sum_x / self.nobs
+        if self.neg_ct == 0 and result < 0:
+            return 0.0
+        if self.neg_ct == self.nobs and result > 0:
+            return 0.0
+        return result
+
+
+class RollingStd:
+    """Streaming Series.rolling(window).std() with O(1) updates
+
+    Mirrors pandas' online variance (Welford with Kahan compensated
+    adds and removes) so results match the batch computation exactly.
+    Only the values inside the window are kept, to be removed later.
+    """
+
+    def __init__(self, window: int = 20, ddof: int = 1, min_periods: Optional[int] = None):
+        self.window = window
+        self.ddof = ddof
+        self.min_periods = window if min_periods is None else min_periods
+        self.values = deque()
+        self._reset()
+
+    def _reset(self, first_value: Optional[float] = None):
+        self.nobs = 0.0
+        self.mean = 0.0
+        self.ssqdm = 0.0
+        self.compensation_add = 0.0
+        self.compensation_remove = 0.0
+        self.consecutive_same = 0
+        self.last_value = first_value
+
+    def update(self, value: float) -> float:
+        # Rolling windows treat infinities as missing
+        if math.isinf(value):
+            value = NaN
+        if self.last_value is None or self.window == 1:
+            # pandas restarts the sums whenever consecutive windows don't overlap
+            self.values.clear()
+            self._reset(value)
+
+        if len(self.values) == self.window:
+            self._remove(self.values.popleft())
+        self.values.append(value)
+        self._add(value)
+        return self._std()
+
+    def update_many(self, values: np.ndarray) -> np.ndarray:
+        """update() over a chunk of values"""
+        update = self.update
+        return np.array([update(value) for value in np.asarray(values, dtype=float).tolist()],
+                        dtype=float)
+
+    def _add(self, value: float):
+        if value != value:
+            return
+        self.nobs += 1
+        if value == self.last_value:
+            self.consecutive_same += 1
+        else:
+            self.consecutive_same = 1
+        self.last_value = value
+
+        previous_mean = self.mean - self.compensation_add
+        y = value - self.compensation_add
+        t = y - self.mean
+        self.compensation_add = t + self.mean - y
+        self.mean = self.mean + t / self.nobs if self.nobs else 0.0
+        self.ssqdm = self.ssqdm + (value - previous_mean) * (value - self.mean)
+
+    def _remove(self, value: float):
+        if value != value:
+            return
+        self.nobs -= 1
+        if self.nobs:
+            previous_mean = self.mean - self.compensation_remove
+            y = value - self.compensation_remove
+            t = y - self.mean
+            self.compensation_remove = t + self.mean - y
+            self.mean = self.mean - t / self.nobs
+            self.ssqdm = self.ssqdm - (value - previous_mean) * (value - self.mean)
+        else:
+            self.mean = 0.0
+            self.ssqdm = 0.0
+
+    def _std(self) -> float:
+        if self.nobs < max(self.min_periods, 1) or self.nobs <= self.ddof:
+            return NaN
+        if self.nobs == 1 or self.consecutive_same >= self.nobs:
+            return 0.0
+        variance = self.ssqdm / (self.nobs - self.ddof)
+        return math.sqrt(variance) if variance > 0 else 0.0
+
+
+class RollingZScore:
+    """Streaming (rolling mean - value) / rolling std, as Ichiboss.z_score computes it
+
+    Feed values one at a time with update() or in chunks with extend();
+    each value costs O(1) work however long the series grows, and the
+    scores are bit-identical to the pandas computation over the whole
+    series. extend() on a fresh instance is the batch computation.
+    """
+
+    def __init__(self, window: int, min_periods: Optional[int] = 1):
+        self.window = window
+        self.mean = RollingMean(window, min_periods)
+        self.std = RollingStd(window, min_periods=min_periods)
+        self.count = 0
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        self.count += 1
+        return _divide(self.mean.update(value) - value, self.std.update(value))
+
+    def extend(self, values: Iterable[float]) -> np.ndarray:
+        """Score a chunk of values, continuing from the previous chunk"""
+        update = self.update
+        return np.fromiter((update(value) for value in values), dtype=float)
+
+
+# Streaming counterpart of every derived feature in the registry
+INCREMENTAL_OPS: Dict[str, Callable[[], Any]] = {
+    'returns': PctChange,
+    'log_returns': LogDiff,
+    'volatility': lambda: RollingStd(window=20),
+    'address_growth': PctChange,
+    'hash_rate_growth': PctChange,
+}
+
+
+class IncrementalFeatureEngine:
+    """Bar-by-bar feature updates with constant work per bar
+
+    Feed one bar at a time with update(); each call advances the state of
+    every requested feature by one step and returns the new feature row.
+    The rows match create_features before its column-mean fill, which
+    needs the full history and so has no streaming equivalent.
+    """
+
+    def __init__(self, columns: Optional[Iterable[str]] = None,
+                 registry: Dict[str, Feature] = FEATURES):
+        self.registry = registry
+        self.columns = None if columns is None else list(columns)
+        self.order = [name for level in FeaturePipeline(registry).resolve(self.columns)
+                      for name in level]
+        missing = [name for name in self.order
+                   if registry[name].source is None and name not in INCREMENTAL_OPS]
+        if missing:
+            raise ValueError(f"No incremental implementation for features: {missing}")
+
+        self.ops = {name: INCREMENTAL_OPS[name]() for name in self.order
+                    if registry[name].source is None}
+        requested = set(registry) if self.columns is None else set(self.columns)
+        self.output = [name for name in registry
+                       if name in self.order and name in requested
+                       and name not in INTERNAL_FEATURES]
+        self.bars = 0
+
+    def update(self, market: Dict[str, float],
+               network: Optional[Dict[str, Dict[str, float]]] = None,
+               miner: Optional[Dict[str, Dict[str, float]]] = None) -> Dict[str, float]:
+        """Advance by one bar and return its features
+
+        market holds the bar's market columns; network and miner map a
+        metric name (e.g. 'Velocity') to that metric's row for the bar.
+        A metric without a row for the bar counts as missing.
+        """
+        rows = {'market': {'': market}, 'network': network or {}, 'miner': miner or {}}
+        values: Dict[str, float] = {}
+        for name in self.order:
+            feature = self.registry[name]
+            if feature.source is not None:
+                group, frame_name, column = feature.source
+                row = rows[group].get(frame_name)
+                value = NaN if row is None else row.get(column, NaN)
+                values[name] = NaN if value is None else float(value)
+            else:
+                values[name] = self.ops[name].update(*(values[dep] for dep in feature.depends))
+
+        self.bars += 1
+        features = dict(market)
+        features.update((name, values[name]) for name in self.output)
+        return features
+
+    def update_chunk(self, market_data: pd.DataFrame,
+                     network_data: Dict[str, pd.DataFrame],
+                     miner_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Advance by a chunk of consecutive market bars
+
+        Takes frames holding only the chunk's rows and returns the market
+        columns with the requested features, as create_features builds
+        them before filling gaps. Feeding a history chunk by chunk gives
+        the same values as building it in one batch. As in the batch
+        pipeline, features whose source frame or column is missing are
+        left out.
+        """
+        frames = {'market': {'': market_data}, 'network': network_data, 'miner': miner_data}
+        values: Dict[str, Any] = {}
+        for name in self.order:
+            feature = self.registry[name]
+            if feature.source is not None:
+                group, frame_name, column = feature.source
+                frame = frames[group].get(frame_name)
+                if frame is None or column not in frame.columns:
+                    continue
+                values[name] = frame[column].reindex(market_data.index)
+            elif all(dep in values for dep in feature.depends):
+                values[name] = self.ops[name].update_many(
+                    *(np.asarray(values[dep], dtype=float) for dep in feature.depends))
+
+        self.bars += len(market_data)
+        features = market_data.copy()
+        for name in self.output:
+            if name in values:
+                features[name] = values[name]
+        return features
+
+    def run(self, market_data: pd.DataFrame,
+            network_data: Dict[str, pd.DataFrame],
+            miner_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
+        """Replay loaded frames through update(), one market bar at a time"""
+        sources = {}
+        for group, frames in (('network', network_data), ('miner', miner_data)):
+            for name, frame in frames.items():
+                sources[(group, name)] = frame.to_dict('index')
+
+        rows: List[Dict[str, float]] = []
+        for timestamp, market in zip(market_data.index, market_data.to_dict('records')):
+            network = {name: sources[('network', name)].get(timestamp) for name in network_data}
+            miner = {name: sources[('miner', name)].get(timestamp) for name in miner_data}
+            rows.append(self.update(market, network, miner))
+        return pd.DataFrame(rows, index=market_data.index)
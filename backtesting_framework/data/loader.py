@@ -1,43 +1,80 @@
+import hashlib
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Union, Dict, List
+from typing import Union, Dict, List, Optional
+from backtesting_framework.data.column_store import ColumnStore
+from backtesting_framework.log import get_logger
+
+logger = get_logger(__name__)
+
+
+def merge_market_frames(price_df: pd.DataFrame, volume_df: pd.DataFrame) -> pd.DataFrame:
+    """Join price and volume rows on start_time into the market frame"""
+    market_data = pd.merge(price_df, volume_df, on='start_time', how='inner')
+    market_data['start_time'] = pd.to_numeric(market_data['start_time'])
+    market_data.set_index('start_time', inplace=True)
+    return market_data
+
+
+def index_by_start_time(df: pd.DataFrame) -> pd.DataFrame:
+    """Index a metric frame by its start_time column, in place"""
+    df['start_time'] = pd.to_numeric(df['start_time'])
+    df.set_index('start_time', inplace=True)
+    return df
+
+
+def metric_name(file: Path) -> str:
+    """Metric name of a data file, e.g. 'Velocity' for BTC-NetworkData-Velocity.csv"""
+    return file.stem.split('-')[-1]
+
 
 class DataLoader:
-    def __init__(self, data_path: Union[str, Path]):
+    def __init__(self, data_path: Union[str, Path], use_cache: bool = False,
+                 cache_dir: Optional[Union[str, Path]] = None):
         self.data_path = Path(data_path)
+        # Loaded data per symbol, reused while the source files are unchanged
         self._data_cache = {}
         
+        # Optional columnar cache, memory-mapped instead of re-parsing CSVs
+        self.column_store = None
+        if use_cache or cache_dir is not None:
+            self.column_store = ColumnStore(cache_dir or self.data_path / '.columnar_cache')
+        
+    def _read_csv(self, file: Path) -> pd.DataFrame:
+        """Read a data file, through the columnar cache when enabled"""
+        if self.column_store is not None:
+            return self.column_store.read_csv(file)
+        return pd.read_csv(file)
+        
     def load_market_data(self, symbol: str = 'BTC') -> pd.DataFrame:
         """Load OHLCV market data"""
         price_file = self.data_path / f"{symbol}-FundData-MarketPriceUSD.csv"
         volume_file = self.data_path / f"{symbol}-FundData-MarketVolume.csv"
         
         try:
-            price_df = pd.read_csv(price_file)
+            price_df = self._read_csv(price_file)
         except FileNotFoundError:
-            print(f"Error: Price data file not found at {price_file}")
+            logger.error("Price data file not found at %s", price_file)
             raise
         except Exception as e:
-            print(f"Error loading price data: {str(e)}")
+            logger.error("Error loading price data: %s", e)
             raise
             
         try:
-            volume_df = pd.read_csv(volume_file)
+            volume_df = self._read_csv(volume_file)
         except FileNotFoundError:
-            print(f"Error: Volume data file not found at {volume_file}")
+            logger.error("Volume data file not found at %s", volume_file)
             raise
         except Exception as e:
-            print(f"Error loading volume data: {str(e)}")
+            logger.error("Error loading volume data: %s", e)
             raise
         
         try:
             # Merge price and volume data using start_time
-            market_data = pd.merge(price_df, volume_df, on='start_time', how='inner')
-            market_data['start_time'] = pd.to_numeric(market_data['start_time'])
-            market_data.set_index('start_time', inplace=True)
+            market_data = merge_market_frames(price_df, volume_df)
         except Exception as e:
-            print(f"Error processing market data: {str(e)}")
+            logger.error("Error processing market data: %s", e)
             raise
             
         # Display general information about the market data
@@ -49,6 +86,45 @@ class DataLoader:
         # print(market_data.head())    
         return market_data
     
+    def ohlcv_file(self, symbol: str) -> Path:
+        """Path of the daily OHLCV file of an alt coin"""
+        return self.data_path / f"Alt-Market-Data-OHLCV-{symbol.capitalize()}.csv"
+
+    def load_ohlcv_data(self, symbol: str) -> pd.DataFrame:
+        """Load daily OHLCV data of an alt coin
+
+        Columns are renamed to the price_usd_* names of load_market_data.
+        """
+        ohlcv_file = self.ohlcv_file(symbol)
+        
+        try:
+            ohlcv_df = self._read_csv(ohlcv_file)
+        except FileNotFoundError:
+            logger.error("OHLCV data file not found at %s", ohlcv_file)
+            raise
+        except Exception as e:
+            logger.error("Error loading OHLCV data: %s", e)
+            raise
+            
+        ohlcv_df = ohlcv_df.rename(columns={
+            'open': 'price_usd_open',
+            'high': 'price_usd_high',
+            'low': 'price_usd_low',
+            'close': 'price_usd_close'
+        })
+        ohlcv_df['start_time'] = pd.to_numeric(ohlcv_df['start_time'])
+        ohlcv_df.set_index('start_time', inplace=True)
+        return ohlcv_df
+    
+    def load_asset_market_data(self, symbol: str) -> pd.DataFrame:
+        """Load the market data of any asset: fund data if present, else alt OHLCV"""
+        if (self.data_path / f"{symbol}-FundData-MarketPriceUSD.csv").exists():
+            market_data = self.load_market_data(symbol)
+        else:
+            market_data = self.load_ohlcv_data(symbol)
+        # Handle duplicate dates by keeping the last value
+        return market_data.groupby('start_time').last()
+    
     def load_network_data(self, symbol: str = 'BTC') -> Dict[str, pd.DataFrame]:
         """Load all network-related metrics"""
         network_files = self.data_path.glob(f"{symbol}-NetworkData-*.csv")
@@ -56,16 +132,13 @@ class DataLoader:
         
         for file in network_files:
             try:
-                metric_name = file.stem.split('-')[-1]
-                df = pd.read_csv(file)
-                df['start_time'] = pd.to_numeric(df['start_time'])
-                df.set_index('start_time', inplace=True)
-                network_data[metric_name] = df
+                df = index_by_start_time(self._read_csv(file))
+                network_data[metric_name(file)] = df
             except FileNotFoundError:
-                print(f"Error: Network data file not found at {file}")
+                logger.error("Network data file not found at %s", file)
                 raise
             except Exception as e:
-                print(f"Error loading network data from {file}: {str(e)}")
+                logger.error("Error loading network data from %s: %s", file, e)
                 raise
             
         # Display general information about the network data
@@ -87,16 +160,13 @@ class DataLoader:
         
         for file in miner_files:
             try:
-                metric_name = file.stem.split('-')[-1]
-                df = pd.read_csv(file)
-                df['start_time'] = pd.to_numeric(df['start_time'])
-                df.set_index('start_time', inplace=True)
-                miner_data[metric_name] = df
+                df = index_by_start_time(self._read_csv(file))
+                miner_data[metric_name(file)] = df
             except FileNotFoundError:
-                print(f"Error: Miner data file not found at {file}")
+                logger.error("Miner data file not found at %s", file)
                 raise
             except Exception as e:
-                print(f"Error loading miner data from {file}: {str(e)}")
+                logger.error("Error loading miner data from %s: %s", file, e)
                 raise
             
         # Display general information about the miner data
@@ -111,9 +181,46 @@ class DataLoader:
             
         return miner_data
     
+    def source_files(self, symbol: str = 'BTC') -> List[Path]:
+        """Every file load_all_data or load_asset_market_data reads for a symbol"""
+        files = [self.data_path / f"{symbol}-FundData-MarketPriceUSD.csv",
+                 self.data_path / f"{symbol}-FundData-MarketVolume.csv",
+                 self.ohlcv_file(symbol)]
+        files += self.data_path.glob(f"{symbol}-NetworkData-*.csv")
+        files += self.data_path.glob(f"{symbol}-Miner-*.csv")
+        return sorted(files)
+
+    def source_fingerprint(self, symbol: str = 'BTC') -> str:
+        """Hash of the names, sizes and mtimes of a symbol's source files"""
+        sha1 = hashlib.sha1()
+        for file in self.source_files(symbol):
+            try:
+                stat = file.stat()
+                sha1.update(f"{file.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+            except FileNotFoundError:
+                sha1.update(f"{file.name}:missing;".encode())
+        return sha1.hexdigest()
+
     def load_all_data(self, symbol: str = 'BTC') -> Dict[str, Union[pd.DataFrame, Dict[str, pd.DataFrame]]]:
-        """Load all available data for a symbol"""
+        """Load all available data for a symbol
+
+        Results are kept in memory and reused (as copies) until one of the
+        symbol's source files changes.
+        """
+        fingerprint = self.source_fingerprint(symbol)
+        cached = self._data_cache.get(symbol)
+        if cached is None or cached[0] != fingerprint:
+            cached = (fingerprint, self._load_all_data(symbol))
+            self._data_cache[symbol] = cached
+
+        data = cached[1]
+        return {
+            'market': data['market'].copy(),
+            'network': {name: df.copy() for name, df in data['network'].items()},
+            'miner': {name: df.copy() for name, df in data['miner'].items()}
+        }
 
+    def _load_all_data(self, symbol: str) -> Dict[str, Union[pd.DataFrame, Dict[str, pd.DataFrame]]]:
         # Handle duplicate dates by keeping the last value
         market_data = self.load_market_data(symbol).groupby('start_time').last()
         network_data = self.load_network_data(symbol)
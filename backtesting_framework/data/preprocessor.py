@@ -1,10 +1,59 @@
+import hashlib
 import pandas as pd
 import numpy as np
-from typing import Dict, Union, List
+from pathlib import Path
+from typing import Dict, Union, List, Optional
+from backtesting_framework.data.exporter import FeatureExporter
+from backtesting_framework.data.feature_cache import FeatureCache
+from backtesting_framework.data.features import FeaturePipeline
+from backtesting_framework.data.alignment import AsofAligner
+from backtesting_framework.data.imputation import CausalImputer, EXCLUDED_COLUMNS
+from backtesting_framework.log import get_logger
+
+logger = get_logger(__name__)
+
+ALIGNMENTS = ('exact', 'asof')
+FILL_METHODS = ('mean',) + CausalImputer.METHODS
+# Part of every feature cache key: bump it whenever a change to the feature
+# definitions, alignment or filling changes the features built from the
+# same inputs, so stale cached features are not reused
+FEATURE_SPEC_VERSION = 1
 
 class DataPreprocessor:
-    def __init__(self):
-        self._feature_cache = {}
+    def __init__(self, export_sink: Optional[FeatureExporter] = None,
+                 cache_size: int = 8,
+                 cache_dir: Optional[Union[str, Path]] = None,
+                 disk_cache_size: Optional[int] = 32,
+                 max_workers: int = 1,
+                 alignment: str = 'exact',
+                 ffill_limit: Optional[int] = None,
+                 tolerance: Optional[int] = None,
+                 source_interval: Optional[int] = None,
+                 fill_method: str = 'mean',
+                 fill_window: int = 20):
+        if alignment not in ALIGNMENTS:
+            raise ValueError(f"Unknown alignment '{alignment}', expected one of {ALIGNMENTS}")
+        if fill_method not in FILL_METHODS:
+            raise ValueError(f"Unknown fill method '{fill_method}', expected one of {FILL_METHODS}")
+        # 'asof' joins network and miner series onto the market bars by the
+        # latest value known at each bar, optionally limited in bars
+        # (ffill_limit) or milliseconds (tolerance); 'exact' matches labels.
+        # A source row is known one source_interval (inferred when None)
+        # after its start_time
+        self.alignment = alignment
+        self.aligner = AsofAligner(ffill_limit, tolerance, source_interval=source_interval) \
+            if alignment == 'asof' else None
+        # Feature DAG; max_workers > 1 evaluates independent branches in threads
+        self.pipeline = FeaturePipeline(max_workers=max_workers, aligner=self.aligner)
+        # 'mean' fills gaps with the column mean over the whole history; the
+        # causal methods only look back (see imputation.CausalImputer)
+        self.fill_method = fill_method
+        self.fill_window = fill_window
+        # In-memory LRU of built features, persisted to cache_dir if given
+        # (keeping the disk_cache_size most recently used there)
+        self._feature_cache = FeatureCache(cache_size, cache_dir, disk_cache_size)
+        # Features are only written to disk when a sink is given
+        self.export_sink = export_sink
         
     def clean_market_data(self, df: pd.DataFrame) -> pd.DataFrame:
         """Clean and prepare market data"""
@@ -19,67 +68,104 @@ class DataPreprocessor:
     
     def create_features(self, market_data: pd.DataFrame, 
                        network_data: Dict[str, pd.DataFrame],
-                       miner_data: Dict[str, pd.DataFrame]) -> pd.DataFrame:
-        """Create technical and fundamental features"""
+                       miner_data: Dict[str, pd.DataFrame],
+                       source_key: Optional[str] = None,
+                       columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """Create technical and fundamental features
+
+        columns selects the registered features to compute (see
+        data.features.FEATURES); only those and their dependencies are
+        built, next to the market data columns. None computes all of them.
+
+        Features are cached under a key built from FEATURE_SPEC_VERSION,
+        the requested columns and either source_key (a fingerprint of the
+        files the inputs were loaded from, see DataLoader.source_fingerprint)
+        or a hash of the input frames themselves.
+        """
+        key = self.feature_key(market_data, network_data, miner_data, source_key, columns)
+        features = self._feature_cache.get(key)
+        if features is not None:
+            return features
+
+        features = self._build_features(market_data, network_data, miner_data, columns)
+        self._feature_cache.put(key, features)
+        return features
+
+    def feature_key(self, market_data: pd.DataFrame,
+                    network_data: Dict[str, pd.DataFrame],
+                    miner_data: Dict[str, pd.DataFrame],
+                    source_key: Optional[str] = None,
+                    columns: Optional[List[str]] = None) -> str:
+        """Cache key for the features of the given inputs"""
+        sha1 = hashlib.sha1(f"spec:{FEATURE_SPEC_VERSION}".encode())
+        sha1.update(repr(None if columns is None else sorted(columns)).encode())
+        sha1.update(repr((self.alignment, self.aligner and self.aligner.settings())).encode())
+        sha1.update(repr((self.fill_method, self.fill_window)).encode())
+        if source_key is not None:
+            sha1.update(f"source:{source_key}".encode())
+            return sha1.hexdigest()
+
+        sha1.update(FeatureExporter.content_hash(market_data).encode())
+        for group, frames in (('network', network_data), ('miner', miner_data)):
+            for name in sorted(frames):
+                sha1.update(f"{group}:{name}:".encode())
+                sha1.update(FeatureExporter.content_hash(frames[name]).encode())
+        return sha1.hexdigest()
+
+    def cache_info(self) -> Dict[str, int]:
+        """Feature cache hit/miss counts"""
+        return self._feature_cache.info()
+
+    def _build_features(self, market_data: pd.DataFrame,
+                        network_data: Dict[str, pd.DataFrame],
+                        miner_data: Dict[str, pd.DataFrame],
+                        columns: Optional[List[str]] = None) -> pd.DataFrame:
         features = market_data.copy()
-        
-        # Add technical indicators
-        features['returns'] = features['price_usd_close'].pct_change()
-        features['log_returns'] = np.log(features['price_usd_close']).diff()
-        features['volatility'] = features['returns'].rolling(window=20).std()
-        
-        
-        # Add network features if available
-        if 'AddressesCount' in network_data:
-            if 'tokens_transferred_total' in network_data['AddressesCount'].columns:
-                features['active_addresses'] = network_data['AddressesCount']['tokens_transferred_total']
-                features['address_growth'] = features['active_addresses'].pct_change()
-            else:
-                print("Warning: 'tokens_transferred_total' not found in AddressesCount data.")
-            
-        if 'Velocity' in network_data:
-            if 'velocity_supply_total' in network_data['Velocity'].columns:
-                features['network_velocity'] = network_data['Velocity']['velocity_supply_total']
-            else:
-                print("Warning: 'velocity_supply_total' not found in Velocity data.")
-        
-        # Add miner features if available
-        if 'HashRate' in miner_data:
-            if 'v' in miner_data['HashRate'].columns:
-                features['hash_rate'] = miner_data['HashRate']['v']
-                features['hash_rate_growth'] = features['hash_rate'].pct_change()
-            else:
-                print("Warning: 'v' not found in HashRate data.")
-            
-        # if 'Fees' in miner_data:
-        #     if 'v' in miner_data['Fees'].columns:
-        #         features['miner_fees'] = miner_data['Fees']['v']
-        #         if 'volume' in features.columns:
-        #             features['fee_ratio'] = features['miner_fees'] / features['volume']
-        #         else:
-        #             print("Warning: 'volume' column not found in market data for fee_ratio calculation.")
-        #     else:
-        #         print("Warning: 'v' not found in Fees data.")
+
+        # Add the requested technical, network and miner features
+        for name, values in self.pipeline.compute(market_data, network_data, miner_data,
+                                                  columns).items():
+            features[name] = values
             
         # Remove any rows with NaN values after feature creation
         # features = features.dropna()
 
-        # convert features into csv file 
-        features.to_csv('features.csv', index=True)
+        # Export the raw features (off the hot path) if a sink is configured
+        if self.export_sink is not None:
+            self.export_sink.submit(features)
 
-        # fill emppty values with mean of the column except "start_time" and "date"
-        for col in features.columns:
-            if col not in ['start_time', 'date_x', 'date_y']:
-                features[col].fillna(features[col].mean(), inplace=True)
+        if self.fill_method == 'mean':
+            # fill emppty values with mean of the column except "start_time" and "date"
+            for col in features.columns:
+                if col not in EXCLUDED_COLUMNS and \
+                        pd.api.types.is_numeric_dtype(features[col]):
+                    features[col] = features[col].fillna(features[col].mean())
+        else:
+            features = self.imputer().fill(features)
 
         # Check features length
         if len(features) == 0:
-            print("Warning: No features available after cleaning. Check input data.")
+            logger.warning("No features available after cleaning. Check input data.")
         
         return features
     
-    def align_data(self, *dfs: pd.DataFrame) -> List[pd.DataFrame]:
-        """Align multiple dataframes to the same index"""
+    def imputer(self) -> CausalImputer:
+        """A fresh causal imputer with this preprocessor's fill settings"""
+        return CausalImputer(self.fill_method, self.fill_window)
+
+    def align_data(self, *dfs: pd.DataFrame, how: str = 'inner') -> List[pd.DataFrame]:
+        """Align multiple dataframes to the same index
+
+        how='inner' keeps the timestamps common to all of them; how='asof'
+        puts the numeric columns of every frame on the first frame's index,
+        using the latest row known at each timestamp (see alignment).
+        """
+        if how == 'asof':
+            aligner = self.aligner or AsofAligner()
+            aligned_dfs = [dfs[0]] + [aligner.align_frame(df, dfs[0].index) for df in dfs[1:]]
+            aligner.clear()
+            return aligned_dfs
+
         # Get the intersection of all indices
         common_index = dfs[0].index
         for df in dfs[1:]:
@@ -87,4 +173,4 @@ class DataPreprocessor:
             
         # Align all dataframes to the common index
         aligned_dfs = [df.loc[common_index] for df in dfs]
-        return aligned_dfs 
\ No newline at end of file
+        return aligned_dfs
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple, Union
+from backtesting_framework.data.column_store import ColumnStore
+from backtesting_framework.data.loader import index_by_start_time, merge_market_frames, metric_name
+from backtesting_framework.log import get_logger
+
+logger = get_logger(__name__)
+
+
+class TimeOrderedFile:
+    """One cached CSV whose rows can be read by start_time range
+
+    The columns stay memory-mapped; only the rows of a requested range
+    are read. Files that are not sorted by start_time need a sorted copy
+    of the timestamps and the sorting permutation (16 bytes per row).
+    """
+
+    def __init__(self, columns: Dict[str, Tuple[np.ndarray, Optional[np.ndarray]]]):
+        self.columns = columns
+        times = columns['start_time'][0]
+        if len(times) < 2 or bool(np.all(times[1:] >= times[:-1])):
+            self._order = None
+            self._times = times
+        else:
+            self._order = np.argsort(times, kind='stable')
+            self._times = np.asarray(times)[self._order]
+
+    def __len__(self) -> int:
+        return len(self._times)
+
+    def unique_times(self) -> np.ndarray:
+        return np.unique(self._times)
+
+    def rows(self, start: int, stop: Optional[int] = None) -> pd.DataFrame:
+        """Rows with start <= start_time < stop (no upper bound for None), in file order"""
+        lo = np.searchsorted(self._times, start, side='left')
+        hi = len(self._times) if stop is None else np.searchsorted(self._times, stop, side='left')
+        if self._order is None:
+            rows = slice(int(lo), int(hi))
+        else:
+            rows = np.sort(self._order[lo:hi])
+        return ColumnStore.frame(self.columns, rows)
+
+
+class ChunkedDataSource:
+    """A symbol's market, network and miner data in time-ordered chunks
+
+    The CSVs are read through the columnar cache (see ColumnStore), so
+    each chunk only reads its own rows from disk. Every chunk covers
+    chunk_size market bars and holds the frames load_all_data would give
+    for those bars, built by the same merge and indexing steps.
+    """
+
+    def __init__(self, data_path: Union[str, Path], symbol: str = 'BTC',
+                 cache_dir: Optional[Union[str, Path]] = None):
+        self.data_path = Path(data_path)
+        self.symbol = symbol
+        store = ColumnStore(cache_dir or self.data_path / '.columnar_cache')
+
+        price_file = self.data_path / f"{symbol}-FundData-MarketPriceUSD.csv"
+        volume_file = self.data_path / f"{symbol}-FundData-MarketVolume.csv"
+        for file in (price_file, volume_file):
+            if not file.exists():
+                logger.error("Market data file not found at %s", file)
+                raise FileNotFoundError(file)
+
+        self.price = TimeOrderedFile(store.open_columns(price_file))
+        self.volume = TimeOrderedFile(store.open_columns(volume_file))
+        self.network = {metric_name(file): TimeOrderedFile(store.open_columns(file))
+                        for file in self.data_path.glob(f"{symbol}-NetworkData-*.csv")}
+        self.miner = {metric_name(file): TimeOrderedFile(store.open_columns(file))
+                      for file in self.data_path.glob(f"{symbol}-Miner-*.csv")}
+
+    def chunks(self, chunk_size: int = 100000) -> Iterator[Dict[str, Union[pd.DataFrame, Dict[str, pd.DataFrame]]]]:
+        """Yield {'market', 'network', 'miner'} frames for consecutive time ranges"""
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        bar_times = self.price.unique_times()
+
+        for first in range(0, len(bar_times), chunk_size):
+            start = int(bar_times[first])
+            stop = int(bar_times[first + chunk_size]) if first + chunk_size < len(bar_times) else None
+
+            market = merge_market_frames(self.price.rows(start, stop), self.volume.rows(start, stop))
+            yield {
+                # Handle duplicate dates by keeping the last value
+                'market': market.groupby('start_time').last(),
+                'network': {name: index_by_start_time(file.rows(start, stop))
+                            for name, file in self.network.items()},
+                'miner': {name: index_by_start_time(file.rows(start, stop))
+                          for name, file in self.miner.items()}
+            }
@@ -0,0 +1,128 @@
+import time
+import numpy as np
+import pandas as pd
+from datetime import datetime, timedelta
+from typing import List, Optional, Sequence, Union
+
+from backtesting_framework.execution.vectorized import BUY, SELL
+
+EPOCH = datetime(1970, 1, 1)
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+# With a UTC local clock, datetime.fromtimestamp is plain arithmetic
+_LOCAL_IS_UTC = time.timezone == 0 and not time.daylight
+
+
+def datetime_to_us(timestamp: datetime) -> int:
+    """Microseconds since the epoch of a naive datetime"""
+    return (timestamp - EPOCH) // ONE_MICROSECOND
+
+
+def local_us_from_ms(timestamps: Sequence[int]) -> np.ndarray:
+    """Naive local times in microseconds, as datetime.fromtimestamp(ms / 1000) gives them"""
+    timestamps = np.asarray(timestamps)
+    if _LOCAL_IS_UTC and np.issubdtype(timestamps.dtype, np.integer):
+        return timestamps.astype(np.int64) * 1000
+    return np.array([datetime_to_us(datetime.fromtimestamp(ms / 1000)) for ms in timestamps],
+                    dtype=np.int64)
+
+
+class TradeLedger:
+    """Columnar record of filled trades
+
+    Fills are stored in preallocated NumPy arrays (timestamp, symbol,
+    side, quantity, price, value) that double in size when full, so a run
+    with many fills costs a few array copies rather than one dict per
+    trade. The DataFrame view is built once and cached until the next fill.
+    """
+
+    COLUMNS = ['timestamp', 'symbol', 'type', 'quantity', 'price', 'value']
+
+    def __init__(self, capacity: int = 1024):
+        self._size = 0
+        self._timestamp = np.empty(capacity, dtype=np.int64)  # Naive microseconds
+        self._symbol = np.empty(capacity, dtype=np.int32)
+        self._side = np.empty(capacity, dtype=np.int8)
+        self._quantity = np.empty(capacity, dtype=float)
+        self._price = np.empty(capacity, dtype=float)
+        self._value = np.empty(capacity, dtype=float)
+        self._symbols: List[str] = []
+        self._symbol_codes = {}
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def capacity(self) -> int:
+        return len(self._timestamp)
+
+    def append(self, timestamp: datetime, symbol: str, order_type: str,
+               quantity: float, price: float):
+        """Record one fill"""
+        self._reserve(1)
+        i = self._size
+        self._timestamp[i] = datetime_to_us(timestamp)
+        self._symbol[i] = self._symbol_code(symbol)
+        self._side[i] = BUY if order_type == 'buy' else SELL
+        self._quantity[i] = quantity
+        self._price[i] = price
+        self._value[i] = quantity * price
+        self._size += 1
+        self._frame = None
+
+    def extend(self, timestamps_us: np.ndarray, symbol: Union[str, Sequence[str]],
+               sides: np.ndarray, quantities: np.ndarray, prices: np.ndarray):
+        """Record a batch of fills for one symbol, or one symbol per fill"""
+        n = len(timestamps_us)
+        if n == 0:
+            return
+        self._reserve(n)
+        fills = slice(self._size, self._size + n)
+        self._timestamp[fills] = timestamps_us
+        if isinstance(symbol, str):
+            self._symbol[fills] = self._symbol_code(symbol)
+        else:
+            names, inverse = np.unique(np.asarray(symbol, dtype=object), return_inverse=True)
+            codes = np.array([self._symbol_code(name) for name in names], dtype=np.int32)
+            self._symbol[fills] = codes[inverse]
+        self._side[fills] = sides
+        self._quantity[fills] = quantities
+        self._price[fills] = prices
+        self._value[fills] = self._quantity[fills] * self._price[fills]
+        self._size += n
+        self._frame = None
+
+    def to_frame(self) -> pd.DataFrame:
+        """Fills as a DataFrame, cached until the next fill; treat it as read-only"""
+        if self._frame is None:
+            n = self._size
+            symbols = np.array(self._symbols + [''], dtype=object)
+            self._frame = pd.DataFrame({
+                'timestamp': self._timestamp[:n].astype('datetime64[us]').astype('datetime64[ns]'),
+                'symbol': symbols[self._symbol[:n]],
+                'type': np.where(self._side[:n] == BUY, 'buy', 'sell').astype(object),
+                'quantity': self._quantity[:n].copy(),
+                'price': self._price[:n].copy(),
+                'value': self._value[:n].copy()
+            }, columns=self.COLUMNS)
+        return self._frame
+
+    def _symbol_code(self, symbol: str) -> int:
+        code = self._symbol_codes.get(symbol)
+        if code is None:
+            code = self._symbol_codes[symbol] = len(self._symbols)
+            self._symbols.append(symbol)
+        return code
+
+    def _reserve(self, n: int):
+        """Grow the arrays geometrically so that n more fills fit"""
+        needed = self._size + n
+        if needed <= self.capacity:
+            return
+        capacity = max(self.capacity * 2, needed, 16)
+        for name in ('_timestamp', '_symbol', '_side', '_quantity', '_price', '_value'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
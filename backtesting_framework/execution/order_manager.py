@@ -1,8 +1,14 @@
+import numpy as np
 import pandas as pd
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Sequence, Union
 from datetime import datetime
+from backtesting_framework.execution.ledger import TradeLedger, local_us_from_ms
+from backtesting_framework.execution.vectorized import BUY, SELL
 
 class Order:
+    __slots__ = ('symbol', 'order_type', 'quantity', 'price', 'timestamp',
+                 'status', 'filled_price', 'filled_quantity')
+
     def __init__(self, symbol: str, order_type: str, quantity: float, 
                  price: float, timestamp: datetime):
         self.symbol = symbol
@@ -18,7 +24,12 @@ class OrderManager:
     def __init__(self):
         self.orders: List[Order] = []
         self.positions: Dict[str, float] = {}  # symbol -> quantity
-        self.trade_history: List[Dict] = []
+        self.ledger = TradeLedger()
+    
+    @property
+    def trade_history(self) -> List[Dict]:
+        """Filled trades as a list of dicts (prefer get_trade_history)"""
+        return self.ledger.to_frame().to_dict('records')
         
     def create_order(self, symbol: str, order_type: str, 
                     quantity: float, price: float, timestamp: Optional[int] = None) -> Order:
@@ -58,17 +69,39 @@ class OrderManager:
             self.positions[order.symbol] -= order.quantity
             
         # Record trade
-        self.trade_history.append({
-            'timestamp': order.timestamp,
-            'symbol': order.symbol,
-            'type': order.order_type,
-            'quantity': order.quantity,
-            'price': current_price,
-            'value': order.quantity * current_price
-        })
+        self.ledger.append(order.timestamp, order.symbol, order.order_type,
+                           order.quantity, current_price)
         
         return True
     
+    def execute_fills(self, symbol: Union[str, Sequence[str]], order_types: Sequence[str],
+                      quantities: Sequence[float], prices: Sequence[float],
+                      timestamps: Sequence[int]) -> int:
+        """Record a batch of orders filled at their own prices
+
+        Equivalent to create_order plus execute_order for each fill, but
+        the fills go straight into the ledger without Order objects.
+        symbol is either one symbol for every fill or one per fill.
+        Returns the number of fills.
+        """
+        quantities = np.asarray(quantities, dtype=float)
+        if len(quantities) == 0:
+            return 0
+        sides = np.where(np.asarray(order_types) == 'buy', BUY, SELL).astype(np.int8)
+
+        self.ledger.extend(local_us_from_ms(timestamps), symbol, sides,
+                           quantities, np.asarray(prices, dtype=float))
+
+        # Accumulate in fill order, as repeated execute_order calls would
+        signed = np.where(sides == BUY, quantities, -quantities)
+        symbols = np.full(len(quantities), symbol, dtype=object) if isinstance(symbol, str) \
+            else np.asarray(symbol, dtype=object)
+        for name in pd.unique(symbols):
+            position = self.positions.get(name, 0)
+            changes = signed[symbols == name]
+            self.positions[name] = float(np.cumsum(np.concatenate(([position], changes)))[-1])
+        return len(quantities)
+    
     def get_position(self, symbol: str) -> float:
         """Get current position for a symbol"""
         return self.positions.get(symbol, 0)
@@ -78,8 +111,12 @@ class OrderManager:
         return self.positions.copy()
     
     def get_trade_history(self) -> pd.DataFrame:
-        """Get trade history as a DataFrame"""
-        return pd.DataFrame(self.trade_history)
+        """Get trade history as a DataFrame
+
+        Each call returns a copy of the ledger's cached frame, so callers
+        may modify it freely.
+        """
+        return self.ledger.to_frame().copy()
     
     def cancel_order(self, order: Order) -> bool:
         """Cancel a pending order"""
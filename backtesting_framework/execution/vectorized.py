@@ -0,0 +1,172 @@
+import numpy as np
+from typing import Dict, Union
+
+BUY = 1
+SELL = -1
+
+
+def execute_signals(signals: np.ndarray, prices: np.ndarray,
+                    buy_sizes: np.ndarray, capital: float,
+                    position: float = 0.0) -> Dict[str, Union[np.ndarray, float]]:
+    """Simulate fills, cash and position paths for a signal array in one pass
+
+    Follows the same rules as the row-by-row engine loop: a positive signal
+    buys abs(buy_sizes[i] * capital) units at prices[i], a negative signal
+    sells the entire open position. buy_sizes holds the strategy position
+    size per unit of capital for every bar.
+    """
+    signals = np.asarray(signals)
+    prices = np.asarray(prices, dtype=float)
+    buy_sizes = np.asarray(buy_sizes, dtype=float)
+
+    active = np.flatnonzero(signals)
+    fill_index = np.empty(len(active), dtype=np.int64)
+    fill_side = np.empty(len(active), dtype=np.int8)
+    fill_quantity = np.empty(len(active), dtype=float)
+    fill_price = np.empty(len(active), dtype=float)
+    cash_after = np.empty(len(active), dtype=float)
+    position_after = np.empty(len(active), dtype=float)
+
+    initial_capital = capital
+    initial_position = position
+    n_fills = 0
+
+    # Only bars with a signal are visited; each step mirrors the loop engine
+    for i, signal, price, size in zip(active.tolist(),
+                                      signals[active].tolist(),
+                                      prices[active].tolist(),
+                                      buy_sizes[active].tolist()):
+        if signal > 0:
+            quantity = abs(size * capital)
+            if not quantity > 0:
+                continue
+            capital -= quantity * price
+            position += quantity
+            side = BUY
+        else:
+            quantity = position
+            if not quantity > 0:
+                continue
+            capital += quantity * price
+            position -= quantity
+            side = SELL
+
+        fill_index[n_fills] = i
+        fill_side[n_fills] = side
+        fill_quantity[n_fills] = quantity
+        fill_price[n_fills] = price
+        cash_after[n_fills] = capital
+        position_after[n_fills] = position
+        n_fills += 1
+
+    fill_index = fill_index[:n_fills]
+    cash_after = cash_after[:n_fills]
+    position_after = position_after[:n_fills]
+
+    # Expand the per-fill state to per-bar cash and position paths
+    last_fill = np.searchsorted(fill_index, np.arange(len(signals)), side='right') - 1
+    has_filled = last_fill >= 0
+    cash_path = np.full(len(signals), initial_capital, dtype=float)
+    position_path = np.full(len(signals), initial_position, dtype=float)
+    cash_path[has_filled] = cash_after[last_fill[has_filled]]
+    position_path[has_filled] = position_after[last_fill[has_filled]]
+
+    return {
+        'index': fill_index,
+        'side': fill_side[:n_fills],
+        'quantity': fill_quantity[:n_fills],
+        'price': fill_price[:n_fills],
+        'cash_path': cash_path,
+        'position_path': position_path,
+        'final_capital': capital,
+        'final_position': position
+    }
+
+
+def execute_portfolio_signals(signals: np.ndarray, prices: np.ndarray,
+                              buy_sizes: np.ndarray, capital: float,
+                              positions: np.ndarray = None) -> Dict[str, Union[np.ndarray, float]]:
+    """Simulate fills for a (time x asset) signal matrix with one shared cash account
+
+    Applies the execute_signals rules to every asset: a positive signal
+    buys abs(buy_sizes[t, a] * capital) units of asset a out of the shared
+    cash, a negative signal sells that asset's whole position. Only cells
+    with a signal and a price are visited, in time order and then in
+    column order within a bar, so the work grows with the number of
+    signals rather than with the number of assets.
+    """
+    signals = np.asarray(signals)
+    prices = np.asarray(prices, dtype=float)
+    buy_sizes = np.asarray(buy_sizes, dtype=float)
+    n_bars, n_assets = signals.shape
+    holdings = [0.0] * n_assets if positions is None else [float(p) for p in positions]
+    initial_holdings = np.array(holdings, dtype=float)
+
+    active_bar, active_asset = np.nonzero(signals)
+    fill_index = np.empty(len(active_bar), dtype=np.int64)
+    fill_asset = np.empty(len(active_bar), dtype=np.int64)
+    fill_side = np.empty(len(active_bar), dtype=np.int8)
+    fill_quantity = np.empty(len(active_bar), dtype=float)
+    fill_price = np.empty(len(active_bar), dtype=float)
+    cash_after = np.empty(len(active_bar), dtype=float)
+
+    initial_capital = capital
+    n_fills = 0
+
+    for i, a, signal, price, size in zip(active_bar.tolist(), active_asset.tolist(),
+                                         signals[active_bar, active_asset].tolist(),
+                                         prices[active_bar, active_asset].tolist(),
+                                         buy_sizes[active_bar, active_asset].tolist()):
+        if price != price:  # Asset not trading at this bar
+            continue
+        if signal > 0:
+            quantity = abs(size * capital)
+            if not quantity > 0:
+                continue
+            capital -= quantity * price
+            holdings[a] += quantity
+            side = BUY
+        else:
+            quantity = holdings[a]
+            if not quantity > 0:
+                continue
+            capital += quantity * price
+            holdings[a] -= quantity
+            side = SELL
+
+        fill_index[n_fills] = i
+        fill_asset[n_fills] = a
+        fill_side[n_fills] = side
+        fill_quantity[n_fills] = quantity
+        fill_price[n_fills] = price
+        cash_after[n_fills] = capital
+        n_fills += 1
+
+    fill_index = fill_index[:n_fills]
+    fill_asset = fill_asset[:n_fills]
+    fill_side = fill_side[:n_fills]
+    fill_quantity = fill_quantity[:n_fills]
+
+    # Per-bar cash from the last fill at or before each bar
+    last_fill = np.searchsorted(fill_index, np.arange(n_bars), side='right') - 1
+    has_filled = last_fill >= 0
+    cash_path = np.full(n_bars, initial_capital, dtype=float)
+    cash_path[has_filled] = cash_after[:n_fills][last_fill[has_filled]]
+
+    # Per-bar holdings: position changes accumulated down each column in fill order
+    deltas = np.zeros((n_bars + 1, n_assets))
+    deltas[0] = initial_holdings
+    deltas[fill_index + 1, fill_asset] = np.where(fill_side == BUY, fill_quantity, -fill_quantity)
+    position_path = np.cumsum(deltas, axis=0)[1:]
+
+    return {
+        'index': fill_index,
+        'asset': fill_asset,
+        'side': fill_side,
+        'quantity': fill_quantity,
+        'price': fill_price[:n_fills],
+        'cash_path': cash_path,
+        'position_path': position_path,
+        'final_capital': capital,
+        'final_positions': np.array(holdings, dtype=float)
+    }
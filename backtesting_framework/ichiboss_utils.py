@@ -1,33 +1,23 @@
 import pandas as pd
 import numpy as np
 import math
+from backtesting_framework.data.incremental import RollingZScore
 
 class Ichiboss:
     def z_score(data, window):
-        roll = data.rolling(window, min_periods=1)
-        mean = roll.mean()
-        std = roll.std()
+        # Same implementation as the live signal, which streams new values
+        scores = RollingZScore(window, min_periods=1).extend(data.to_numpy(dtype=float))
 
-        return (mean - data)/ std
+        return pd.Series(scores, index=data.index, name=data.name)
 
     def generate_position(data, threshold):
-        z = data.z_score
-        positions = [0]
-
-        # high netflow volume = sell
-        for score in z:
-            if math.isnan(score):
-                continue
-            
-            if score > threshold:
-                position = -1
-            else:
-                position = 1
-                
-            positions.append(position)
-            
-        positions_series = pd.Series(positions)
-        data['positions'] = positions_series  
+        z = data.z_score.to_numpy(dtype=float)
+
+        # high netflow volume = sell, no score yet = flat
+        positions = np.where(z > threshold, -1, 1)
+        positions[np.isnan(z)] = 0
+
+        data['positions'] = pd.Series(positions, index=data.index)
 
         data['trades'] = abs(data.positions - data.positions.shift(1))
 
@@ -58,4 +48,43 @@ class Ichiboss:
         MDD = daily_drawdown.min()
 
         print(MDD)
-        return data, sharp_ratio, trade_per_interval, MDD
\ No newline at end of file
+        return data, sharp_ratio, trade_per_interval, MDD
+
+    def scan(data, column, thresholds, windows, fees):
+        """Sharpe, trades per interval and MDD for every threshold and z-score window
+
+        Evaluates generate_position and calc_metrics for the whole
+        threshold x window grid without touching data. Each window needs
+        one rolling z-score; all thresholds of a window are evaluated at
+        once as columns of a (time x threshold) matrix. Returns a dict of
+        DataFrames indexed by threshold with one column per window.
+        """
+        thresholds = np.asarray(thresholds, dtype=float)
+        windows = list(windows)
+        p_change = data.price_change.to_numpy(dtype=float)[:, None]
+
+        results = {name: pd.DataFrame(index=pd.Index(thresholds, name='threshold'),
+                                      columns=pd.Index(windows, name='window'), dtype=float)
+                   for name in ('sharpe_ratio', 'trade_per_interval', 'MDD')}
+
+        for window in windows:
+            z = Ichiboss.z_score(data[column], window).to_numpy(dtype=float)[:, None]
+            positions = np.where(z > thresholds, -1.0, 1.0)
+            positions[np.isnan(z[:, 0])] = 0.0
+
+            # Shifted positions and trades are undefined on the first row
+            previous = np.vstack([np.full((1, len(thresholds)), np.nan), positions[:-1]])
+            trades = np.abs(positions - previous)
+            pnl = pd.DataFrame(p_change * previous - trades * fees)
+
+            sharp_ratio = pnl.sum() / pnl.count() / pnl.std() * math.sqrt(365)
+            trade_per_interval = np.nansum(trades, axis=0) / (len(trades) - 1)
+
+            equity = pnl.cumsum()
+            MDD = (equity - equity.cummax()).min()
+
+            results['sharpe_ratio'][window] = sharp_ratio.to_numpy()
+            results['trade_per_interval'][window] = trade_per_interval
+            results['MDD'][window] = MDD.to_numpy()
+
+        return results
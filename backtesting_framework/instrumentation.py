@@ -0,0 +1,168 @@
+import cProfile
+import io
+import pstats
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Union
+
+
+class NullInstrumentation:
+    """Instrumentation that records nothing, used when none is configured
+
+    stage() hands back one shared no-op context manager and count() does
+    nothing, so instrumented code costs a method call per site.
+    """
+
+    enabled = False
+
+    class _NullStage:
+        __slots__ = ()
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, exc_type, exc_value, traceback):
+            return False
+
+    _null_stage = _NullStage()
+
+    def stage(self, name: str):
+        return self._null_stage
+
+    def count(self, name: str, n: int = 1):
+        pass
+
+
+NULL_INSTRUMENTATION = NullInstrumentation()
+
+
+class Instrumentation(NullInstrumentation):
+    """Per-stage wall time, CPU time and allocations plus named counters
+
+    Wrap each stage of a run in `with instrumentation.stage('load'):`.
+    Every stage accumulates its wall and CPU seconds, the number of
+    calls and the net number of memory blocks allocated inside it;
+    count() bumps a named counter. Hooks are called with the stage name
+    and that call's measurements each time a stage ends.
+
+    With profile=True the whole session also runs under cProfile and
+    tracemalloc (which records each stage's peak bytes), and report()
+    adds the hottest functions and allocation sites. Profiling slows the
+    run down noticeably; the default mode does not.
+    """
+
+    enabled = True
+
+    def __init__(self, profile: bool = False, top: int = 25):
+        self.profile = profile
+        self.top = top
+        self.stages: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.hooks: List[Callable[[str, Dict[str, float]], None]] = []
+        self._profiler: Optional[cProfile.Profile] = None
+        self._snapshot = None
+        self._started_tracemalloc = False
+
+    def add_hook(self, hook: Callable[[str, Dict[str, float]], None]):
+        """Call hook(stage, measurements) whenever a stage ends"""
+        self.hooks.append(hook)
+
+    @contextmanager
+    def stage(self, name: str):
+        if self.profile:
+            self.start_profiling()
+            tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        cpu = time.process_time()
+        wall = time.perf_counter()
+        try:
+            yield self
+        finally:
+            measured = {
+                'wall_seconds': time.perf_counter() - wall,
+                'cpu_seconds': time.process_time() - cpu,
+                'allocated_blocks': sys.getallocatedblocks() - blocks
+            }
+            if self.profile:
+                measured['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            self._record(name, measured)
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def _record(self, name: str, measured: Dict[str, float]):
+        totals = self.stages.setdefault(name, {'calls': 0})
+        totals['calls'] += 1
+        for key, value in measured.items():
+            if key == 'peak_bytes':
+                totals[key] = max(totals.get(key, 0), value)
+            else:
+                totals[key] = totals.get(key, 0) + value
+        for hook in self.hooks:
+            hook(name, measured)
+
+    def start_profiling(self):
+        """Start cProfile and tracemalloc; stage() does this in profile mode"""
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def stop_profiling(self):
+        """Stop profiling and keep the allocation snapshot for the report"""
+        if self._profiler is not None:
+            self._profiler.disable()
+        if tracemalloc.is_tracing():
+            self._snapshot = tracemalloc.take_snapshot()
+            if self._started_tracemalloc:
+                tracemalloc.stop()
+                self._started_tracemalloc = False
+
+    def summary(self) -> Dict[str, Dict]:
+        return {
+            'stages': {name: dict(totals) for name, totals in self.stages.items()},
+            'counters': dict(self.counters)
+        }
+
+    def report(self, path: Optional[Union[str, Path]] = None) -> str:
+        """Text report of stages, counters and, when profiling, hot spots
+
+        Written to path when one is given.
+        """
+        lines = [f"{'stage':<12}{'calls':>7}{'wall (s)':>12}{'cpu (s)':>12}"
+                 f"{'blocks':>12}{'peak MB':>10}"]
+        for name, totals in self.stages.items():
+            peak = totals.get('peak_bytes')
+            lines.append(
+                f"{name:<12}{totals['calls']:>7}{totals['wall_seconds']:>12.4f}"
+                f"{totals['cpu_seconds']:>12.4f}{totals['allocated_blocks']:>12}"
+                f"{'' if peak is None else f'{peak / 2**20:.1f}':>10}"
+            )
+
+        if self.counters:
+            lines.append("\nCounters")
+            lines.extend(f"  {name}: {value}" for name, value in self.counters.items())
+
+        if self.profile:
+            self.stop_profiling()
+            if self._profiler is not None:
+                stream = io.StringIO()
+                pstats.Stats(self._profiler, stream=stream) \
+                    .sort_stats('cumulative').print_stats(self.top)
+                lines.append("\nProfile (cumulative time)")
+                lines.append(stream.getvalue())
+            if self._snapshot is not None:
+                lines.append("Allocations still held, by line")
+                for stat in self._snapshot.statistics('lineno')[:self.top]:
+                    lines.append(f"  {stat}")
+
+        text = "\n".join(lines)
+        if path is not None:
+            Path(path).write_text(text)
+        return text
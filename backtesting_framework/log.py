@@ -0,0 +1,111 @@
+import atexit
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO, Union
+
+import numpy as np
+
+PACKAGE_LOGGER = 'backtesting_framework'
+DEFAULT_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+_listener: Optional[QueueListener] = None
+_queue_handler: Optional[QueueHandler] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for a module of the framework, e.g. get_logger(__name__)"""
+    if not name.startswith(PACKAGE_LOGGER):
+        name = f"{PACKAGE_LOGGER}.{name}"
+    return logging.getLogger(name)
+
+
+def configure_logging(level: Union[int, str] = logging.INFO,
+                      stream: Optional[TextIO] = None,
+                      fmt: str = DEFAULT_FORMAT) -> QueueListener:
+    """Send the framework's log records through a queue to a background writer
+
+    Callers only put records on an in-memory queue; formatting and writing
+    to stream (stderr by default) happen on the listener's thread. Per-trade
+    records are logged at DEBUG, so level='DEBUG' shows every trade. Calling
+    this again replaces the previous configuration.
+    """
+    global _listener, _queue_handler
+    stop_logging()
+
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(logging.Formatter(fmt))
+
+    records = queue.SimpleQueue()
+    _queue_handler = QueueHandler(records)
+    _listener = QueueListener(records, handler, respect_handler_level=True)
+
+    logger = logging.getLogger(PACKAGE_LOGGER)
+    logger.setLevel(level)
+    logger.addHandler(_queue_handler)
+    logger.propagate = False
+    _listener.start()
+    return _listener
+
+
+def stop_logging():
+    """Flush queued records and remove the handler added by configure_logging"""
+    global _listener, _queue_handler
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+    if _queue_handler is not None:
+        logger = logging.getLogger(PACKAGE_LOGGER)
+        logger.removeHandler(_queue_handler)
+        logger.propagate = True
+        _queue_handler = None
+
+
+atexit.register(stop_logging)
+
+
+class EventSink:
+    """Newline-delimited JSON log of trade events
+
+    One compact JSON object per event, written through a large file
+    buffer. Meant for machine consumption, apart from the human log.
+    """
+
+    def __init__(self, path: Union[str, Path], buffer_size: int = 1 << 20):
+        self.path = Path(path)
+        self._file = open(self.path, 'w', buffering=buffer_size)
+        self.events = 0
+
+    def emit(self, event: Dict[str, Any]):
+        self._file.write(json.dumps(event, separators=(',', ':'), default=_to_json))
+        self._file.write('\n')
+        self.events += 1
+
+    def emit_columns(self, **columns: np.ndarray):
+        """Write one event per row of equally long column arrays"""
+        names = list(columns)
+        for values in zip(*(np.asarray(column).tolist() for column in columns.values())):
+            self.emit(dict(zip(names, values)))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _to_json(value: Any) -> Any:
+    """NumPy scalars and timestamps for json.dumps"""
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
@@ -1,35 +1,119 @@
+import logging
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from pathlib import Path
+from typing import Dict, Any, Optional
 from backtesting_framework.data.loader import DataLoader
 from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.data.exporter import FeatureExporter
 from backtesting_framework.strategies.base import Strategy
 from backtesting_framework.execution.order_manager import OrderManager
+from backtesting_framework.execution.vectorized import execute_signals, BUY
 from backtesting_framework.analysis.metrics import PerformanceMetrics
+from backtesting_framework.instrumentation import NULL_INSTRUMENTATION, NullInstrumentation
+from backtesting_framework.log import EventSink, get_logger
+
+logger = get_logger(__name__)
 
 class BacktestingEngine:
-    def __init__(self, data_path: str, initial_capital: float = 100000):
-        self.data_loader = DataLoader(data_path)
-        self.preprocessor = DataPreprocessor()
+    EXECUTION_MODES = ('loop', 'vectorized', 'event')
+
+    def __init__(self, data_path: str, initial_capital: float = 100000,
+                 use_cache: bool = False,
+                 feature_export: Optional[FeatureExporter] = None,
+                 instrumentation: Optional[NullInstrumentation] = None,
+                 event_sink: Optional[EventSink] = None,
+                 alignment: str = 'exact',
+                 ffill_limit: Optional[int] = None,
+                 tolerance: Optional[int] = None,
+                 source_interval: Optional[int] = None,
+                 fill_method: str = 'mean',
+                 fill_window: int = 20):
+        self.data_loader = DataLoader(data_path, use_cache=use_cache)
+        # use_cache also persists built features next to the data;
+        # alignment='asof' joins the network and miner data onto the market
+        # bars by the latest row known at each bar, and fill_method chooses
+        # how the remaining gaps are filled (see DataPreprocessor)
+        self.preprocessor = DataPreprocessor(
+            export_sink=feature_export,
+            cache_dir=Path(data_path) / '.feature_cache' if use_cache else None,
+            alignment=alignment,
+            ffill_limit=ffill_limit,
+            tolerance=tolerance,
+            source_interval=source_interval,
+            fill_method=fill_method,
+            fill_window=fill_window
+        )
         self.order_manager = OrderManager()
         self.initial_capital = initial_capital
         self.current_capital = initial_capital
         self.current_position = 0  # Track current position in BTC
+        # Per-stage timings and counters; the default records nothing
+        self.instrumentation = instrumentation or NULL_INSTRUMENTATION
+        # Optional machine-readable record of every fill
+        self.event_sink = event_sink
         
     def run_backtest(self, strategy: Strategy, 
                     start_timestamp: int = None,
-                    end_timestamp: int = None) -> Dict[str, Any]:
-        """Run a backtest with the given strategy"""
+                    end_timestamp: int = None,
+                    execution: str = 'loop') -> Dict[str, Any]:
+        """Run a backtest with the given strategy
+
+        execution selects how signals are turned into trades: 'loop' walks the
+        signals row by row, 'vectorized' simulates all fills from NumPy arrays
+        in a single pass. Both give the same trade history and final capital.
+        'event' pushes every bar through strategy.next() instead of calling
+        generate_signals, then executes the signals like 'vectorized'.
+        """
+        if execution not in self.EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution}', "
+                             f"expected one of {self.EXECUTION_MODES}")
+
+        instrumentation = self.instrumentation
+
         # Load and prepare data
-        data = self.data_loader.load_all_data()
+        with instrumentation.stage('load'):
+            data = self.data_loader.load_all_data()
         market_data = data['market']
         network_data = data['network']
         miner_data = data['miner']
         
         # Preprocess data
-        features = self.preprocessor.create_features(
-            market_data, network_data, miner_data
-        )
+        with instrumentation.stage('featurize'):
+            cache_before = self.preprocessor.cache_info() if instrumentation.enabled else None
+            features = self.preprocessor.create_features(
+                market_data, network_data, miner_data,
+                source_key=self.data_loader.source_fingerprint(),
+                columns=strategy.required_features
+            )
+        if instrumentation.enabled:
+            cache_after = self.preprocessor.cache_info()
+            instrumentation.count('feature_cache_hits', cache_after['hits'] - cache_before['hits'])
+            instrumentation.count('feature_cache_misses',
+                                  cache_after['misses'] - cache_before['misses'])
         
+        return self.run_backtest_on_features(
+            strategy, features, market_data,
+            start_timestamp=start_timestamp,
+            end_timestamp=end_timestamp,
+            execution=execution
+        )
+
+    def run_backtest_on_features(self, strategy: Strategy,
+                                 features: pd.DataFrame,
+                                 market_data: pd.DataFrame,
+                                 start_timestamp: int = None,
+                                 end_timestamp: int = None,
+                                 execution: str = 'loop') -> Dict[str, Any]:
+        """Run a backtest on features that were already built
+
+        Used by runners that load and featurize once and then run many
+        backtests over the same data.
+        """
+        if execution not in self.EXECUTION_MODES:
+            raise ValueError(f"Unknown execution mode '{execution}', "
+                             f"expected one of {self.EXECUTION_MODES}")
+
         # Filter by timestamp range if specified
         if start_timestamp:
             features = features[features.index >= start_timestamp]
@@ -39,24 +123,63 @@ class BacktestingEngine:
         if len(features) == 0:
             raise ValueError("No data available for the specified timestamp range")
             
+        instrumentation = self.instrumentation
+        instrumentation.count('bars', len(features))
+
         # Generate signals
-        signals = strategy.generate_signals(features)
+        with instrumentation.stage('signals'):
+            if execution == 'event':
+                signals = strategy.generate_event_signals(features)
+            else:
+                signals = strategy.generate_signals(features)
         
         # Execute trades based on signals
+        with instrumentation.stage('execution'):
+            if execution in ('vectorized', 'event'):
+                self._execute_vectorized(strategy, signals, features)
+            else:
+                self._execute_loop(strategy, signals, features)
+        
+        # Calculate performance metrics
+        with instrumentation.stage('metrics'):
+            metrics = PerformanceMetrics(
+                self.order_manager.get_trade_history(),
+                market_data,
+                self.initial_capital
+            )
+            calculated = metrics.calculate_metrics()
+            report = metrics.generate_report()
+        
+        return {
+            'metrics': calculated,
+            'report': report,
+            'trade_history': self.order_manager.get_trade_history(),
+            'equity_curve': metrics.equity_curve,
+            'final_capital': self.current_capital
+        }
+
+    def _execute_loop(self, strategy: Strategy, signals: pd.DataFrame,
+                      features: pd.DataFrame):
+        """Execute trades by walking the signals row by row
+
+        Every trade is logged at DEBUG level; the check is done once, so
+        nothing is formatted per trade unless DEBUG is enabled.
+        """
+        debug = logger.isEnabledFor(logging.DEBUG)
         for timestamp, row in signals.iterrows():
             if row['signal'] != 0:
                 try:
-                    print(f"\nTimestamp: {timestamp}")
-                    print(f"Signal: {row['signal']}")
-                    print(f"Current Capital: ${self.current_capital:,.2f}")
-                    print(f"Current Position: {self.current_position} BTC")
+                    if debug:
+                        logger.debug("Timestamp: %s signal: %s capital: $%s position: %s BTC",
+                                     timestamp, row['signal'], f"{self.current_capital:,.2f}",
+                                     self.current_position)
                     
                     price = features.loc[timestamp, 'price_usd_close']
                     
                     if row['signal'] > 0:  # Buy signal
                         # Calculate position size based on available capital
                         position = strategy.calculate_position_size(
-                            pd.DataFrame([row]), self.current_capital
+                            pd.DataFrame([row]), float(self.current_capital)
                         )
                         quantity = abs(position['position'].iloc[0])
                         
@@ -83,11 +206,9 @@ class BacktestingEngine:
                             )
                     
                     if quantity > 0:
-                        print(f"Order Type: {order.order_type}")
-                        print(f"Order Quantity: {order.quantity}")
-                        print(f"Order Price: ${price:,.2f}")
-                        
-                        self.order_manager.execute_order(order, price)
+                        self.instrumentation.count('orders_created')
+                        if self.order_manager.execute_order(order, price):
+                            self.instrumentation.count('orders_filled')
                         
                         # Update capital and position
                         if order.order_type == 'buy':
@@ -97,23 +218,81 @@ class BacktestingEngine:
                             self.current_capital += order.quantity * price
                             self.current_position -= order.quantity
                             
-                        print(f"Updated Capital: ${self.current_capital:,.2f}")
-                        print(f"Updated Position: {self.current_position} BTC")
+                        if debug:
+                            logger.debug("%s %s BTC at $%s, capital: $%s position: %s BTC",
+                                         order.order_type, order.quantity, f"{price:,.2f}",
+                                         f"{self.current_capital:,.2f}", self.current_position)
+                        if self.event_sink is not None:
+                            self.event_sink.emit({
+                                'timestamp': timestamp, 'symbol': order.symbol,
+                                'type': order.order_type, 'quantity': order.quantity,
+                                'price': price, 'capital': self.current_capital,
+                                'position': self.current_position
+                            })
                     
                 except KeyError as e:
-                    print(f"Warning: Missing data for timestamp {timestamp}: {e}")
+                    logger.warning("Missing data for timestamp %s: %s", timestamp, e)
                     continue
-        
-        # Calculate performance metrics
-        metrics = PerformanceMetrics(
-            self.order_manager.get_trade_history(),
-            market_data,
-            self.initial_capital
+
+    def _execute_vectorized(self, strategy: Strategy, signals: pd.DataFrame,
+                            features: pd.DataFrame):
+        """Execute trades from NumPy arrays of signals and prices
+
+        Falls back to _execute_loop when the strategy's position sizes are
+        not row-wise and linear in capital (see
+        Strategy.calculate_position_size), as they cannot be sized up front.
+        """
+        # Timestamps missing from the features are skipped, as in the loop
+        available = signals.index.isin(features.index)
+        signal_values = np.where(available, signals['signal'].to_numpy(), 0)
+        prices = features['price_usd_close'].reindex(signals.index).to_numpy(dtype=float)
+
+        # Position sizes scale with capital, so size every buy row once per unit
+        buys = signal_values > 0
+        buy_sizes = np.zeros(len(signals))
+        if buys.any():
+            unit_sizes = strategy.unit_position_sizes(signals[buys], float(self.initial_capital))
+            if unit_sizes is None:
+                logger.warning("%s.calculate_position_size is not row-wise and linear in "
+                               "capital; falling back to loop execution",
+                               type(strategy).__name__)
+                self._execute_loop(strategy, signals, features)
+                return
+            buy_sizes[buys] = unit_sizes
+
+        fills = execute_signals(
+            signal_values, prices, buy_sizes,
+            self.current_capital, self.current_position
         )
-        
-        return {
-            'metrics': metrics.calculate_metrics(),
-            'report': metrics.generate_report(),
-            'trade_history': self.order_manager.get_trade_history(),
-            'final_capital': self.current_capital
-        }
\ No newline at end of file
+
+        self.order_manager.execute_fills(
+            symbol='BTC',
+            order_types=['buy' if side == BUY else 'sell' for side in fills['side']],
+            quantities=fills['quantity'],
+            prices=fills['price'],
+            timestamps=signals.index[fills['index']]
+        )
+
+        # Fills are recorded without Order objects, so every fill counts as both
+        self.instrumentation.count('orders_created', len(fills['side']))
+        self.instrumentation.count('orders_filled', len(fills['side']))
+
+        if logger.isEnabledFor(logging.DEBUG):
+            for i, side, quantity, price in zip(fills['index'], fills['side'],
+                                                fills['quantity'], fills['price']):
+                logger.debug("%s %s BTC at $%s, capital: $%s position: %s BTC",
+                             'buy' if side == BUY else 'sell', quantity, f"{price:,.2f}",
+                             f"{fills['cash_path'][i]:,.2f}", fills['position_path'][i])
+        if self.event_sink is not None:
+            self.event_sink.emit_columns(
+                timestamp=signals.index[fills['index']],
+                symbol=np.full(len(fills['index']), 'BTC'),
+                type=np.where(fills['side'] == BUY, 'buy', 'sell'),
+                quantity=fills['quantity'],
+                price=fills['price'],
+                capital=fills['cash_path'][fills['index']],
+                position=fills['position_path'][fills['index']]
+            )
+
+        self.current_capital = fills['final_capital']
+        self.current_position = fills['final_position']
@@ -0,0 +1,191 @@
+import json
+import os
+import shutil
+import tempfile
+import weakref
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Union
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+
+# Shared frames opened by each worker process, keyed by name
+_shared_frames: Dict[str, pd.DataFrame] = {}
+
+# Columns of run() besides the strategy parameters
+RESULT_COLUMNS = ['strategy', 'start_timestamp', 'end_timestamp', 'total_return',
+                  'sharpe_ratio', 'max_drawdown', 'win_rate', 'total_trades',
+                  'avg_trade_return', 'final_capital']
+
+
+def write_shared_frame(df: pd.DataFrame, directory: Union[str, Path]):
+    """Write the numeric columns of a frame as one .npy file per column"""
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+
+    # Text columns such as the raw dates are not used by strategies
+    columns = list(df.select_dtypes(include=[np.number]).columns)
+    for i, col in enumerate(columns):
+        np.save(directory / f"col_{i}.npy", np.ascontiguousarray(df[col].to_numpy()))
+    np.save(directory / "index.npy", df.index.to_numpy())
+
+    with open(directory / "columns.json", 'w') as f:
+        json.dump({'columns': columns, 'index_name': df.index.name}, f)
+
+
+def open_shared_frame(directory: Union[str, Path]) -> pd.DataFrame:
+    """Open a frame written by write_shared_frame as read-only memory maps"""
+    directory = Path(directory)
+    with open(directory / "columns.json") as f:
+        layout = json.load(f)
+
+    data = {
+        col: np.load(directory / f"col_{i}.npy", mmap_mode='r')
+        for i, col in enumerate(layout['columns'])
+    }
+    index = pd.Index(np.load(directory / "index.npy", mmap_mode='r'),
+                     name=layout['index_name'])
+    return pd.DataFrame(data, index=index, copy=False)
+
+
+def _init_worker(shared_dir: str):
+    """Map the shared features and market data once per worker"""
+    _shared_frames['features'] = open_shared_frame(Path(shared_dir) / 'features')
+    _shared_frames['market'] = open_shared_frame(Path(shared_dir) / 'market')
+
+
+def _run_one(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Run a single backtest on the shared data in a worker process"""
+    engine = BacktestingEngine(task['data_path'], task['initial_capital'])
+    strategy = task['strategy_cls'](task['params'])
+    result = engine.run_backtest_on_features(
+        strategy,
+        _shared_frames['features'],
+        _shared_frames['market'],
+        start_timestamp=task['start_timestamp'],
+        end_timestamp=task['end_timestamp'],
+        execution=task['execution']
+    )
+    return {
+        'params': strategy.params,
+        'metrics': {**result['metrics'], 'final_capital': result['final_capital']}
+    }
+
+
+class ParallelBacktestRunner:
+    """Spread independent backtests over a process pool
+
+    Features are built once and written to memory-mapped .npy files that
+    every worker maps read-only, so the frame is never pickled per task.
+    Each run starts from a fresh engine and results are returned in run
+    order, so the numbers do not depend on the worker count. The shared
+    files are removed by close(), when a run fails, or at the latest when
+    the runner is garbage collected.
+
+    fill_method, fill_window, alignment, ffill_limit and tolerance choose
+    how the features are built (see DataPreprocessor).
+    """
+
+    def __init__(self, data_path: str, initial_capital: float = 100000,
+                 max_workers: Optional[int] = None, symbol: str = 'BTC',
+                 work_dir: Optional[Union[str, Path]] = None,
+                 fill_method: str = 'mean', fill_window: int = 20,
+                 alignment: str = 'exact',
+                 ffill_limit: Optional[int] = None,
+                 tolerance: Optional[int] = None):
+        self.data_path = str(data_path)
+        self.initial_capital = initial_capital
+        self.max_workers = max_workers or os.cpu_count()
+        self.symbol = symbol
+        self.data_loader = DataLoader(data_path)
+        self.preprocessor = DataPreprocessor(
+            alignment=alignment, ffill_limit=ffill_limit, tolerance=tolerance,
+            fill_method=fill_method, fill_window=fill_window
+        )
+        self._work_dir = work_dir
+        self._shared_dir: Optional[Path] = None
+        self._cleanup: Optional[weakref.finalize] = None
+
+    def prepare(self) -> Path:
+        """Build the features once and write them to the shared directory"""
+        if self._shared_dir is None:
+            data = self.data_loader.load_all_data(self.symbol)
+            features = self.preprocessor.create_features(
+                data['market'], data['network'], data['miner'],
+                source_key=self.data_loader.source_fingerprint(self.symbol)
+            )
+
+            shared_dir = Path(tempfile.mkdtemp(prefix='backtest_shared_',
+                                               dir=self._work_dir))
+            self._shared_dir = shared_dir
+            self._cleanup = weakref.finalize(self, shutil.rmtree, shared_dir, True)
+            try:
+                write_shared_frame(features, shared_dir / 'features')
+                write_shared_frame(data['market'], shared_dir / 'market')
+            except BaseException:
+                self.close()
+                raise
+        return self._shared_dir
+
+    def run(self, runs: List[Dict[str, Any]],
+            execution: str = 'vectorized') -> pd.DataFrame:
+        """Run every backtest and return one row of metrics per run
+
+        Each run is a dict with 'strategy_cls' and 'params' and optional
+        'start_timestamp' and 'end_timestamp' keys.
+        """
+        if not runs:
+            return pd.DataFrame(columns=RESULT_COLUMNS, index=pd.Index([], name='run_id'))
+
+        shared_dir = self.prepare()
+
+        tasks = [
+            {
+                'data_path': self.data_path,
+                'initial_capital': self.initial_capital,
+                'strategy_cls': run['strategy_cls'],
+                'params': run.get('params'),
+                'start_timestamp': run.get('start_timestamp'),
+                'end_timestamp': run.get('end_timestamp'),
+                'execution': run.get('execution', execution)
+            }
+            for run in runs
+        ]
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.max_workers,
+                                     initializer=_init_worker,
+                                     initargs=(str(shared_dir),)) as pool:
+                results = list(pool.map(_run_one, tasks))
+        except BaseException:
+            # Don't leave the shared files behind when a run fails
+            self.close()
+            raise
+
+        rows = []
+        for run_id, (task, result) in enumerate(zip(tasks, results)):
+            rows.append({
+                'run_id': run_id,
+                'strategy': task['strategy_cls'].__name__,
+                **result['params'],
+                'start_timestamp': task['start_timestamp'],
+                'end_timestamp': task['end_timestamp'],
+                **result['metrics']
+            })
+        return pd.DataFrame(rows).set_index('run_id')
+
+    def close(self):
+        """Remove the shared feature files"""
+        if self._cleanup is not None:
+            self._cleanup()
+            self._cleanup = None
+        self._shared_dir = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,177 @@
+import itertools
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, List, Optional, Type
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.strategies.base import Strategy
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from backtesting_framework.execution.order_manager import OrderManager
+from backtesting_framework.execution.vectorized import execute_signals, BUY
+from backtesting_framework.analysis.metrics import PerformanceMetrics
+from backtesting_framework.log import get_logger
+
+logger = get_logger(__name__)
+
+class ParameterSweep:
+    """Evaluate a grid of strategy parameters against data loaded once
+
+    Signals for a batch of parameter sets come from one
+    generate_signal_matrix call and every set is executed from NumPy
+    arrays. Position sizes go through Strategy.unit_position_sizes, as in
+    BacktestingEngine's vectorized execution; parameter sets whose sizing
+    is not row-wise and linear in capital are run through a
+    BacktestingEngine instead, so every row matches run_backtest.
+    """
+
+    def __init__(self, data_path: str,
+                 strategy_cls: Type[Strategy] = NetworkMetricsStrategy,
+                 initial_capital: float = 100000,
+                 symbol: str = 'BTC'):
+        self.data_loader = DataLoader(data_path)
+        self.preprocessor = DataPreprocessor()
+        self.strategy_cls = strategy_cls
+        self.initial_capital = initial_capital
+        self.symbol = symbol
+        self.market_data: Optional[pd.DataFrame] = None
+        self.features: Optional[pd.DataFrame] = None
+
+    def prepare(self) -> pd.DataFrame:
+        """Load the data and build the features once for every sweep
+
+        Like BacktestingEngine.run_backtest, only the strategy's
+        required_features are built next to the market data columns;
+        that is all generate_signal_matrix and calculate_position_size see.
+        """
+        if self.features is None:
+            data = self.data_loader.load_all_data(self.symbol)
+            self.market_data = data['market']
+            self.features = self.preprocessor.create_features(
+                data['market'], data['network'], data['miner'],
+                source_key=self.data_loader.source_fingerprint(self.symbol),
+                columns=self.strategy_cls.required_features
+            )
+        return self.features
+
+    def build_param_sets(self, param_grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+        """Expand a parameter grid into parameter sets on top of the strategy defaults"""
+        default_params = self.strategy_cls().params
+        keys = list(param_grid.keys())
+        return [
+            {**default_params, **dict(zip(keys, values))}
+            for values in itertools.product(*(param_grid[key] for key in keys))
+        ]
+
+    def run(self, param_grid: Dict[str, List[Any]],
+            start_timestamp: int = None,
+            end_timestamp: int = None,
+            rank_by: str = 'sharpe_ratio',
+            batch_size: int = 1000) -> pd.DataFrame:
+        """Run the whole grid and return a results table ranked by rank_by"""
+        features = self.prepare()
+
+        # Filter by timestamp range if specified
+        if start_timestamp:
+            features = features[features.index >= start_timestamp]
+        if end_timestamp:
+            features = features[features.index <= end_timestamp]
+
+        return self.run_on_features(features, param_grid, rank_by, batch_size)
+
+    def run_on_features(self, features: pd.DataFrame,
+                        param_grid: Dict[str, List[Any]],
+                        rank_by: str = 'sharpe_ratio',
+                        batch_size: int = 1000) -> pd.DataFrame:
+        """Run the whole grid on features that were already built and filtered
+
+        Metrics are computed against self.market_data.
+        """
+        if len(features) == 0:
+            raise ValueError("No data available for the specified timestamp range")
+
+        param_sets = self.build_param_sets(param_grid)
+        prices = features['price_usd_close'].to_numpy(dtype=float)
+        # One metrics object for the whole grid; only the trades change
+        metrics = PerformanceMetrics(OrderManager().get_trade_history(),
+                                     self.market_data, self.initial_capital)
+
+        rows = []
+        for start in range(0, len(param_sets), batch_size):
+            batch = param_sets[start:start + batch_size]
+
+            # Signals for the whole batch as one (time x parameter-set) matrix
+            signals = self.strategy_cls.generate_signal_matrix(features, batch)
+
+            for j, params in enumerate(batch):
+                strategy = self.strategy_cls(params)
+                buy_sizes = self._unit_sizes(strategy, features, signals[:, j])
+                if buy_sizes is None:
+                    rows.append(self._evaluate_with_engine(strategy, features))
+                    continue
+                rows.append(self._evaluate(
+                    params, features.index, signals[:, j], prices, buy_sizes, metrics
+                ))
+
+        results = pd.DataFrame(rows)
+        return results.sort_values(rank_by, ascending=False,
+                                   kind='mergesort').reset_index(drop=True)
+
+    def _unit_sizes(self, strategy: Strategy, features: pd.DataFrame,
+                    signals: np.ndarray) -> Optional[np.ndarray]:
+        """Buy sizes per unit of capital for one signal column, or None
+
+        None means the strategy's sizing can't be scaled by capital (see
+        Strategy.unit_position_sizes).
+        """
+        buys = signals > 0
+        buy_sizes = np.zeros(len(signals))
+        if buys.any():
+            # The sizing sees the features of the buy rows, as in the engine
+            unit_sizes = strategy.unit_position_sizes(
+                features[buys].assign(signal=signals[buys]), float(self.initial_capital)
+            )
+            if unit_sizes is None:
+                return None
+            buy_sizes[buys] = unit_sizes
+        return buy_sizes
+
+    def _evaluate_with_engine(self, strategy: Strategy,
+                              features: pd.DataFrame) -> Dict[str, Any]:
+        """Run one parameter set through a BacktestingEngine"""
+        logger.warning("%s.calculate_position_size is not row-wise and linear in capital; "
+                       "running %s through BacktestingEngine", type(strategy).__name__,
+                       strategy.params)
+        engine = BacktestingEngine(str(self.data_loader.data_path), self.initial_capital)
+        result = engine.run_backtest_on_features(strategy, features, self.market_data,
+                                                 execution='loop')
+        return {
+            **strategy.params,
+            **result['metrics'],
+            'final_capital': result['final_capital']
+        }
+
+    def _evaluate(self, params: Dict[str, Any], index: pd.Index,
+                  signals: np.ndarray, prices: np.ndarray,
+                  buy_sizes: np.ndarray,
+                  metrics: PerformanceMetrics) -> Dict[str, Any]:
+        """Execute one parameter set and compute its performance metrics"""
+        fills = execute_signals(signals, prices, buy_sizes, self.initial_capital)
+
+        order_manager = OrderManager()
+        order_manager.execute_fills(
+            symbol=self.symbol,
+            order_types=['buy' if side == BUY else 'sell' for side in fills['side']],
+            quantities=fills['quantity'],
+            prices=fills['price'],
+            timestamps=index[fills['index']]
+        )
+
+        # The order manager is discarded, so its ledger frame needs no copy
+        metrics.trade_history = order_manager.ledger.to_frame()
+
+        return {
+            **params,
+            **metrics.calculate_metrics(),
+            'final_capital': fills['final_capital']
+        }
@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Type, Union
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.strategies.base import Strategy
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from backtesting_framework.optimization.sweep import ParameterSweep
+from backtesting_framework.optimization.parallel import (
+    ParallelBacktestRunner, _init_worker, _shared_frames
+)
+
+
+def walk_forward_windows(index: pd.Index, train_size: int, test_size: int,
+                         step: Optional[int] = None,
+                         anchored: bool = False) -> List[Dict[str, int]]:
+    """Split an index into consecutive train/test windows, in bars
+
+    Each test window directly follows its train window. Windows advance
+    by step bars (test_size by default, so test windows don't overlap);
+    anchored windows keep the train start at the first bar.
+    """
+    if train_size <= 0 or test_size <= 0:
+        raise ValueError("train_size and test_size must be positive")
+    step = step or test_size
+
+    folds = []
+    train_start = 0
+    while train_start + train_size + test_size <= len(index):
+        train_stop = train_start + train_size
+        test_stop = train_stop + test_size
+        first = 0 if anchored else train_start
+        folds.append({
+            'fold': len(folds),
+            'train_start': first, 'train_stop': train_stop,
+            'test_start': train_stop, 'test_stop': test_stop
+        })
+        train_start += step
+    return folds
+
+
+def slice_frame(df: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+    """Rows start:stop of a frame as views of its column arrays, never a copy"""
+    return pd.DataFrame(
+        {col: df[col].to_numpy()[start:stop] for col in df.columns},
+        index=df.index[start:stop], copy=False
+    )
+
+
+def _market_slice(market_data: pd.DataFrame, index: pd.Index) -> pd.DataFrame:
+    """Market rows spanning the timestamps of a fold window"""
+    start, stop = market_data.index.searchsorted([index[0], index[-1]], side='left')
+    stop = stop + (stop < len(market_data) and market_data.index[stop] == index[-1])
+    return slice_frame(market_data, start, stop)
+
+
+def _run_fold(task: Dict[str, Any]) -> Dict[str, Any]:
+    """Optimize on one train window and evaluate on its test window"""
+    features = _shared_frames['features']
+    market_data = _shared_frames['market']
+    fold = task['fold']
+
+    # Optimize in sample
+    train_features = slice_frame(features, fold['train_start'], fold['train_stop'])
+    sweep = ParameterSweep(task['data_path'], task['strategy_cls'],
+                           task['initial_capital'], task['symbol'])
+    sweep.market_data = _market_slice(market_data, train_features.index)
+    ranking = sweep.run_on_features(train_features, task['param_grid'], task['rank_by'])
+    best = ranking.iloc[0]
+    params = {key: best[key] for key in sweep.build_param_sets(task['param_grid'])[0]}
+    params = {key: value.item() if isinstance(value, np.generic) else value
+              for key, value in params.items()}
+
+    # Evaluate out of sample with a fresh engine
+    test_features = slice_frame(features, fold['test_start'], fold['test_stop'])
+    engine = BacktestingEngine(task['data_path'], task['initial_capital'])
+    result = engine.run_backtest_on_features(
+        task['strategy_cls'](params),
+        test_features,
+        _market_slice(market_data, test_features.index),
+        execution=task['execution']
+    )
+    return {
+        'params': params,
+        'train_score': float(best[task['rank_by']]),
+        'metrics': {**result['metrics'], 'final_capital': result['final_capital']},
+        'equity_curve': result['equity_curve']
+    }
+
+
+class WalkForwardOptimizer:
+    """Rolling walk-forward optimization of a strategy's parameters
+
+    The history is split into train/test windows. On every train window
+    the parameter grid is swept and the best set by rank_by is run out of
+    sample on the following test window. Features are built once and
+    shared with the worker processes as memory maps (see
+    ParallelBacktestRunner); every fold slices them as views, and folds
+    run in parallel.
+
+    As the features are built once over the whole history, gaps are
+    filled with a causal fill_method ('ffill' by default, see
+    CausalImputer) so a train window never sees values from after its
+    end. The column-mean fill ('mean') would leak later data into every
+    train window. alignment, ffill_limit and tolerance are passed on to
+    DataPreprocessor as well.
+    """
+
+    def __init__(self, data_path: str,
+                 strategy_cls: Type[Strategy] = NetworkMetricsStrategy,
+                 initial_capital: float = 100000,
+                 max_workers: Optional[int] = None, symbol: str = 'BTC',
+                 work_dir: Optional[Union[str, Path]] = None,
+                 fill_method: str = 'ffill', fill_window: int = 20,
+                 alignment: str = 'exact',
+                 ffill_limit: Optional[int] = None,
+                 tolerance: Optional[int] = None):
+        self.data_path = str(data_path)
+        self.strategy_cls = strategy_cls
+        self.initial_capital = initial_capital
+        self.symbol = symbol
+        self.runner = ParallelBacktestRunner(
+            data_path, initial_capital, max_workers, symbol, work_dir,
+            fill_method=fill_method, fill_window=fill_window, alignment=alignment,
+            ffill_limit=ffill_limit, tolerance=tolerance
+        )
+
+    def run(self, param_grid: Dict[str, List[Any]],
+            train_size: int, test_size: int,
+            step: Optional[int] = None,
+            anchored: bool = False,
+            rank_by: str = 'sharpe_ratio',
+            execution: str = 'vectorized') -> Dict[str, Any]:
+        """Run every fold and stitch the out-of-sample results
+
+        train_size, test_size and step are in bars of the feature index.
+        Returns per-fold metrics ('folds') and the stitched out-of-sample
+        equity curve ('equity_curve'), which chains each fold's test
+        equity onto the end value of the previous fold.
+        """
+        shared_dir = self.runner.prepare()
+        index = pd.Index(np.load(shared_dir / 'features' / 'index.npy', mmap_mode='r'))
+        folds = walk_forward_windows(index, train_size, test_size, step, anchored)
+        if not folds:
+            raise ValueError("History too short for a single train/test window")
+
+        tasks = [
+            {
+                'data_path': self.data_path,
+                'initial_capital': self.initial_capital,
+                'strategy_cls': self.strategy_cls,
+                'symbol': self.symbol,
+                'param_grid': param_grid,
+                'rank_by': rank_by,
+                'execution': execution,
+                'fold': fold
+            }
+            for fold in folds
+        ]
+
+        try:
+            with ProcessPoolExecutor(max_workers=min(self.runner.max_workers, len(tasks)),
+                                     initializer=_init_worker,
+                                     initargs=(str(shared_dir),)) as pool:
+                results = list(pool.map(_run_fold, tasks))
+        except BaseException:
+            # Don't leave the shared files behind when a fold fails
+            self.close()
+            raise
+
+        rows = []
+        for fold, result in zip(folds, results):
+            rows.append({
+                'fold': fold['fold'],
+                'train_start': index[fold['train_start']],
+                'train_end': index[fold['train_stop'] - 1],
+                'test_start': index[fold['test_start']],
+                'test_end': index[fold['test_stop'] - 1],
+                **result['params'],
+                f"train_{rank_by}": result['train_score'],
+                **result['metrics']
+            })
+
+        return {
+            'folds': pd.DataFrame(rows).set_index('fold'),
+            'equity_curve': self.stitch_equity([r['equity_curve'] for r in results])
+        }
+
+    def stitch_equity(self, curves: List[pd.Series]) -> pd.Series:
+        """Chain per-fold equity curves into one out-of-sample curve
+
+        Every fold starts from initial_capital, so each curve is rescaled
+        to begin where the stitched curve left off.
+        """
+        stitched = []
+        level = float(self.initial_capital)
+        for curve in curves:
+            if len(curve) == 0:
+                continue
+            if stitched:
+                # Days shared with the previous fold are kept from that fold
+                curve = curve[curve.index > stitched[-1].index[-1]]
+                if len(curve) == 0:
+                    continue
+            scaled = curve * (level / self.initial_capital)
+            stitched.append(scaled)
+            level = float(scaled.iloc[-1])
+        if not stitched:
+            return pd.Series(dtype=float)
+        return pd.concat(stitched)
+
+    def close(self):
+        self.runner.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,142 @@
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.strategies.base import Strategy
+from backtesting_framework.execution.order_manager import OrderManager
+from backtesting_framework.execution.vectorized import execute_portfolio_signals, BUY
+from backtesting_framework.analysis.metrics import PortfolioMetrics
+
+class PortfolioBacktestingEngine:
+    """Backtests one strategy across several assets sharing one cash account
+
+    Every asset gets its own features and signals; these are aligned into
+    (time x asset) price, signal and position-size matrices on the union
+    of the assets' timestamps and executed in a single pass with
+    execute_portfolio_signals. Buys draw on the shared cash, sells close
+    that asset's position.
+
+    network_symbol selects whose network and miner data feed the features
+    of every asset (BTC by default, the only on-chain data available);
+    None gives each asset its own.
+    """
+
+    def __init__(self, data_path: str, symbols: List[str],
+                 initial_capital: float = 100000,
+                 network_symbol: Optional[str] = 'BTC',
+                 use_cache: bool = False):
+        if not symbols:
+            raise ValueError("At least one symbol is required")
+        self.symbols = list(symbols)
+        self.network_symbol = network_symbol
+        self.data_loader = DataLoader(data_path, use_cache=use_cache)
+        self.preprocessor = DataPreprocessor(
+            cache_dir=Path(data_path) / '.feature_cache' if use_cache else None
+        )
+        self.order_manager = OrderManager()
+        self.initial_capital = initial_capital
+        self.current_capital = initial_capital
+        self.current_positions = np.zeros(len(self.symbols))
+        
+    def create_features(self, columns: Optional[List[str]] = None) -> Dict[str, pd.DataFrame]:
+        """Build the features of every asset"""
+        features = {}
+        for symbol in self.symbols:
+            data_symbol = self.network_symbol or symbol
+            market_data = self.data_loader.load_asset_market_data(symbol)
+            features[symbol] = self.preprocessor.create_features(
+                market_data,
+                self.data_loader.load_network_data(data_symbol),
+                self.data_loader.load_miner_data(data_symbol),
+                source_key=self.data_loader.source_fingerprint(symbol) +
+                           self.data_loader.source_fingerprint(data_symbol),
+                columns=columns
+            )
+        return features
+        
+    def run_backtest(self, strategy: Strategy,
+                     start_timestamp: int = None,
+                     end_timestamp: int = None) -> Dict[str, Any]:
+        """Run the strategy on every asset and execute the portfolio"""
+        features = self.create_features(strategy.required_features)
+        return self.run_backtest_on_features(strategy, features,
+                                             start_timestamp, end_timestamp)
+
+    def run_backtest_on_features(self, strategy: Strategy,
+                                 features: Dict[str, pd.DataFrame],
+                                 start_timestamp: int = None,
+                                 end_timestamp: int = None) -> Dict[str, Any]:
+        """Run a portfolio backtest on per-asset features that were already built"""
+        features = dict(features)
+        for symbol in self.symbols:
+            asset_features = features[symbol]
+            if start_timestamp:
+                asset_features = asset_features[asset_features.index >= start_timestamp]
+            if end_timestamp:
+                asset_features = asset_features[asset_features.index <= end_timestamp]
+            features[symbol] = asset_features
+            
+        index = pd.Index(sorted(set().union(*(f.index for f in features.values()))))
+        if len(index) == 0:
+            raise ValueError("No data available for the specified timestamp range")
+            
+        # (time x asset) matrices on the union of timestamps
+        prices = pd.DataFrame(
+            {symbol: features[symbol]['price_usd_close'] for symbol in self.symbols}
+        ).reindex(index)
+        signals = np.zeros((len(index), len(self.symbols)), dtype=np.int8)
+        buy_sizes = np.zeros((len(index), len(self.symbols)))
+        
+        for a, symbol in enumerate(self.symbols):
+            if len(features[symbol]) == 0:
+                continue
+            rows = index.get_indexer(features[symbol].index)
+            asset_signals = strategy.generate_signals(features[symbol])
+            signals[rows, a] = asset_signals['signal'].to_numpy()
+            
+            # Position sizes scale with capital, so size every buy row once per unit
+            buys = asset_signals['signal'].to_numpy() > 0
+            if buys.any():
+                unit_sizes = strategy.unit_position_sizes(asset_signals[buys],
+                                                          float(self.initial_capital))
+                if unit_sizes is None:
+                    raise ValueError(f"{type(strategy).__name__}.calculate_position_size must "
+                                     f"return one size per signal row, linear in capital")
+                buy_sizes[rows[buys], a] = unit_sizes
+                
+        fills = execute_portfolio_signals(
+            signals, prices.to_numpy(dtype=float), buy_sizes,
+            self.current_capital, self.current_positions
+        )
+        
+        self.order_manager.execute_fills(
+            symbol=np.array(self.symbols, dtype=object)[fills['asset']],
+            order_types=np.where(fills['side'] == BUY, 'buy', 'sell'),
+            quantities=fills['quantity'],
+            prices=fills['price'],
+            timestamps=index[fills['index']]
+        )
+        
+        self.current_capital = fills['final_capital']
+        self.current_positions = fills['final_positions']
+        
+        # Calculate performance metrics
+        metrics = PortfolioMetrics(
+            self.order_manager.get_trade_history(),
+            prices,
+            self.initial_capital
+        )
+        
+        return {
+            'metrics': metrics.calculate_metrics(),
+            'report': metrics.generate_report(),
+            'trade_history': self.order_manager.get_trade_history(),
+            'equity_curve': metrics.equity_curve,
+            'cash': pd.Series(fills['cash_path'], index=index),
+            'positions': pd.DataFrame(fills['position_path'], index=index,
+                                      columns=self.symbols),
+            'final_capital': self.current_capital,
+            'final_positions': dict(zip(self.symbols, self.current_positions.tolist()))
+        }
@@ -1,28 +1,159 @@
-from abc import ABC, abstractmethod
+from abc import ABC
+import numpy as np
 import pandas as pd
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+
+class BarView:
+    """Read-only view of the current row of a features frame
+
+    The engine builds one view per run and moves it along by setting i,
+    so no Series is created per bar. Columns are converted to lists up
+    front, making bar['column'] (or bar.column) a dict and a list lookup.
+    """
+    __slots__ = ('_columns', '_index', 'i')
+
+    def __init__(self, data: pd.DataFrame):
+        self._columns = {col: data[col].tolist() for col in data.columns}
+        self._index = data.index.tolist()
+        self.i = 0
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __getitem__(self, column: str) -> Any:
+        return self._columns[column][self.i]
+
+    def __getattr__(self, column: str) -> Any:
+        try:
+            return self._columns[column][self.i]
+        except KeyError:
+            raise AttributeError(column) from None
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._columns
+
+    @property
+    def timestamp(self) -> Any:
+        return self._index[self.i]
+
+    def get(self, column: str, default: Any = None) -> Any:
+        values = self._columns.get(column)
+        return default if values is None else values[self.i]
+
+    def history(self, column: str, length: int) -> List[Any]:
+        """The last length values of a column, up to and including the current bar"""
+        return self._columns[column][max(0, self.i - length + 1):self.i + 1]
 
 class Strategy(ABC):
+    """Base class of trading strategies
+
+    Subclasses implement generate_signals() (vectorized), next() (event
+    driven) or both; defining a class with neither raises TypeError.
+    Intermediate base classes that leave both to their own subclasses
+    opt out with abstract=True in the class statement.
+    """
+
+    # Feature columns generate_signals reads (see data.features.FEATURES);
+    # None means every registered feature is built
+    required_features: Optional[List[str]] = None
+
+    def __init_subclass__(cls, abstract: bool = False, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not abstract and cls.next is Strategy.next and \
+                cls.generate_signals is Strategy.generate_signals:
+            raise TypeError(f"{cls.__name__} must implement next() or generate_signals(), "
+                            f"or be declared with abstract=True")
+
     def __init__(self, params: Dict[str, Any] = None):
         self.params = params or {}
         self.positions = pd.DataFrame()
         self.signals = pd.DataFrame()
 
 
-    def next(self):
+    def reset(self):
+        """Clear any rolling state before a new run of next() calls"""
         pass
+
+    def next(self, bar: BarView) -> Optional[int]:
+        """Return the signal for one bar: 1 buy, -1 sell, 0 or None to hold
+
+        Event-driven strategies override this and keep whatever rolling
+        state they need on self; bar only exposes the current row and the
+        rows before it.
+        """
+        raise NotImplementedError(f"{type(self).__name__} does not implement next()")
         
-    @abstractmethod
     def generate_signals(self, data: pd.DataFrame) -> pd.DataFrame:
-        """Generate trading signals based on the strategy logic"""
-        pass
+        """Generate trading signals based on the strategy logic
+
+        Vectorized strategies override this; by default the bars are
+        replayed through next().
+        """
+        return self.generate_event_signals(data)
+
+    def generate_event_signals(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Generate signals by pushing every bar through next()"""
+        bar = BarView(data)
+        next_bar = self.next
+        signal_values = np.zeros(len(bar), dtype=np.int8)
+
+        self.reset()
+        for i in range(len(bar)):
+            bar.i = i
+            signal = next_bar(bar)
+            if signal:
+                signal_values[i] = signal
+
+        signals = pd.DataFrame({'signal': signal_values}, index=data.index)
+        self.signals = signals
+        return signals
     
     def calculate_position_size(self, signals: pd.DataFrame, 
                               portfolio_value: float) -> pd.DataFrame:
-        """Calculate position sizes based on signals and portfolio value"""
+        """Calculate position sizes based on signals and portfolio value
+
+        Must return one row per row of signals, in the same order, with
+        the size in a 'position' column, and the sizes must scale linearly
+        with portfolio_value. The vectorized executors size all buy rows
+        once at a portfolio value of 1.0 and scale by the capital at each
+        fill (see unit_position_sizes).
+        """
         positions = signals.copy()
         positions['position'] = positions['signal'] * portfolio_value
         return positions
+
+    def unit_position_sizes(self, signals: pd.DataFrame,
+                            portfolio_value: float) -> Optional[np.ndarray]:
+        """Position size of every row of signals per unit of capital
+
+        Returns None when calculate_position_size does not keep its
+        contract: when it does not give one size per row, or when sizing
+        at portfolio_value is not the unit sizes scaled by portfolio_value.
+        """
+        unit = self.calculate_position_size(signals, 1.0)['position'].to_numpy(dtype=float)
+        if len(unit) != len(signals):
+            return None
+        if portfolio_value != 1.0:
+            probe = self.calculate_position_size(
+                signals, portfolio_value
+            )['position'].to_numpy(dtype=float)
+            if len(probe) != len(signals) or not np.allclose(
+                    probe, unit * portfolio_value, rtol=1e-9, atol=0, equal_nan=True):
+                return None
+        return unit
+    
+    @classmethod
+    def generate_signal_matrix(cls, data: pd.DataFrame,
+                               param_sets: List[Dict[str, Any]]) -> np.ndarray:
+        """Generate a (time x parameter-set) signal matrix
+
+        Falls back to one generate_signals call per parameter set; strategies
+        whose rules are simple comparisons override this with a batched version.
+        """
+        signals = np.zeros((len(data), len(param_sets)), dtype=np.int8)
+        for j, params in enumerate(param_sets):
+            signals[:, j] = cls(params).generate_signals(data)['signal'].to_numpy()
+        return signals
     
     def update_positions(self, new_positions: pd.DataFrame):
         """Update the current positions"""
@@ -1,9 +1,11 @@
 import pandas as pd
 import numpy as np
-from typing import Dict, Any
-from .base import Strategy
+from typing import Dict, Any, List
+from .base import Strategy, BarView
 
 class NetworkMetricsStrategy(Strategy):
+    required_features = ['address_growth', 'network_velocity', 'hash_rate_growth']
+
     def __init__(self, params: Dict[str, Any] = None):
         default_params = {
             'address_threshold': 0.05,  # 5% growth threshold
@@ -43,9 +45,55 @@ class NetworkMetricsStrategy(Strategy):
         
         return signals
     
+    def next(self, bar: BarView) -> int:
+        """Signal for one bar, with the same rules as generate_signals"""
+        address_growth = bar['address_growth']
+        network_velocity = bar['network_velocity']
+        hash_rate_growth = bar['hash_rate_growth']
+        
+        # Sell conditions take precedence over buy conditions
+        if (address_growth < -self.params['address_threshold'] or
+                network_velocity < -self.params['velocity_threshold'] or
+                hash_rate_growth < -self.params['hash_rate_threshold']):
+            return -1
+        if (address_growth > self.params['address_threshold'] and
+                network_velocity > self.params['velocity_threshold'] and
+                hash_rate_growth > self.params['hash_rate_threshold']):
+            return 1
+        return 0
+    
     def calculate_position_size(self, signals: pd.DataFrame, 
                               portfolio_value: float) -> pd.DataFrame:
         """Calculate position sizes with network metrics strategy"""
         positions = signals.copy()
         positions['position'] = positions['signal'] * portfolio_value * self.params['position_size']
-        return positions 
\ No newline at end of file
+        return positions
+    
+    @classmethod
+    def generate_signal_matrix(cls, data: pd.DataFrame,
+                               param_sets: List[Dict[str, Any]]) -> np.ndarray:
+        """Generate a (time x parameter-set) signal matrix in one batched pass"""
+        address_threshold = np.array([p['address_threshold'] for p in param_sets])
+        velocity_threshold = np.array([p['velocity_threshold'] for p in param_sets])
+        hash_rate_threshold = np.array([p['hash_rate_threshold'] for p in param_sets])
+        
+        address_growth = data['address_growth'].to_numpy()[:, None]
+        network_velocity = data['network_velocity'].to_numpy()[:, None]
+        hash_rate_growth = data['hash_rate_growth'].to_numpy()[:, None]
+        
+        # Same conditions as generate_signals, broadcast over parameter sets
+        buy_conditions = (
+            (address_growth > address_threshold) &
+            (network_velocity > velocity_threshold) &
+            (hash_rate_growth > hash_rate_threshold)
+        )
+        sell_conditions = (
+            (address_growth < -address_threshold) |
+            (network_velocity < -velocity_threshold) |
+            (hash_rate_growth < -hash_rate_threshold)
+        )
+        
+        signals = np.zeros(buy_conditions.shape, dtype=np.int8)
+        signals[buy_conditions] = 1
+        signals[sell_conditions] = -1
+        return signals
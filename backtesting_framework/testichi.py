@@ -5,7 +5,8 @@ import numpy as np
 import datetime
 from typing import Dict
 import math
-import ichiboss_utils
+# Run from the repository root: python -m backtesting_framework.testichi
+from backtesting_framework import ichiboss_utils
 
 fees = 0.0006
 
@@ -0,0 +1,124 @@
+import asyncio
+import csv
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Tuple, Union
+
+from api.client import CybotradeClient, run_sync
+from api.endpoints import ENDPOINTS, Endpoint
+
+
+def plan_windows(endpoint: Endpoint, start_time: int,
+                 end_time: int) -> List[Tuple[int, int]]:
+    """Split [start_time, end_time] into windows of at most one page each"""
+    span = endpoint.limit * endpoint.interval_ms
+    return [(window_start, min(window_start + span, end_time + 1) - 1)
+            for window_start in range(start_time, end_time + 1, span)]
+
+
+async def _fetch_window(client: CybotradeClient, endpoint: Endpoint,
+                        window_start: int, window_end: int, part_path: Path) -> int:
+    """Fetch every page of one window and stream the rows to a part file"""
+    written = 0
+    page_start = window_start
+    writer = None
+    with open(part_path, 'w', newline='') as f:
+        while page_start <= window_end:
+            response = await client.fetch(endpoint, start_time=page_start,
+                                          end_time=window_end)
+            rows = response.get('data') if isinstance(response, dict) else None
+            if not rows:
+                break
+
+            rows = sorted(rows, key=lambda row: int(row['start_time']))
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()),
+                                        extrasaction='ignore')
+                writer.writeheader()
+            writer.writerows(rows)
+            written += len(rows)
+
+            # A full page may be truncated: continue after its last row
+            last_start_time = int(rows[-1]['start_time'])
+            if len(rows) < endpoint.limit or last_start_time + endpoint.interval_ms > window_end:
+                break
+            page_start = last_start_time + 1
+    return written
+
+
+def merge_parts(part_paths: List[Path], out_path: Union[str, Path]) -> int:
+    """Concatenate part files in window order, dropping repeated start_times"""
+    out_path = Path(out_path)
+    tmp_path = out_path.with_name(f".{out_path.name}.{os.getpid()}.tmp")
+    written = 0
+    last_start_time = None
+    writer = None
+
+    with open(tmp_path, 'w', newline='') as out:
+        for part_path in part_paths:
+            with open(part_path, newline='') as f:
+                for row in csv.DictReader(f):
+                    start_time = int(row['start_time'])
+                    if last_start_time is not None and start_time <= last_start_time:
+                        continue
+                    if writer is None:
+                        writer = csv.DictWriter(out, fieldnames=list(row.keys()),
+                                                extrasaction='ignore')
+                        writer.writeheader()
+                    writer.writerow(row)
+                    last_start_time = start_time
+                    written += 1
+    os.replace(tmp_path, out_path)
+    return written
+
+
+async def backfill(client: CybotradeClient, endpoint: Union[str, Endpoint],
+                   out_path: Union[str, Path],
+                   start_time: Optional[int] = None,
+                   end_time: Optional[int] = None) -> int:
+    """Fetch an endpoint's full history into a CSV, paginating past the row limit
+
+    The history is split into windows of one page each, which are fetched
+    concurrently (bounded by the client's concurrency limit). Pages are
+    streamed to per-window part files as they arrive, then merged in time
+    order and deduplicated on start_time, so memory stays bounded by the
+    pages in flight. Returns the number of rows written.
+    """
+    if isinstance(endpoint, str):
+        endpoint = ENDPOINTS[endpoint]
+    start_time = start_time if start_time is not None else endpoint.start_time
+    if start_time is None:
+        raise ValueError(f"Endpoint '{endpoint.name}' has no start_time; pass one explicitly")
+    end_time = end_time if end_time is not None else int(time.time() * 1000)
+
+    windows = plan_windows(endpoint, start_time, end_time)
+    parts_dir = Path(tempfile.mkdtemp(prefix=f"{endpoint.name}_",
+                                      dir=Path(out_path).parent))
+    try:
+        part_paths = [parts_dir / f"part_{i:06d}.csv" for i in range(len(windows))]
+
+        # Bound the windows (and open part files) in progress at any time
+        slots = asyncio.Semaphore(client.max_concurrency)
+
+        async def fetch_window(window: Tuple[int, int], part_path: Path) -> int:
+            async with slots:
+                return await _fetch_window(client, endpoint, window[0], window[1], part_path)
+
+        await asyncio.gather(*(
+            fetch_window(window, part_path)
+            for window, part_path in zip(windows, part_paths)
+        ))
+        return merge_parts(part_paths, out_path)
+    finally:
+        shutil.rmtree(parts_dir, ignore_errors=True)
+
+
+def backfill_to_csv(name: str, out_path: Union[str, Path], **kwargs: Any) -> int:
+    """Synchronous wrapper around backfill for scripts and notebooks"""
+    async def _backfill():
+        async with CybotradeClient() as client:
+            return await backfill(client, name, out_path, **kwargs)
+    return run_sync(_backfill())
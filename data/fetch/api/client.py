@@ -0,0 +1,141 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, Optional, Union
+
+import aiohttp
+from dotenv import load_dotenv
+
+from api.endpoints import ENDPOINTS, Endpoint
+
+# Load environment variables from .env file
+load_dotenv()
+
+# Overridable so the client can be pointed at a local stand-in server
+BASE_URL = os.getenv("CYBOTRADE_BASE_URL", "https://api.datasource.cybotrade.rs")
+
+
+class CybotradeClient:
+    """Async client for the cybotrade datasource API
+
+    One pooled HTTP session is shared by all requests, at most
+    max_concurrency of them are in flight at once, and requests failing
+    with 429/5xx or a connection error are retried with exponential backoff.
+    Use it as an async context manager:
+
+        async with CybotradeClient() as client:
+            data = await client.fetch('velocity')
+    """
+
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, api_key: Optional[str] = None,
+                 base_url: str = BASE_URL,
+                 max_concurrency: int = 8,
+                 timeout: float = 30.0,
+                 max_retries: int = 5,
+                 backoff: float = 0.5):
+        self.api_key = api_key or os.getenv("API_KEY")
+        self.base_url = base_url.rstrip('/')
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
+    async def open(self):
+        """Create the pooled session"""
+        if self._session is None:
+            headers = {"accept": "application/json"}
+            if self.api_key:
+                headers["X-API-KEY"] = self.api_key
+            self._session = aiohttp.ClientSession(
+                headers=headers,
+                connector=aiohttp.TCPConnector(limit=self.max_concurrency),
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def get(self, path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """GET a path and return the decoded JSON body, retrying transient errors"""
+        await self.open()
+        url = f"{self.base_url}{path}"
+
+        for attempt in range(self.max_retries + 1):
+            retry_after = None
+            try:
+                async with self._semaphore:
+                    async with self._session.get(url, params=params) as response:
+                        if response.status not in self.RETRY_STATUSES:
+                            response.raise_for_status()
+                            return await response.json(content_type=None)
+                        retry_after = response.headers.get('Retry-After')
+                        error = aiohttp.ClientResponseError(
+                            response.request_info, response.history,
+                            status=response.status, message=response.reason or ''
+                        )
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                error = e
+
+            if attempt == self.max_retries:
+                raise error
+
+            delay = self.backoff * (2 ** attempt)
+            if retry_after is not None:
+                try:
+                    delay = max(delay, float(retry_after))
+                except ValueError:
+                    pass
+            await asyncio.sleep(delay)
+
+    async def fetch(self, endpoint: Union[str, Endpoint], **overrides) -> Dict[str, Any]:
+        """Fetch one registered endpoint, optionally overriding query parameters"""
+        if isinstance(endpoint, str):
+            endpoint = ENDPOINTS[endpoint]
+        return await self.get(endpoint.path, endpoint.query_params(**overrides))
+
+    async def fetch_many(self, endpoints: Iterable[Union[str, Endpoint]]) -> Dict[str, Any]:
+        """Fetch several endpoints concurrently, keyed by endpoint name"""
+        endpoints = [ENDPOINTS[e] if isinstance(e, str) else e for e in endpoints]
+        results = await asyncio.gather(*(self.fetch(e) for e in endpoints))
+        return {endpoint.name: result for endpoint, result in zip(endpoints, results)}
+
+
+def run_sync(coro):
+    """Run a coroutine to completion, also from inside a running event loop (notebooks)"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def fetch_endpoint(name: str, **overrides) -> Optional[Dict[str, Any]]:
+    """Fetch one registered endpoint synchronously, returning None on failure"""
+    async def _fetch():
+        async with CybotradeClient() as client:
+            return await client.fetch(name, **overrides)
+
+    try:
+        return run_sync(_fetch())
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        print(f"Error making request: {e}")
+        return None
+    except ValueError as e:
+        print(f"Error parsing JSON response: {e}")
+        return None
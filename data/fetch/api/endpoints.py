@@ -0,0 +1,114 @@
+from typing import Any, Dict, NamedTuple, Optional
+
+# Interval length in milliseconds for the glassnode 'i' and cryptoquant 'window' values
+INTERVAL_MS = {
+    '10m': 10 * 60 * 1000,
+    '1h': 60 * 60 * 1000,
+    'hour': 60 * 60 * 1000,
+    '24h': 24 * 60 * 60 * 1000,
+    'day': 24 * 60 * 60 * 1000,
+    '1w': 7 * 24 * 60 * 60 * 1000,
+    'week': 7 * 24 * 60 * 60 * 1000,
+}
+
+
+class Endpoint(NamedTuple):
+    """A cybotrade datasource endpoint and its default query"""
+    name: str
+    path: str
+    asset: Optional[str] = None  # glassnode 'a'; cryptoquant carries the asset in the path
+    interval: str = '24h'  # glassnode 'i' or cryptoquant 'window'
+    start_time: Optional[int] = None  # Milliseconds since epoch
+    limit: int = 10000
+    params: Dict[str, Any] = {}  # Provider specific extras such as 'exchange'
+    dataset: Optional[str] = None  # CSV file under data/market_data kept in sync
+
+    @property
+    def provider(self) -> str:
+        return self.path.strip('/').split('/')[0]
+
+    @property
+    def interval_ms(self) -> int:
+        return INTERVAL_MS[self.interval]
+
+    def query_params(self, **overrides) -> Dict[str, Any]:
+        """Build the provider specific query string parameters"""
+        query = {}
+        if self.provider == 'glassnode':
+            query['a'] = self.asset
+            query['i'] = self.interval
+        else:
+            query['window'] = self.interval
+        query.update(self.params)
+        if self.start_time is not None:
+            query['start_time'] = self.start_time
+        query['limit'] = self.limit
+        query.update({key: value for key, value in overrides.items() if value is not None})
+        return query
+
+
+ENDPOINTS: Dict[str, Endpoint] = {endpoint.name: endpoint for endpoint in [
+    # cryptoquant
+    Endpoint('reserve', '/cryptoquant/btc/exchange-flows/reserve',
+             interval='day', limit=20, params={'exchange': 'all_exchange'},
+             dataset='BTC-ExchangeFlows-Reserve.csv'),
+    Endpoint('market_price_usd', '/cryptoquant/btc/fund-data/market-price-usd',
+             interval='hour', params={'symbol': 'gbtc'},
+             dataset='BTC-FundData-MarketPriceUSD.csv'),
+    Endpoint('market_volume_usd', '/cryptoquant/btc/fund-data/market-volume',
+             interval='day', params={'symbol': 'gbtc'},
+             dataset='BTC-FundData-MarketVolume.csv'),
+    Endpoint('Price_OHLCV', '/cryptoquant/alt/market-data/price-ohlcv',
+             interval='day', start_time=1199145600000, params={'token': 'doge'},  # 2008 01 01
+             dataset='Alt-Market-Data-OHLCV-Doge.csv'),
+    Endpoint('addresses_count', '/cryptoquant/btc/network-data/tokens-transferred',
+             interval='day', start_time=1199145600000,
+             dataset='BTC-NetworkData-AddressesCount.csv'),
+    Endpoint('velocity', '/cryptoquant/btc/network-data/velocity',
+             interval='day', start_time=1199145600000,
+             dataset='BTC-NetworkData-Velocity.csv'),
+
+    # glassnode
+    Endpoint('addresses_active', '/glassnode/addresses/active_count',
+             asset='BTC', interval='24h', start_time=1430697600000, limit=5000,  # 4 May 2015
+             dataset='BTC-Addresses-ActiveCount.csv'),
+    Endpoint('addresses_newZeroCount', '/glassnode/addresses/new_non_zero_count',
+             asset='BTC', interval='24h', start_time=1430697600000, limit=5000,
+             dataset='BTC-Addresses-NewNonZero.csv'),
+    Endpoint('new', '/glassnode/addresses/new_non_zero_count',
+             asset='BTC', interval='24h', start_time=1430697600000,
+             dataset='BTC-NetworkData-Addresses_NewNonZero.csv'),
+    Endpoint('hash_rate', '/glassnode/mining/hash_rate_mean',
+             asset='BTC', interval='24h', start_time=1430697600000,
+             dataset='BTC-Miner-HashRate.csv'),
+    Endpoint('indicators_mvrv', '/glassnode/indicators/mvrv_account_based',
+             asset='BTC', interval='1h', start_time=1270815381000, limit=2000,
+             dataset='BTC-Indicators-Mvrv.csv'),
+    Endpoint('miner_volume', '/glassnode/mining/volume_mined_sum',
+             asset='BTC', interval='1h', start_time=1270815381000, limit=2000,
+             dataset='BTC-Miner-VolumeSum.csv'),
+    Endpoint('miner_fees', '/glassnode/mining/revenue_from_fees',
+             asset='BTC', interval='1h', start_time=1270815381000, limit=2000,
+             dataset='BTC-Miner-Fees.csv'),
+    Endpoint('miner_total', '/glassnode/mining/revenue_sum',
+             asset='BTC', interval='1h', start_time=1270815381000, limit=2000,
+             dataset='BTC-Miner-Total.csv'),
+    Endpoint('price_close', '/glassnode/market/price_usd_close',
+             asset='BTC', interval='1h', start_time=1428581781000, limit=1000,
+             dataset='BTC-Market-PriceClose.csv'),
+    Endpoint('transaction_volume', '/glassnode/transactions/transfers_volume_adjusted_sum',
+             asset='BTC', interval='1h', start_time=1270815381000, limit=2000,
+             dataset='BTC-Transactions-VolumeSum.csv'),
+    Endpoint('transaction_transfer_volume_exchanges_net',
+             '/glassnode/transactions/transfers_volume_exchanges_net',
+             asset='BTC', interval='24h', start_time=1270815381000, limit=2000,
+             dataset='BTC-NetworkData-Addresses_ExchangeNetflowVolume.csv'),
+    Endpoint('transaction_Exchange_Withdrawal',
+             '/glassnode/transactions/transfers_from_exchanges_count',
+             asset='BTC', interval='24h', start_time=1270815381000, limit=2000,
+             dataset='BTC-NetworkData-Addresses_ExchangeWithdrawals.csv'),
+    Endpoint('transaction_Exchange_Inflow_Volume',
+             '/glassnode/transactions/transfers_volume_to_exchanges_mean',
+             asset='BTC', interval='24h', start_time=1270815381000, limit=2000,
+             dataset='BTC-NetworkData-Addresses_ExchangeInflowVolume.csv'),
+]}
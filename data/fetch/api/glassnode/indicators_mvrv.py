@@ -1,41 +1,12 @@
-import requests
+"""Fetch helper for one registered endpoint
+
+Run from data/fetch, like the fetch notebook: python -m api.glassnode.indicators_mvrv
+"""
 import json
-from urllib.parse import urlencode
-import os
-from dotenv import load_dotenv
+from api.client import fetch_endpoint
 
-# Load environment variables from .env file
-load_dotenv()
 def indicators_mvrv():
-    url = "https://api.datasource.cybotrade.rs/glassnode/indicators/mvrv_account_based"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "1h",
-        "start_time": 1270815381000,
-        "limit": 2000   
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None
+    return fetch_endpoint('indicators_mvrv')
 
 if __name__ == "__main__":
     result = indicators_mvrv()
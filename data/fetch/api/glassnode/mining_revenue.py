@@ -1,104 +1,19 @@
-import requests
-import json
-from urllib.parse import urlencode
-import os
-from dotenv import load_dotenv
+"""Fetch helper for one registered endpoint
 
-# Load environment variables from .env file
-load_dotenv()
+Run from data/fetch, like the fetch notebook: python -m api.glassnode.mining_revenue
+"""
+import json
+from api.client import fetch_endpoint
 
 def miner_volume():
-    url = "https://api.datasource.cybotrade.rs/glassnode/mining/volume_mined_sum"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "1h",
-        "start_time": 1270815381000,
-        "limit": 2000  
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None
-    
+    return fetch_endpoint('miner_volume')
+
 def miner_fees():
-    url = "https://api.datasource.cybotrade.rs/glassnode/mining/revenue_from_fees"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "1h",
-        "start_time": 1270815381000,
-        "limit": 2000  
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None
-    
+    return fetch_endpoint('miner_fees')
+
 def miner_total():
-    url = "https://api.datasource.cybotrade.rs/glassnode/mining/revenue_sum"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "1h",
-        "start_time": 1270815381000,
-        "limit": 2000  
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None
+    return fetch_endpoint('miner_total')
+
 if __name__ == "__main__":
     result = miner_total()
     if result:
@@ -1,135 +1,22 @@
-import requests
+"""Fetch helper for one registered endpoint
+
+Run from data/fetch, like the fetch notebook: python -m api.glassnode.transactions_volumeSum
+"""
 import json
-from urllib.parse import urlencode
-import os
-from dotenv import load_dotenv
+from api.client import fetch_endpoint
 
-# Load environment variables from .env file
-load_dotenv()
 def transaction_volume():
-    url = "https://api.datasource.cybotrade.rs/glassnode/transactions/transfers_volume_adjusted_sum"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "1h",
-        "start_time": 1270815381000,
-        "limit": 2000   
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None
+    return fetch_endpoint('transaction_volume')
 
 def transaction_transfer_volume_exchanges_net():
-    url = "https://api.datasource.cybotrade.rs/glassnode/transactions/transfers_volume_exchanges_net"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "24h",
-        "start_time": 1270815381000,
-        "limit": 2000   
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None
-
+    return fetch_endpoint('transaction_transfer_volume_exchanges_net')
 
 def transaction_Exchange_Withdrawal():
-    url = "https://api.datasource.cybotrade.rs/glassnode/transactions/transfers_from_exchanges_count"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "24h",
-        "start_time": 1270815381000,
-        "limit": 2000   
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None   
-    
+    return fetch_endpoint('transaction_Exchange_Withdrawal')
+
 def transaction_Exchange_Inflow_Volume():
-    url = "https://api.datasource.cybotrade.rs/glassnode/transactions/transfers_volume_to_exchanges_mean"
-    
-    headers = {
-        "accept": "application/json",
-        "X-API-KEY": os.getenv("API_KEY")
-    }
-    query_params = {
-        "a": "BTC",
-        "i": "24h",
-        "start_time": 1270815381000,
-        "limit": 2000   
-    }
-    
-    # Build the URL with query parameters
-    full_url = f"{url}?{urlencode(query_params)}"
-    
-    try:
-        # Make the GET request
-        response = requests.get(full_url, headers=headers)
-        response.raise_for_status()  # Raise an exception for bad status codes
-        
-        # Parse the JSON response and return the dictionary
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"Error making request: {e}")
-        return None
-    except json.JSONDecodeError as e:
-        print(f"Error parsing JSON response: {e}")
-        return None   
+    return fetch_endpoint('transaction_Exchange_Inflow_Volume')
+
 if __name__ == "__main__":
     result = transaction_Exchange_Inflow_Volume()
     if result:
@@ -0,0 +1,169 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from api.backfill import backfill
+from api.client import CybotradeClient, run_sync
+from api.endpoints import ENDPOINTS, Endpoint
+
+DATA_DIR = Path(__file__).resolve().parent.parent / 'market_data'
+MANIFEST_FILE = 'sync_manifest.json'
+
+
+def read_watermark(path: Path) -> Optional[int]:
+    """Scan a dataset CSV for its latest start_time"""
+    watermark = None
+    with open(path, newline='') as f:
+        for row in csv.DictReader(f):
+            value = row.get('start_time')
+            if value:
+                start_time = int(float(value))
+                if watermark is None or start_time > watermark:
+                    watermark = start_time
+    return watermark
+
+
+def load_manifest(data_dir: Path) -> Dict[str, Dict[str, Any]]:
+    try:
+        with open(data_dir / MANIFEST_FILE) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def save_manifest(data_dir: Path, manifest: Dict[str, Dict[str, Any]]):
+    """Write the manifest atomically"""
+    tmp_path = data_dir / f".{MANIFEST_FILE}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, data_dir / MANIFEST_FILE)
+
+
+def current_watermark(path: Path, entry: Optional[Dict[str, Any]]) -> Optional[int]:
+    """Watermark from the manifest, or from the file if it changed since the last sync"""
+    if not path.exists():
+        return None
+    stat = path.stat()
+    if entry and entry.get('size') == stat.st_size and entry.get('mtime_ns') == stat.st_mtime_ns:
+        return entry['watermark']
+    return read_watermark(path)
+
+
+def _ends_with_newline(path: Path) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return True
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) in (b'\n', b'\r')
+
+
+def append_new_rows(path: Path, new_rows_path: Path,
+                    watermark: Optional[int]) -> Tuple[int, Optional[int]]:
+    """Atomically append rows newer than watermark to a dataset CSV
+
+    Returns the number of rows appended and the new watermark.
+    """
+    with open(new_rows_path, newline='') as f:
+        rows = [row for row in csv.DictReader(f)
+                if watermark is None or int(float(row['start_time'])) > watermark]
+    if not rows:
+        return 0, watermark
+
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', newline='') as out:
+        fieldnames = None
+        if path.exists():
+            with open(path, newline='') as existing:
+                fieldnames = next(csv.reader(existing), None)
+                existing.seek(0)
+                shutil.copyfileobj(existing, out)
+            if not _ends_with_newline(path):
+                out.write('\n')
+
+        writer = csv.DictWriter(out, fieldnames=fieldnames or list(rows[0].keys()),
+                                extrasaction='ignore')
+        if not fieldnames:
+            writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp_path, path)
+    return len(rows), max(int(float(row['start_time'])) for row in rows)
+
+
+async def sync_dataset(client: CybotradeClient, endpoint: Endpoint,
+                       data_dir: Path, manifest: Dict[str, Dict[str, Any]]) -> int:
+    """Fetch only rows newer than the dataset's watermark and append them"""
+    path = data_dir / endpoint.dataset
+    watermark = current_watermark(path, manifest.get(endpoint.dataset))
+    new_rows_path = data_dir / f".{endpoint.name}.{os.getpid()}.new.csv"
+
+    try:
+        if watermark is None and endpoint.start_time is None:
+            # No history and no known start: take the endpoint's default page
+            response = await client.fetch(endpoint)
+            rows = response.get('data') or []
+            with open(new_rows_path, 'w', newline='') as f:
+                if rows:
+                    writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()),
+                                            extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(rows)
+        else:
+            start_time = watermark + 1 if watermark is not None else None
+            await backfill(client, endpoint, new_rows_path, start_time=start_time)
+
+        appended, watermark = append_new_rows(path, new_rows_path, watermark)
+    finally:
+        if new_rows_path.exists():
+            new_rows_path.unlink()
+
+    if path.exists():
+        stat = path.stat()
+        manifest[endpoint.dataset] = {
+            'endpoint': endpoint.name,
+            'watermark': watermark,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'synced_at': int(time.time() * 1000)
+        }
+    return appended
+
+
+async def sync(names: Optional[List[str]] = None,
+               data_dir: Union[str, Path] = DATA_DIR,
+               client: Optional[CybotradeClient] = None) -> Dict[str, int]:
+    """Incrementally sync datasets, returning the rows appended per endpoint"""
+    data_dir = Path(data_dir)
+    endpoints = [ENDPOINTS[name] for name in names] if names else \
+        [endpoint for endpoint in ENDPOINTS.values() if endpoint.dataset]
+
+    manifest = load_manifest(data_dir)
+    own_client = client is None
+    client = client or CybotradeClient()
+    try:
+        await client.open()
+        appended = await asyncio.gather(*(
+            sync_dataset(client, endpoint, data_dir, manifest) for endpoint in endpoints
+        ))
+    finally:
+        if own_client:
+            await client.close()
+        save_manifest(data_dir, manifest)
+    return {endpoint.name: count for endpoint, count in zip(endpoints, appended)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fetch only new rows for each dataset")
+    parser.add_argument('names', nargs='*', help="Endpoint names to sync (default: all)")
+    parser.add_argument('--data-dir', default=str(DATA_DIR))
+    args = parser.parse_args()
+
+    result = run_sync(sync(args.names or None, args.data_dir))
+    for name, count in result.items():
+        print(f"{name}: {count} new rows")
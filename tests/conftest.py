@@ -0,0 +1,86 @@
+import asyncio
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# The fetch scripts import 'api' rooted at data/fetch, as when run from there
+FETCH_DIR = Path(__file__).resolve().parent.parent / 'data' / 'fetch'
+if str(FETCH_DIR) not in sys.path:
+    sys.path.insert(0, str(FETCH_DIR))
+
+
+class StandInDatasource:
+    """A local stand-in for the cybotrade datasource API
+
+    Serves rows registered per path, honouring the start_time, end_time
+    and limit query parameters like the real API. Statuses queued in
+    failures are returned, in order, before any data, and every request
+    is recorded.
+    """
+
+    def __init__(self):
+        self.rows = {}
+        self.failures = []
+        self.requests = []
+        self.in_flight = self.max_in_flight = 0
+        self.delay = 0.0
+        self.base_url = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    async def _handle(self, request):
+        from aiohttp import web
+
+        self.requests.append((request.path, dict(request.query), dict(request.headers)))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.failures:
+                status, headers = self.failures.pop(0)
+                return web.Response(status=status, headers=headers)
+            if request.path not in self.rows:
+                return web.Response(status=404)
+
+            query = request.query
+            start = int(query.get('start_time', 0))
+            end = int(query['end_time']) if 'end_time' in query else None
+            rows = [row for row in self.rows[request.path]
+                    if row['start_time'] >= start and (end is None or row['start_time'] <= end)]
+            return web.json_response({'data': rows[:int(query.get('limit', len(rows)))]})
+        finally:
+            self.in_flight -= 1
+
+    async def _start(self):
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_route('GET', '/{tail:.*}', self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, '127.0.0.1', 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    def start(self):
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self._start(), self._loop).result()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+
+@pytest.fixture
+def datasource():
+    pytest.importorskip('aiohttp')
+    server = StandInDatasource()
+    server.start()
+    yield server
+    server.stop()
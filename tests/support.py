@@ -0,0 +1,62 @@
+"""Data and strategies shared by the tests"""
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from backtesting_framework.strategies.base import Strategy
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+
+# The sample data bundled with the repository
+DATA_PATH = Path(__file__).resolve().parent.parent / 'data' / 'market_data'
+
+# Thresholds low enough to trade often on make_features() data
+PARAMS = {
+    'address_threshold': 0.005,
+    'velocity_threshold': 0.01,
+    'hash_rate_threshold': 0.01,
+    'position_size': 0.1
+}
+
+
+def make_features(bars=400, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.Index(1577836800000 + np.arange(bars) * 3600000, name='start_time')
+    price = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, bars)))
+    return pd.DataFrame({
+        'price_usd_close': price,
+        'address_growth': rng.normal(0, 0.02, bars),
+        'network_velocity': rng.normal(0, 0.02, bars),
+        'hash_rate_growth': rng.normal(0, 0.02, bars),
+    }, index=index)
+
+
+class SingleRowSizingStrategy(Strategy):
+    """Sizes from capital / price and returns one row, like the example notebook"""
+
+    def generate_signals(self, data):
+        data = data.copy()
+        fast = data['price_usd_close'].rolling(5).mean()
+        slow = data['price_usd_close'].rolling(20).mean()
+        data['signal'] = 0
+        data.loc[fast > slow, 'signal'] = 1
+        data.loc[fast < slow, 'signal'] = -1
+        return data
+
+    def calculate_position_size(self, data, capital):
+        quantity = capital / data['price_usd_close'].iloc[0]
+        return pd.DataFrame({'position': [quantity * data['signal'].iloc[0]]})
+
+
+class CappedSizingStrategy(NetworkMetricsStrategy):
+    """Sizes that stop growing with capital above a cap"""
+
+    def calculate_position_size(self, signals, portfolio_value):
+        positions = super().calculate_position_size(signals, portfolio_value)
+        positions['position'] = positions['position'].clip(upper=500.0)
+        return positions
+
+
+class FailingStrategy(NetworkMetricsStrategy):
+    """Raises while generating signals"""
+
+    def generate_signals(self, data):
+        raise RuntimeError("signal generation failed")
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.alignment import (AsofAligner, asof_indexer, infer_interval,
+                                                  sort_source)
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, PARAMS
+
+DAY_MS = 24 * 60 * 60 * 1000
+
+
+def test_rows_are_known_one_lag_after_their_timestamp():
+    source = [0, 10, 20]
+    target = [5, 9, 10, 19, 20, 30, 40]
+    np.testing.assert_array_equal(asof_indexer(source, target, lag=10),
+                                  [-1, -1, 0, 0, 1, 2, 2])
+    np.testing.assert_array_equal(asof_indexer(source, target, lag=10,
+                                               allow_exact_matches=False),
+                                  [-1, -1, -1, 0, 0, 1, 2])
+    np.testing.assert_array_equal(asof_indexer(source, target), [0, 0, 1, 1, 2, 2, 2])
+
+
+def test_limit_caps_the_repeats_of_a_row():
+    source = [0, 10]
+    target = [0, 1, 2, 3, 10, 11, 12]
+    np.testing.assert_array_equal(asof_indexer(source, target, limit=2),
+                                  [0, 0, 0, -1, 1, 1, 1])
+    np.testing.assert_array_equal(asof_indexer(source, target, limit=0),
+                                  [0, -1, -1, -1, 1, -1, -1])
+    # A gap before the first match doesn't count against the limit
+    np.testing.assert_array_equal(asof_indexer([5], [0, 5, 6, 7], limit=1), [-1, 0, 0, -1])
+
+
+def test_tolerance_is_measured_from_when_a_row_is_known():
+    source = [0, 10]
+    target = [5, 15, 16, 25, 26]
+    # Known at 5 and 15; a row exactly tolerance old is still used
+    np.testing.assert_array_equal(asof_indexer(source, target, tolerance=10, lag=5),
+                                  [0, 1, 1, 1, -1])
+    np.testing.assert_array_equal(asof_indexer(source, target, tolerance=0, lag=5),
+                                  [0, 1, -1, -1, -1])
+    np.testing.assert_array_equal(asof_indexer([], target, tolerance=10),
+                                  [-1, -1, -1, -1, -1])
+
+
+def test_infer_interval_and_sort_source():
+    assert infer_interval([0, 10, 20, 20, 40, 50]) == 10
+    assert infer_interval([7]) == 0
+    np.testing.assert_array_equal(sort_source([20, 10, 20, 0]), [3, 1, 2])
+    np.testing.assert_array_equal(sort_source([20, 10, 20, 0], keep='first'), [3, 1, 0])
+
+
+def test_aligner_sorts_and_deduplicates_sources():
+    series = pd.Series([3.0, 1.0, 2.0, 4.0], index=[20, 0, 10, 20], name='v')
+    target = pd.Index([5, 10, 20, 30, 35])
+
+    aligner = AsofAligner(source_interval=10)
+    pd.testing.assert_series_equal(aligner.align(series, target),
+                                   pd.Series([np.nan, 1.0, 2.0, 4.0, 4.0], index=target, name='v'))
+    # The interval is inferred from the source when not given
+    pd.testing.assert_series_equal(AsofAligner().align(series, target),
+                                   aligner.align(series, target))
+    frame = AsofAligner(source_interval=10, limit=0).align_frame(series.to_frame(), target)
+    np.testing.assert_array_equal(frame['v'], [np.nan, 1.0, 2.0, 4.0, np.nan])
+
+
+def test_engine_features_use_rows_known_at_each_bar():
+    engine = BacktestingEngine(str(DATA_PATH), alignment='asof')
+    data = engine.data_loader.load_all_data()
+    features = engine.preprocessor.create_features(data['market'], data['network'],
+                                                   data['miner'])
+
+    # Daily rows stamped with the day's start are known from the next day on
+    velocity = data['network']['Velocity']['velocity_supply_total']
+    expected = velocity.reindex(features.index - DAY_MS).to_numpy()
+    known = ~np.isnan(expected)
+    assert known.mean() > 0.9
+    np.testing.assert_array_equal(features['network_velocity'].to_numpy()[known],
+                                  expected[known])
+
+    exact = DataPreprocessor().create_features(data['market'], data['network'], data['miner'])
+    assert not np.array_equal(features['network_velocity'], exact['network_velocity'])
+
+
+def test_engine_passes_the_alignment_options_on():
+    engine = BacktestingEngine(str(DATA_PATH), alignment='asof', ffill_limit=3,
+                               tolerance=2 * DAY_MS, source_interval=0)
+    assert engine.preprocessor.aligner.settings() == (3, 2 * DAY_MS, True, 0)
+
+    results = engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS)), execution='vectorized')
+    loop = BacktestingEngine(str(DATA_PATH), alignment='asof', ffill_limit=3,
+                             tolerance=2 * DAY_MS, source_interval=0).run_backtest(
+        NetworkMetricsStrategy(dict(PARAMS)), execution='loop')
+    assert results['final_capital'] == loop['final_capital']
+
+    with pytest.raises(ValueError, match='alignment'):
+        BacktestingEngine(str(DATA_PATH), alignment='nearest')
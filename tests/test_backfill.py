@@ -0,0 +1,95 @@
+import asyncio
+import csv
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from api.backfill import _fetch_window, backfill, merge_parts, plan_windows
+from api.client import CybotradeClient
+from api.endpoints import Endpoint
+
+DAY_MS = 24 * 60 * 60 * 1000
+START = 1577836800000  # 2020 01 01
+ENDPOINT = Endpoint('test_metric', '/glassnode/test/metric', asset='BTC',
+                    interval='24h', start_time=START, limit=3)
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return [{'start_time': int(row['start_time']), 'v': float(row['v'])}
+                for row in csv.DictReader(f)]
+
+
+def write_part(path, start_times):
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['start_time', 'v'])
+        writer.writerows([start_time, i] for i, start_time in enumerate(start_times))
+
+
+def test_plan_windows_cover_the_range_in_pages():
+    end = START + 10 * DAY_MS + 5
+    windows = plan_windows(ENDPOINT, START, end)
+
+    assert windows[0][0] == START and windows[-1][1] == end
+    for (_, previous_end), (window_start, _) in zip(windows, windows[1:]):
+        assert window_start == previous_end + 1
+    assert all(window_end - window_start < 3 * DAY_MS for window_start, window_end in windows)
+    assert len(windows) == 4
+
+
+def test_plan_windows_of_a_single_instant():
+    assert plan_windows(ENDPOINT, START, START) == [(START, START)]
+
+
+def test_fetch_window_follows_truncated_pages(datasource, tmp_path):
+    # Twice as many rows as one page holds: half-day rows on a daily endpoint
+    rows = [{'start_time': START + i * DAY_MS // 2, 'v': float(i)} for i in range(6)]
+    datasource.rows[ENDPOINT.path] = rows
+    window_end = START + 3 * DAY_MS - 1
+
+    async def _fetch():
+        async with CybotradeClient(base_url=datasource.base_url, backoff=0) as client:
+            return await _fetch_window(client, ENDPOINT, START, window_end, tmp_path / 'part.csv')
+
+    assert asyncio.run(_fetch()) == 6
+    assert read_rows(tmp_path / 'part.csv') == rows
+    assert [int(query['start_time']) for _, query, _ in datasource.requests] == \
+        [START, rows[2]['start_time'] + 1]
+    assert all(int(query['end_time']) == window_end for _, query, _ in datasource.requests)
+
+
+def test_merge_parts_drops_repeated_start_times(tmp_path):
+    write_part(tmp_path / 'a.csv', [1, 2, 3])
+    write_part(tmp_path / 'b.csv', [3, 4])
+    write_part(tmp_path / 'c.csv', [])
+    write_part(tmp_path / 'd.csv', [2, 5])
+
+    written = merge_parts([tmp_path / name for name in ('a.csv', 'b.csv', 'c.csv', 'd.csv')],
+                          tmp_path / 'out.csv')
+
+    assert written == 5
+    assert read_rows(tmp_path / 'out.csv') == [
+        {'start_time': 1, 'v': 0.0}, {'start_time': 2, 'v': 1.0},
+        {'start_time': 3, 'v': 2.0}, {'start_time': 4, 'v': 1.0},
+        {'start_time': 5, 'v': 1.0}
+    ]
+    assert not any(path.name.endswith('.tmp') for path in tmp_path.iterdir())
+
+
+def test_backfill_matches_the_full_history(datasource, tmp_path):
+    rows = [{'start_time': START + i * DAY_MS, 'v': float(i)} for i in range(20)]
+    datasource.rows[ENDPOINT.path] = rows
+    out_path = tmp_path / 'history.csv'
+
+    async def _backfill():
+        async with CybotradeClient(base_url=datasource.base_url, backoff=0,
+                                   max_concurrency=2) as client:
+            return await backfill(client, ENDPOINT, out_path, end_time=rows[-1]['start_time'])
+
+    assert asyncio.run(_backfill()) == 20
+    assert read_rows(out_path) == rows
+    assert datasource.max_in_flight <= 2
+    # The part files are removed once merged
+    assert list(tmp_path.iterdir()) == [out_path]
@@ -0,0 +1,59 @@
+import pandas as pd
+import pytest
+from backtesting_framework.chunked import ChunkedBacktestingEngine
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, PARAMS
+
+
+def in_memory(fill_method, start_timestamp=None, end_timestamp=None):
+    return BacktestingEngine(str(DATA_PATH), fill_method=fill_method).run_backtest(
+        NetworkMetricsStrategy(dict(PARAMS)), start_timestamp, end_timestamp,
+        execution='vectorized')
+
+
+def assert_same_results(chunked, expected):
+    assert chunked['final_capital'] == expected['final_capital']
+    pd.testing.assert_frame_equal(chunked['trade_history'], expected['trade_history'])
+    pd.testing.assert_series_equal(chunked['equity_curve'], expected['equity_curve'])
+    assert chunked['metrics'] == pytest.approx(expected['metrics'], rel=1e-12, nan_ok=True)
+
+
+@pytest.mark.parametrize('chunk_size', [13, 97, 1000, 100000])
+def test_chunks_match_the_in_memory_engine(tmp_path, chunk_size):
+    engine = ChunkedBacktestingEngine(str(DATA_PATH), chunk_size=chunk_size,
+                                      cache_dir=tmp_path)
+    result = engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS)))
+
+    assert_same_results(result, in_memory('ffill'))
+    bars = len(engine.source.price.unique_times())
+    assert result['chunks'] == -(-bars // chunk_size)
+
+
+@pytest.mark.parametrize('fill_method', ['expanding_mean', 'rolling_median'])
+def test_every_causal_fill_matches(tmp_path, fill_method):
+    engine = ChunkedBacktestingEngine(str(DATA_PATH), chunk_size=250, cache_dir=tmp_path,
+                                      fill_method=fill_method)
+    assert_same_results(engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS))),
+                        in_memory(fill_method))
+
+
+def test_timestamp_range_matches(tmp_path):
+    start, end = 1577836800000, 1640995199000  # 2020 and 2021
+    engine = ChunkedBacktestingEngine(str(DATA_PATH), chunk_size=300, cache_dir=tmp_path)
+    result = engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS)), start, end)
+    assert_same_results(result, in_memory('ffill', start, end))
+
+    with pytest.raises(ValueError, match='No data'):
+        ChunkedBacktestingEngine(str(DATA_PATH), cache_dir=tmp_path).run_backtest(
+            NetworkMetricsStrategy(dict(PARAMS)), start_timestamp=4102444800000)
+
+
+def test_unsupported_options_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match='causal fill_method'):
+        ChunkedBacktestingEngine(str(DATA_PATH), cache_dir=tmp_path, fill_method='mean')
+    with pytest.raises(ValueError, match='cache'):
+        ChunkedBacktestingEngine(str(DATA_PATH), cache_dir=tmp_path, use_cache=True)
+    engine = ChunkedBacktestingEngine(str(DATA_PATH), cache_dir=tmp_path)
+    with pytest.raises(ValueError, match='vectorized'):
+        engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS)), execution='loop')
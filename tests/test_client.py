@@ -0,0 +1,84 @@
+import asyncio
+import time
+
+import pytest
+
+aiohttp = pytest.importorskip('aiohttp')
+
+from api.client import CybotradeClient, run_sync
+from api.endpoints import ENDPOINTS
+
+
+def client_for(datasource, **kwargs):
+    kwargs.setdefault('backoff', 0)
+    return CybotradeClient(api_key='secret', base_url=datasource.base_url, **kwargs)
+
+
+def fetch(datasource, name, **kwargs):
+    async def _fetch():
+        async with client_for(datasource, **kwargs) as client:
+            return await client.fetch(name)
+    return run_sync(_fetch())
+
+
+def test_fetch_sends_endpoint_query_and_api_key(datasource):
+    endpoint = ENDPOINTS['hash_rate']
+    datasource.rows[endpoint.path] = [{'start_time': endpoint.start_time, 'v': 1.5}]
+
+    assert fetch(datasource, 'hash_rate') == {'data': [{'start_time': endpoint.start_time, 'v': 1.5}]}
+    (path, query, headers), = datasource.requests
+    assert path == endpoint.path
+    assert query == {key: str(value) for key, value in endpoint.query_params().items()}
+    assert headers['X-API-KEY'] == 'secret'
+
+
+def test_transient_statuses_are_retried(datasource):
+    endpoint = ENDPOINTS['velocity']
+    datasource.rows[endpoint.path] = [{'start_time': endpoint.start_time, 'v': 2}]
+    datasource.failures = [(429, {}), (503, {}), (502, {})]
+
+    assert fetch(datasource, 'velocity', max_retries=3)['data'] == [{'start_time': endpoint.start_time, 'v': 2}]
+    assert len(datasource.requests) == 4
+
+
+def test_retry_after_is_honoured(datasource):
+    endpoint = ENDPOINTS['velocity']
+    datasource.rows[endpoint.path] = []
+    datasource.failures = [(429, {'Retry-After': '0.3'})]
+
+    started = time.perf_counter()
+    fetch(datasource, 'velocity')
+    assert time.perf_counter() - started >= 0.3
+    assert len(datasource.requests) == 2
+
+
+def test_gives_up_after_max_retries(datasource):
+    datasource.failures = [(503, {})] * 3
+
+    with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+        fetch(datasource, 'velocity', max_retries=2)
+    assert excinfo.value.status == 503
+    assert len(datasource.requests) == 3
+
+
+def test_client_errors_are_not_retried(datasource):
+    with pytest.raises(aiohttp.ClientResponseError) as excinfo:
+        fetch(datasource, 'velocity')
+    assert excinfo.value.status == 404
+    assert len(datasource.requests) == 1
+
+
+def test_fetch_many_is_bounded_by_max_concurrency(datasource):
+    names = ['reserve', 'velocity', 'hash_rate', 'price_close', 'miner_fees', 'miner_total']
+    for name in names:
+        datasource.rows[ENDPOINTS[name].path] = [{'start_time': ENDPOINTS[name].start_time or 0, 'name': name}]
+    datasource.delay = 0.05
+
+    async def _fetch_many():
+        async with client_for(datasource, max_concurrency=2) as client:
+            return await client.fetch_many(names)
+
+    results = asyncio.run(_fetch_many())
+    assert {name: result['data'][0]['name'] for name, result in results.items()} == \
+        {name: name for name in names}
+    assert datasource.max_in_flight == 2
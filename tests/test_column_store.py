@@ -0,0 +1,68 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.column_store import ColumnStore
+
+
+def write_csv(path, closes, dates=None):
+    pd.DataFrame({
+        'start_time': 1672531200000 + np.arange(len(closes)) * 3600000,
+        'date': dates if dates is not None else ['2023-01-01'] * len(closes),
+        'price_usd_close': closes,
+    }).to_csv(path, index=False)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ColumnStore(tmp_path / 'cache')
+    builds = []
+    build = store._build
+    monkeypatch.setattr(store, '_build', lambda *args: builds.append(args[0]) or build(*args))
+    store.builds = builds
+    return store
+
+
+def test_read_csv_matches_pandas(tmp_path, store):
+    csv = tmp_path / 'BTC-Test.csv'
+    write_csv(csv, [1.5, np.nan, 3.0], dates=['2023-01-01', None, '2023-01-03'])
+    # Numeric columns come back memory-mapped; copy to compare the values
+    pd.testing.assert_frame_equal(store.read_csv(csv).copy(), pd.read_csv(csv))
+    pd.testing.assert_frame_equal(store.read_csv(csv).copy(), pd.read_csv(csv))
+    assert len(store.builds) == 1
+
+
+def test_size_change_rebuilds(tmp_path, store):
+    csv = tmp_path / 'BTC-Test.csv'
+    write_csv(csv, [1.0, 2.0])
+    store.read_csv(csv)
+    write_csv(csv, [1.0, 2.0, 3.0])
+    assert store.read_csv(csv)['price_usd_close'].tolist() == [1.0, 2.0, 3.0]
+    assert len(store.builds) == 2
+    # Only the current version is kept
+    assert len([p for p in (tmp_path / 'cache' / 'BTC-Test').iterdir() if p.is_dir()]) == 1
+
+
+def test_same_size_content_change_rebuilds(tmp_path, store):
+    csv = tmp_path / 'BTC-Test.csv'
+    write_csv(csv, [1.0, 2.0])
+    store.read_csv(csv)
+    size = csv.stat().st_size
+    write_csv(csv, [1.0, 3.0])
+    assert csv.stat().st_size == size
+    stat = csv.stat()
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.read_csv(csv)['price_usd_close'].tolist() == [1.0, 3.0]
+    assert len(store.builds) == 2
+
+
+def test_touch_without_change_does_not_rebuild(tmp_path, store):
+    csv = tmp_path / 'BTC-Test.csv'
+    write_csv(csv, [1.0, 2.0])
+    store.read_csv(csv)
+    stat = csv.stat()
+    os.utime(csv, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert store.read_csv(csv)['price_usd_close'].tolist() == [1.0, 2.0]
+    assert len(store.builds) == 1
+    # The new mtime is recorded, so the next read skips the hash
+    assert store._read_meta(tmp_path / 'cache' / 'BTC-Test')['mtime_ns'] == csv.stat().st_mtime_ns
@@ -0,0 +1,34 @@
+import pandas as pd
+import pytest
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.portfolio import PortfolioBacktestingEngine
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import (PARAMS, CappedSizingStrategy, SingleRowSizingStrategy,
+                     make_features)
+
+
+def run(strategy, execution):
+    engine = BacktestingEngine('unused')
+    features = make_features()
+    return engine.run_backtest_on_features(strategy, features, features, execution=execution)
+
+
+@pytest.mark.parametrize('strategy_cls', [
+    NetworkMetricsStrategy, SingleRowSizingStrategy, CappedSizingStrategy
+])
+@pytest.mark.parametrize('execution', ['vectorized', 'event'])
+def test_execution_modes_match_loop(strategy_cls, execution):
+    if execution == 'event' and strategy_cls is SingleRowSizingStrategy:
+        pytest.skip("strategy has no next()")
+    expected = run(strategy_cls(dict(PARAMS)), 'loop')
+    result = run(strategy_cls(dict(PARAMS)), execution)
+
+    assert len(expected['trade_history']) > 0
+    pd.testing.assert_frame_equal(expected['trade_history'], result['trade_history'])
+    assert result['final_capital'] == pytest.approx(expected['final_capital'], rel=1e-12)
+
+
+def test_portfolio_rejects_non_row_wise_sizing():
+    engine = PortfolioBacktestingEngine('unused', ['BTC'])
+    with pytest.raises(ValueError, match='calculate_position_size'):
+        engine.run_backtest_on_features(SingleRowSizingStrategy(), {'BTC': make_features()})
@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.exporter import FeatureExporter
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, PARAMS
+
+
+def make_features(rows=50, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'price_usd_close': rng.random(rows) * 1000,
+        'volume_change': rng.standard_normal(rows),
+        'count': rng.integers(0, 100, rows)
+    }, index=pd.Index(1577836800000 + 86400000 * np.arange(rows), name='start_time'))
+
+
+def read_back(path, format):
+    if format == 'pickle':
+        return pd.read_pickle(path)
+    if format == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_csv(path, index_col='start_time')
+
+
+@pytest.mark.parametrize('suffix, format', [('.pkl', 'pickle'), ('.parquet', 'parquet'),
+                                            ('.csv', 'csv')])
+def test_export_round_trips(tmp_path, suffix, format):
+    if format == 'parquet':
+        pytest.importorskip('pyarrow')
+    features = make_features()
+    path = tmp_path / f'features{suffix}'
+
+    with FeatureExporter(path) as exporter:
+        assert exporter.format == format
+        exporter.submit(features)
+
+    pd.testing.assert_frame_equal(read_back(path, format), features, check_exact=format != 'csv')
+    assert (tmp_path / f'features{suffix}.sha1').read_text() == FeatureExporter.content_hash(features)
+    assert sorted(p.name for p in tmp_path.iterdir()) == [path.name, path.name + '.sha1']
+
+
+def test_export_writes_a_snapshot(tmp_path):
+    features = make_features()
+    expected = features.copy()
+    path = tmp_path / 'features.pkl'
+
+    with FeatureExporter(path) as exporter:
+        exporter.submit(features)
+        features.iloc[:, 0] = -1.0
+
+    pd.testing.assert_frame_equal(pd.read_pickle(path), expected)
+
+
+def test_unchanged_features_are_not_rewritten(tmp_path):
+    path = tmp_path / 'features.pkl'
+    with FeatureExporter(path, background=False) as exporter:
+        exporter.submit(make_features())
+        exporter.submit(make_features())
+        assert (exporter.writes, exporter.skipped) == (1, 1)
+        exporter.submit(make_features(seed=1))
+        assert (exporter.writes, exporter.skipped) == (2, 1)
+
+    # The hash kept next to the file carries over to a new exporter
+    with FeatureExporter(path, background=False) as exporter:
+        exporter.submit(make_features(seed=1))
+        assert (exporter.writes, exporter.skipped) == (0, 1)
+        path.unlink()
+        exporter.submit(make_features(seed=1))
+        assert exporter.writes == 1
+    pd.testing.assert_frame_equal(pd.read_pickle(path), make_features(seed=1))
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        FeatureExporter(tmp_path / 'features.pkl', format='xlsx')
+
+
+def test_engine_exports_the_features_it_backtests(tmp_path):
+    path = tmp_path / 'features.pkl'
+    strategy = NetworkMetricsStrategy(dict(PARAMS))
+    with FeatureExporter(path) as exporter:
+        engine = BacktestingEngine(str(DATA_PATH), feature_export=exporter)
+        engine.run_backtest(strategy, execution='vectorized')
+
+    # The export holds the features before the missing values are filled
+    data = engine.data_loader.load_all_data()
+    expected = DataPreprocessor().create_features(data['market'], data['network'], data['miner'],
+                                                  columns=strategy.required_features)
+    exported = pd.read_pickle(path)
+    assert exported.isna().any().any()
+    pd.testing.assert_frame_equal(exported.fillna(exported.mean(numeric_only=True)), expected)
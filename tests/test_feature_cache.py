@@ -0,0 +1,113 @@
+import os
+
+import numpy as np
+import pandas as pd
+from backtesting_framework.data import preprocessor as preprocessor_module
+from backtesting_framework.data.feature_cache import FeatureCache
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from support import DATA_PATH
+
+
+def frame(value):
+    return pd.DataFrame({'a': np.full(3, float(value))})
+
+
+def age(path, seconds):
+    """Move a file's modification time seconds into the past"""
+    mtime_ns = path.stat().st_mtime_ns - seconds * 10**9
+    os.utime(path, ns=(mtime_ns, mtime_ns))
+
+
+def test_memory_hits_return_copies():
+    cache = FeatureCache(max_entries=2)
+    cache.put('a', frame(1))
+
+    cached = cache.get('a')
+    pd.testing.assert_frame_equal(cached, frame(1))
+    cached.iloc[0, 0] = -1.0
+    pd.testing.assert_frame_equal(cache.get('a'), frame(1))
+    assert cache.get('b') is None
+    assert cache.info() == {'memory_hits': 2, 'disk_hits': 0, 'misses': 1,
+                            'hits': 2, 'entries': 1}
+
+
+def test_memory_keeps_the_most_recently_used():
+    cache = FeatureCache(max_entries=2)
+    cache.put('a', frame(1))
+    cache.put('b', frame(2))
+    cache.get('a')
+    cache.put('c', frame(3))
+
+    assert cache.get('b') is None
+    pd.testing.assert_frame_equal(cache.get('a'), frame(1))
+    pd.testing.assert_frame_equal(cache.get('c'), frame(3))
+
+
+def test_disk_hits_across_instances(tmp_path):
+    FeatureCache(cache_dir=tmp_path).put('a', frame(1))
+
+    cache = FeatureCache(cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(cache.get('a'), frame(1))
+    pd.testing.assert_frame_equal(cache.get('a'), frame(1))
+    assert (cache.stats['disk_hits'], cache.stats['memory_hits']) == (1, 1)
+
+
+def test_corrupt_disk_entries_are_misses(tmp_path):
+    (tmp_path / 'a.pkl').write_bytes(b'not a pickle')
+    cache = FeatureCache(cache_dir=tmp_path)
+
+    assert cache.get('a') is None
+    cache.put('a', frame(1))
+    pd.testing.assert_frame_equal(FeatureCache(cache_dir=tmp_path).get('a'), frame(1))
+
+
+def test_disk_keeps_the_most_recently_used(tmp_path):
+    cache = FeatureCache(max_entries=1, cache_dir=tmp_path, max_disk_entries=2)
+    cache.put('a', frame(1))
+    age(tmp_path / 'a.pkl', 20)
+    cache.put('b', frame(2))
+    age(tmp_path / 'b.pkl', 10)
+
+    # A disk hit on 'a' makes 'b' the least recently used
+    cache.clear()
+    cache.get('a')
+    cache.put('c', frame(3))
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['a.pkl', 'c.pkl']
+
+
+def test_disk_without_a_limit_keeps_everything(tmp_path):
+    cache = FeatureCache(cache_dir=tmp_path, max_disk_entries=None)
+    for key in 'abcd':
+        cache.put(key, frame(1))
+    assert len(list(tmp_path.glob('*.pkl'))) == 4
+
+
+def test_preprocessor_reuses_cached_features(tmp_path):
+    data = DataLoader(str(DATA_PATH)).load_all_data()
+    inputs = (data['market'], data['network'], data['miner'])
+
+    preprocessor = DataPreprocessor(cache_dir=tmp_path)
+    features = preprocessor.create_features(*inputs)
+    pd.testing.assert_frame_equal(preprocessor.create_features(*inputs), features)
+    assert preprocessor.cache_info()['memory_hits'] == 1
+
+    other = DataPreprocessor(cache_dir=tmp_path)
+    pd.testing.assert_frame_equal(other.create_features(*inputs), features)
+    assert other.cache_info()['disk_hits'] == 1
+
+    # Different fill settings are different features
+    causal = DataPreprocessor(cache_dir=tmp_path, fill_method='ffill')
+    causal.create_features(*inputs)
+    assert causal.cache_info()['misses'] == 1
+
+
+def test_feature_spec_version_is_part_of_the_key(monkeypatch):
+    data = DataLoader(str(DATA_PATH)).load_all_data()
+    preprocessor = DataPreprocessor()
+    key = preprocessor.feature_key(data['market'], data['network'], data['miner'])
+    assert preprocessor.feature_key(data['market'], data['network'], data['miner']) == key
+
+    monkeypatch.setattr(preprocessor_module, 'FEATURE_SPEC_VERSION',
+                        preprocessor_module.FEATURE_SPEC_VERSION + 1)
+    assert preprocessor.feature_key(data['market'], data['network'], data['miner']) != key
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.features import FEATURES, Feature, FeaturePipeline
+from backtesting_framework.data.loader import DataLoader
+from support import DATA_PATH
+
+
+def constant(value):
+    return lambda *series: series[0] * 0 + value
+
+
+def make_inputs(rows=30):
+    index = pd.Index(1577836800000 + 86400000 * np.arange(rows), name='start_time')
+    rng = np.random.default_rng(0)
+    market = pd.DataFrame({'price_usd_close': 100 + rng.random(rows)}, index=index)
+    network = {
+        'AddressesCount': pd.DataFrame({'tokens_transferred_total': rng.random(rows)}, index=index),
+        'Velocity': pd.DataFrame({'velocity_supply_total': rng.random(rows // 2)},
+                                 index=index[::2])
+    }
+    miner = {'HashRate': pd.DataFrame({'v': rng.random(rows)}, index=index)}
+    return market, network, miner
+
+
+def test_every_feature_comes_after_its_dependencies():
+    levels = FeaturePipeline().resolve()
+    level_of = {name: i for i, level in enumerate(levels) for name in level}
+
+    assert sorted(level_of) == sorted(FEATURES)
+    for name, feature in FEATURES.items():
+        assert all(level_of[dep] < level_of[name] for dep in feature.depends)
+        # Each feature sits on the first level its dependencies allow
+        assert level_of[name] == 1 + max((level_of[dep] for dep in feature.depends), default=-1)
+
+
+def test_resolve_keeps_only_what_is_needed_in_registry_order():
+    pipeline = FeaturePipeline()
+    assert pipeline.resolve(['volatility']) == [['price_close'], ['returns'], ['volatility']]
+    assert pipeline.resolve(['hash_rate_growth', 'log_returns', 'price_usd_close']) == \
+        [['price_close', 'hash_rate'], ['log_returns', 'hash_rate_growth']]
+
+
+def test_resolve_rejects_cycles_and_unknown_dependencies():
+    cyclic = {
+        'a': Feature('a', ('c',), constant(1)),
+        'b': Feature('b', ('a',), constant(2)),
+        'c': Feature('c', ('b',), constant(3)),
+    }
+    with pytest.raises(ValueError, match='cycle: a -> c -> b -> a'):
+        FeaturePipeline(cyclic).resolve()
+
+    dangling = {'a': Feature('a', ('missing',), constant(1))}
+    with pytest.raises(ValueError, match="Unknown feature 'missing'"):
+        FeaturePipeline(dangling).resolve()
+
+
+def test_compute_matches_the_feature_formulas():
+    market, network, miner = make_inputs()
+    values = FeaturePipeline().compute(market, network, miner)
+
+    price = market['price_usd_close']
+    returns = price.pct_change()
+    expected = {
+        'returns': returns,
+        'log_returns': np.log(price).diff(),
+        'volatility': returns.rolling(window=20).std(),
+        'active_addresses': network['AddressesCount']['tokens_transferred_total'],
+        'address_growth': network['AddressesCount']['tokens_transferred_total'].pct_change(),
+        'network_velocity': network['Velocity']['velocity_supply_total'].reindex(market.index),
+        'hash_rate': miner['HashRate']['v'],
+        'hash_rate_growth': miner['HashRate']['v'].pct_change(),
+    }
+    # Registry order, without the internal price_close input
+    assert list(values) == list(expected)
+    for name, series in expected.items():
+        pd.testing.assert_series_equal(values[name], series, check_names=False)
+
+
+def test_compute_skips_features_of_missing_frames():
+    market, network, miner = make_inputs()
+    values = FeaturePipeline().compute(market, network, {}, ['hash_rate_growth', 'returns'])
+    assert list(values) == ['returns']
+
+
+def test_compute_rejects_unknown_columns():
+    market, network, miner = make_inputs()
+    with pytest.raises(ValueError, match='not_a_feature'):
+        FeaturePipeline().compute(market, network, miner, ['returns', 'not_a_feature'])
+
+
+def test_threaded_levels_match_serial():
+    data = DataLoader(str(DATA_PATH)).load_all_data()
+    inputs = (data['market'], data['network'], data['miner'])
+    serial = FeaturePipeline().compute(*inputs)
+    threaded = FeaturePipeline(max_workers=4).compute(*inputs)
+
+    assert list(threaded) == list(serial)
+    for name in serial:
+        pd.testing.assert_series_equal(threaded[name], serial[name])
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.imputation import CausalImputer
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, PARAMS
+
+
+def make_gappy(rows=200, seed=0):
+    rng = np.random.default_rng(seed)
+    values = rng.standard_normal((rows, 3))
+    values[rng.random((rows, 3)) < 0.3] = np.nan
+    values[:5, 0] = np.nan  # Leading gap
+    values[50:90, 1] = np.nan  # Gap longer than the rolling window
+    return pd.DataFrame({
+        'a': values[:, 0], 'b': values[:, 1], 'c': values[:, 2],
+        'count': rng.integers(0, 10, rows),
+        'date_x': ['2020-01-01'] * rows,
+        'start_time': np.arange(rows, dtype=float)
+    }, index=pd.Index(1577836800000 + np.arange(rows) * 3600000, name='start_time'))
+
+
+def pandas_fill(series, method, window):
+    if method == 'ffill':
+        return series.ffill()
+    if method == 'expanding_mean':
+        return series.fillna(series.expanding().mean().shift(1))
+    return series.fillna(series.shift(1).rolling(window, min_periods=1).median())
+
+
+@pytest.mark.parametrize('method', CausalImputer.METHODS)
+def test_fill_only_looks_back(method):
+    features = make_gappy()
+    filled = CausalImputer(method, window=20).fill(features)
+
+    for col in ('a', 'b', 'c'):
+        np.testing.assert_allclose(filled[col], pandas_fill(features[col], method, 20),
+                                   rtol=1e-12)
+    # Excluded and integer columns are left alone
+    for col in ('count', 'date_x', 'start_time'):
+        pd.testing.assert_series_equal(filled[col], features[col])
+    assert np.isnan(filled['a'].iloc[:5]).all()
+
+
+@pytest.mark.parametrize('method', CausalImputer.METHODS)
+@pytest.mark.parametrize('chunk_size', [1, 3, 19, 64, 1000])
+def test_chunks_fill_like_one_batch(method, chunk_size):
+    features = make_gappy()
+    expected = CausalImputer(method, window=20).fill(features)
+
+    imputer = CausalImputer(method, window=20)
+    chunks = [imputer.transform(features.iloc[start:start + chunk_size])
+              for start in range(0, len(features), chunk_size)]
+    pd.testing.assert_frame_equal(pd.concat(chunks), expected, check_exact=True)
+
+    # fill() starts over, whatever was seen before
+    pd.testing.assert_frame_equal(imputer.fill(features), expected, check_exact=True)
+
+
+def test_invalid_settings_are_rejected():
+    with pytest.raises(ValueError, match='fill method'):
+        CausalImputer('mean')
+    with pytest.raises(ValueError, match='window'):
+        CausalImputer('rolling_median', window=0)
+
+
+def test_engine_passes_the_fill_options_on():
+    engine = BacktestingEngine(str(DATA_PATH), fill_method='rolling_median', fill_window=5)
+    assert (engine.preprocessor.fill_method, engine.preprocessor.fill_window) == \
+        ('rolling_median', 5)
+
+    data = DataLoader(str(DATA_PATH)).load_all_data()
+    expected = DataPreprocessor(fill_method='rolling_median', fill_window=5).create_features(
+        data['market'], data['network'], data['miner'])
+    features = engine.preprocessor.create_features(data['market'], data['network'],
+                                                   data['miner'])
+    pd.testing.assert_frame_equal(features, expected)
+    engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS)), execution='vectorized')
+
+    with pytest.raises(ValueError, match='fill method'):
+        BacktestingEngine(str(DATA_PATH), fill_method='median')
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.features import FEATURES, Feature, FeaturePipeline
+from backtesting_framework.data.incremental import (IncrementalFeatureEngine, LogDiff, PctChange,
+                                                    RollingMean, RollingStd, RollingZScore)
+from backtesting_framework.ichiboss_utils import Ichiboss
+from backtesting_framework.data.loader import DataLoader
+from support import DATA_PATH
+
+# Gaps, zeros, infinities, negatives and runs of repeated values
+EDGE_VALUES = np.array([np.nan, 1.0, 2.0, np.nan, np.nan, 0.0, 3.0, 3.0, 3.0, 3.0,
+                        -1.0, np.inf, 5.0, 1e12, 1e-12, 2.0, np.nan, 7.0, 7.0, 0.5] * 3)
+
+
+@pytest.fixture(scope='module')
+def data():
+    return DataLoader(str(DATA_PATH)).load_all_data()
+
+
+def batch_features(data, columns=None):
+    """Features as create_features builds them before filling gaps"""
+    features = data['market'].copy()
+    for name, values in FeaturePipeline().compute(data['market'], data['network'],
+                                                  data['miner'], columns).items():
+        features[name] = values
+    return features
+
+
+def in_chunks(data, chunk_size):
+    market = data['market']
+    for first in range(0, len(market), chunk_size):
+        chunk = market.iloc[first:first + chunk_size]
+        start, stop = chunk.index[0], chunk.index[-1]
+        yield (chunk,
+               {name: frame.loc[start:stop] for name, frame in data['network'].items()},
+               {name: frame.loc[start:stop] for name, frame in data['miner'].items()})
+
+
+@pytest.mark.parametrize('make_op, batch', [
+    (PctChange, lambda s: s.pct_change()),
+    (LogDiff, lambda s: np.log(s).diff()),
+    (lambda: RollingMean(window=4), lambda s: s.rolling(window=4).mean()),
+    (lambda: RollingStd(window=4), lambda s: s.rolling(window=4).std()),
+    (lambda: RollingStd(window=1), lambda s: s.rolling(window=1).std()),
+], ids=['pct_change', 'log_diff', 'rolling_mean', 'rolling_std', 'rolling_std_1'])
+def test_ops_match_pandas_exactly(make_op, batch):
+    with np.errstate(divide='ignore', invalid='ignore'):
+        expected = batch(pd.Series(EDGE_VALUES)).to_numpy()
+
+    op = make_op()
+    np.testing.assert_array_equal([op.update(value) for value in EDGE_VALUES], expected)
+    if hasattr(op, 'update_many'):
+        op = make_op()
+        chunks = np.array_split(EDGE_VALUES, [1, 7, 8, 30])
+        np.testing.assert_array_equal(np.concatenate([op.update_many(c) for c in chunks]),
+                                      expected)
+
+
+def test_bar_by_bar_matches_batch(data):
+    engine = IncrementalFeatureEngine()
+    features = engine.run(data['market'], data['network'], data['miner'])
+
+    pd.testing.assert_frame_equal(features, batch_features(data), check_exact=True)
+    assert engine.bars == len(data['market'])
+
+
+@pytest.mark.parametrize('chunk_size', [13, 365, 100000])
+def test_chunks_match_batch(data, chunk_size):
+    engine = IncrementalFeatureEngine()
+    features = pd.concat(engine.update_chunk(*chunk) for chunk in in_chunks(data, chunk_size))
+
+    pd.testing.assert_frame_equal(features, batch_features(data), check_exact=True)
+
+
+def test_requested_columns_only(data):
+    columns = ['volatility', 'hash_rate_growth']
+    engine = IncrementalFeatureEngine(columns)
+    features = pd.concat(engine.update_chunk(*chunk) for chunk in in_chunks(data, 500))
+
+    assert engine.output == columns
+    pd.testing.assert_frame_equal(features, batch_features(data, columns), check_exact=True)
+
+
+def test_features_without_a_streaming_op_are_rejected():
+    registry = dict(FEATURES, smoothed=Feature('smoothed', ('returns',),
+                                               lambda returns: returns.ewm(span=5).mean()))
+    with pytest.raises(ValueError, match='smoothed'):
+        IncrementalFeatureEngine(['smoothed'], registry)
+
+
+def pandas_z_score(series, window):
+    """Ichiboss.z_score as it was computed with pandas"""
+    roll = series.rolling(window, min_periods=1)
+    return (roll.mean() - series) / roll.std()
+
+
+@pytest.mark.parametrize('window', [1, 2, 5, 30])
+def test_rolling_z_score_is_bit_identical_to_pandas(window):
+    rng = np.random.default_rng(0)
+    random_walk = np.cumsum(rng.standard_normal(500)) * 1e3
+    for values in (EDGE_VALUES, random_walk, np.concatenate([random_walk, EDGE_VALUES])):
+        expected = pandas_z_score(pd.Series(values), window).to_numpy()
+
+        scores = RollingZScore(window)
+        np.testing.assert_array_equal([scores.update(value) for value in values], expected)
+        scores = RollingZScore(window)
+        chunks = np.array_split(values, [3, 4, 50, 51])
+        np.testing.assert_array_equal(np.concatenate([scores.extend(c) for c in chunks]),
+                                      expected)
+        assert scores.count == len(values)
+
+
+def test_ichiboss_z_score_keeps_the_series_labels():
+    series = pd.Series(EDGE_VALUES, index=pd.RangeIndex(100, 100 + len(EDGE_VALUES)),
+                       name='netflow')
+    pd.testing.assert_series_equal(Ichiboss.z_score(series, 5), pandas_z_score(series, 5))
@@ -0,0 +1,81 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from backtesting_framework.execution.order_manager import OrderManager
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, PARAMS
+
+FILLS = [
+    # symbol, type, quantity, price, timestamp (ms)
+    ('BTC', 'buy', 0.5, 7200.0, 1577836800000),
+    ('BTC', 'sell', 0.25, 7300.5, 1577923200000),
+    ('ETH', 'buy', 10.0, 130.25, 1577923200000),
+    ('BTC', 'sell', 0.25, 7100.0, 1578009600123),
+    ('ETH', 'sell', 10.0, 140.0, 1578096000000),
+]
+
+
+def list_history(fills):
+    """The trade history as the list of dicts OrderManager used to keep"""
+    return [{
+        'timestamp': datetime.fromtimestamp(timestamp / 1000),
+        'symbol': symbol,
+        'type': order_type,
+        'quantity': quantity,
+        'price': price,
+        'value': quantity * price
+    } for symbol, order_type, quantity, price, timestamp in fills]
+
+
+def test_orders_match_the_list_history():
+    manager = OrderManager()
+    manager.ledger = type(manager.ledger)(capacity=2)  # Grows twice
+    for symbol, order_type, quantity, price, timestamp in FILLS:
+        order = manager.create_order(symbol, order_type, quantity, price, timestamp)
+        assert manager.execute_order(order, price)
+
+    pd.testing.assert_frame_equal(manager.get_trade_history(),
+                                  pd.DataFrame(list_history(FILLS)))
+    assert manager.trade_history == list_history(FILLS)
+    assert manager.get_all_positions() == {'BTC': 0.0, 'ETH': 0.0}
+
+
+def test_batched_fills_match_the_list_history():
+    manager = OrderManager()
+    symbols, order_types, quantities, prices, timestamps = zip(*FILLS)
+    assert manager.execute_fills(list(symbols), order_types, quantities, prices,
+                                 np.array(timestamps)) == len(FILLS)
+    assert manager.execute_fills('BTC', [], [], [], []) == 0
+
+    pd.testing.assert_frame_equal(manager.get_trade_history(),
+                                  pd.DataFrame(list_history(FILLS)))
+    assert manager.get_all_positions() == {'BTC': 0.0, 'ETH': 0.0}
+
+
+def test_empty_history_has_the_ledger_columns():
+    history = OrderManager().get_trade_history()
+    assert len(history) == 0
+    assert list(history.columns) == ['timestamp', 'symbol', 'type', 'quantity', 'price', 'value']
+
+
+def test_returned_histories_are_copies():
+    manager = OrderManager()
+    order = manager.create_order(*FILLS[0][:4], FILLS[0][4])
+    manager.execute_order(order, FILLS[0][3])
+
+    history = manager.get_trade_history()
+    history.loc[0, 'quantity'] = -1.0
+    history['extra'] = 1
+    pd.testing.assert_frame_equal(manager.get_trade_history(),
+                                  pd.DataFrame(list_history(FILLS[:1])))
+
+
+def test_backtest_results_can_be_modified():
+    engine = BacktestingEngine(str(DATA_PATH))
+    results = engine.run_backtest(NetworkMetricsStrategy(dict(PARAMS)), execution='vectorized')
+    expected = results['trade_history'].copy()
+
+    results['trade_history']['price'] = 0.0
+    pd.testing.assert_frame_equal(engine.order_manager.get_trade_history(), expected)
@@ -0,0 +1,108 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.analysis.metrics import PerformanceMetrics
+
+DAY_MS = 24 * 3600 * 1000
+START = 1672531200000
+
+
+def make_market(days=30, seed=0):
+    rng = np.random.default_rng(seed)
+    index = pd.Index(START + np.arange(days * 24) * 3600000, name='start_time')
+    return pd.DataFrame({'price_usd_close': 100 + rng.normal(0, 1, len(index)).cumsum()},
+                        index=index)
+
+
+def make_trades(count=40, days=30, seed=1):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'timestamp': START + rng.integers(0, days * DAY_MS, count),
+        'symbol': 'BTC',
+        'type': rng.choice(['buy', 'sell'], count),
+        'quantity': rng.uniform(0.1, 2.0, count),
+        'price': rng.uniform(90, 110, count),
+    }).assign(value=lambda df: df['quantity'] * df['price'])
+
+
+def loop_returns(trade_history, market_data, initial_capital):
+    """The original day-by-day calculate_returns"""
+    market_data = market_data.copy()
+    market_data.index = pd.to_datetime(market_data.index, unit='ms')
+    trade_history = trade_history.sort_values('timestamp')
+    trade_dates = pd.to_datetime(trade_history['timestamp'], unit='ms')
+    portfolio_value, portfolio_holdings = initial_capital, 0
+    daily_values, dates = [], []
+    for date in pd.date_range(market_data.index.min(), market_data.index.max(), freq='D'):
+        for _, trade in trade_history[trade_dates.dt.date == date.date()].iterrows():
+            if trade['type'] == 'buy':
+                portfolio_value -= trade['quantity'] * trade['price']
+                portfolio_holdings += trade['quantity']
+            else:
+                portfolio_value += trade['quantity'] * trade['price']
+                portfolio_holdings -= trade['quantity']
+        closest = market_data.index[market_data.index.get_indexer([date], method='nearest')][0]
+        daily_values.append(portfolio_value +
+                            portfolio_holdings * market_data.loc[closest]['price_usd_close'])
+        dates.append(date)
+    return pd.Series(daily_values, index=dates).pct_change().fillna(0)
+
+
+@pytest.mark.parametrize('seed', [1, 2, 3])
+def test_vectorized_returns_match_loop(seed):
+    market, trades = make_market(), make_trades(seed=seed)
+    expected = loop_returns(trades, market, 100000)
+    returns = PerformanceMetrics(trades, market, 100000).calculate_returns()
+
+    assert list(returns.index) == list(expected.index)
+    np.testing.assert_allclose(returns.to_numpy(), expected.to_numpy(), rtol=1e-12, atol=0)
+
+
+def test_returns_without_trades_are_zero():
+    market = make_market(days=3)
+    metrics = PerformanceMetrics(make_trades(count=0), market, 1000)
+    assert (metrics.calculate_returns() == 0).all()
+    assert (metrics.equity_curve == 1000).all()
+
+
+def test_equity_curve_and_metrics_are_cached():
+    metrics = PerformanceMetrics(make_trades(), make_market(), 100000)
+    curve = metrics.equity_curve
+    assert metrics.equity_curve is curve
+    assert metrics.calculate_returns() is metrics.calculate_returns()
+
+    first = metrics.calculate_metrics()
+    first['total_trades'] = -1
+    assert metrics.calculate_metrics()['total_trades'] == 40
+
+
+@pytest.mark.parametrize('attribute, value', [
+    ('trade_history', make_trades(count=10, seed=5)),
+    ('market_data', make_market(seed=7)),
+    ('initial_capital', 50000),
+])
+def test_setters_invalidate_the_cache(attribute, value):
+    metrics = PerformanceMetrics(make_trades(), make_market(), 100000)
+    before_curve = metrics.equity_curve
+    before = metrics.calculate_metrics()
+
+    setattr(metrics, attribute, value)
+    rebuilt = PerformanceMetrics(
+        value if attribute == 'trade_history' else make_trades(),
+        value if attribute == 'market_data' else make_market(),
+        value if attribute == 'initial_capital' else 100000
+    )
+    assert metrics.equity_curve is not before_curve
+    pd.testing.assert_series_equal(metrics.equity_curve, rebuilt.equity_curve)
+    assert metrics.calculate_metrics() == rebuilt.calculate_metrics()
+    assert metrics.calculate_metrics() != before
+
+
+def test_invalidate_after_in_place_edit():
+    trades = make_trades()
+    metrics = PerformanceMetrics(trades, make_market(), 100000)
+    before = metrics.calculate_metrics()
+    metrics.trade_history.loc[:, 'price'] *= 2
+    assert metrics.calculate_metrics() == before
+    metrics.invalidate()
+    assert metrics.calculate_metrics() != before
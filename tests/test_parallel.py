@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.optimization.parallel import ParallelBacktestRunner, RESULT_COLUMNS
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, PARAMS, FailingStrategy
+
+
+def test_run_matches_engine_for_any_worker_count(tmp_path):
+    runs = [
+        {'strategy_cls': NetworkMetricsStrategy, 'params': None},
+        {'strategy_cls': NetworkMetricsStrategy, 'params': dict(PARAMS),
+         'start_timestamp': 1577836800000}
+    ]
+    results = []
+    for workers in (1, 2):
+        with ParallelBacktestRunner(str(DATA_PATH), max_workers=workers,
+                                    work_dir=tmp_path) as runner:
+            results.append(runner.run(runs))
+    pd.testing.assert_frame_equal(results[0], results[1])
+
+    expected = BacktestingEngine(str(DATA_PATH)).run_backtest(
+        NetworkMetricsStrategy(dict(PARAMS)), 1577836800000, execution='vectorized')
+    assert results[0].loc[1, 'final_capital'] == expected['final_capital']
+    assert results[0].loc[1, 'total_trades'] == expected['metrics']['total_trades']
+    # The shared files are gone once the runner is closed
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_run_without_runs_returns_empty_frame(tmp_path):
+    runner = ParallelBacktestRunner(str(DATA_PATH), work_dir=tmp_path)
+    results = runner.run([])
+    assert len(results) == 0
+    assert list(results.columns) == RESULT_COLUMNS
+    assert results.index.name == 'run_id'
+
+
+def test_failed_run_removes_shared_files(tmp_path):
+    runner = ParallelBacktestRunner(str(DATA_PATH), max_workers=1, work_dir=tmp_path)
+    with pytest.raises(RuntimeError, match="signal generation failed"):
+        runner.run([{'strategy_cls': FailingStrategy, 'params': None}])
+    assert list(tmp_path.iterdir()) == []
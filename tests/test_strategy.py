@@ -0,0 +1,52 @@
+import pandas as pd
+import pytest
+from backtesting_framework.strategies.base import BarView, Strategy
+from support import SingleRowSizingStrategy, make_features
+
+
+class RisingStrategy(Strategy):
+    """Buys after a rising close and sells after a falling one"""
+
+    def next(self, bar):
+        previous, current = (bar.history('price_usd_close', 2) + [None])[:2]
+        if current is None:
+            return 0
+        return 1 if current > previous else -1
+
+
+def test_strategy_without_signals_is_rejected():
+    with pytest.raises(TypeError, match='must implement next\\(\\) or generate_signals\\(\\)'):
+        class EmptyStrategy(Strategy):
+            def calculate_position_size(self, signals, portfolio_value):
+                return signals
+
+
+def test_abstract_bases_defer_the_check():
+    class ThresholdStrategy(Strategy, abstract=True):
+        threshold = 0.0
+
+    class ConcreteStrategy(ThresholdStrategy):
+        def next(self, bar):
+            return 1 if bar['price_usd_close'] > self.threshold else 0
+
+    assert ConcreteStrategy().generate_signals(make_features(10))['signal'].eq(1).all()
+
+    with pytest.raises(TypeError):
+        class IncompleteStrategy(ThresholdStrategy):
+            pass
+
+
+def test_next_only_strategies_generate_signals_bar_by_bar():
+    features = make_features(50)
+    signals = RisingStrategy().generate_signals(features)
+
+    rising = features['price_usd_close'].diff()
+    expected = (rising > 0).astype(int) - (rising <= 0).astype(int)
+    expected.iloc[0] = 0
+    pd.testing.assert_series_equal(signals['signal'].astype(int), expected,
+                                   check_names=False)
+
+
+def test_vectorized_only_strategies_have_no_next():
+    with pytest.raises(NotImplementedError, match='SingleRowSizingStrategy'):
+        SingleRowSizingStrategy().next(BarView(make_features(5)))
@@ -0,0 +1,42 @@
+import pytest
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.optimization.sweep import ParameterSweep
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, CappedSizingStrategy, SingleRowSizingStrategy
+
+GRID = {
+    'address_threshold': [0.01, 0.05],
+    'velocity_threshold': [0.05, 0.1],
+    'position_size': [0.1, 0.5]
+}
+METRICS = ['total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate',
+           'total_trades', 'avg_trade_return', 'final_capital']
+# 2023, to keep the loop runs short
+START, END = 1672531200000, 1704067199000
+
+
+@pytest.mark.parametrize('strategy_cls', [
+    NetworkMetricsStrategy, CappedSizingStrategy, SingleRowSizingStrategy
+])
+def test_sweep_rows_match_run_backtest(strategy_cls):
+    sweep = ParameterSweep(str(DATA_PATH), strategy_cls)
+    results = sweep.run(GRID, START, END)
+    assert len(results) == 8
+    assert (results['total_trades'] > 0).all()
+
+    for _, row in results.iterrows():
+        params = {key: row[key] for key in sweep.strategy_cls().params}
+        expected = BacktestingEngine(str(DATA_PATH)).run_backtest(
+            strategy_cls(params), START, END, execution='loop'
+        )
+        expected = {**expected['metrics'], 'final_capital': expected['final_capital']}
+        for name in METRICS:
+            assert row[name] == pytest.approx(expected[name], rel=1e-9), (params, name)
+
+
+def test_sweep_reuses_features_and_metrics_inputs():
+    sweep = ParameterSweep(str(DATA_PATH))
+    features = sweep.prepare()
+    assert sweep.prepare() is features
+    results = sweep.run({'position_size': [0.1, 0.2]})
+    assert list(results['position_size'].sort_values()) == [0.1, 0.2]
@@ -0,0 +1,116 @@
+import asyncio
+import csv
+import os
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+import sync
+from api.client import CybotradeClient
+from api.endpoints import ENDPOINTS
+
+DAY_MS = 24 * 60 * 60 * 1000
+START = 1704067200000  # 2024 01 01
+ENDPOINT = ENDPOINTS['velocity']
+
+
+def write_csv(path, header, rows, newline_at_end=True):
+    lines = [','.join(header)] + [','.join(str(value) for value in row) for row in rows]
+    path.write_text('\n'.join(lines) + ('\n' if newline_at_end else ''))
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def run_sync(datasource, data_dir):
+    async def _sync():
+        async with CybotradeClient(base_url=datasource.base_url, backoff=0) as client:
+            return await sync.sync(['velocity'], data_dir, client)
+    return asyncio.run(_sync())
+
+
+def test_read_watermark_takes_the_latest_start_time(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, ['start_time', 'v'], [[3, 1], [5.0, 2], [4, 3], ['', 4]])
+    assert sync.read_watermark(path) == 5
+
+    write_csv(path, ['start_time', 'v'], [])
+    assert sync.read_watermark(path) is None
+
+
+def test_manifest_watermark_is_used_until_the_file_changes(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, ['start_time', 'v'], [[1, 1], [2, 2]])
+    stat = path.stat()
+    entry = {'watermark': 99, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+    assert sync.current_watermark(path, entry) == 99
+    assert sync.current_watermark(path, None) == 2
+
+    write_csv(path, ['start_time', 'v'], [[1, 1], [3, 3]])
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert sync.current_watermark(path, entry) == 3
+    assert sync.current_watermark(tmp_path / 'missing.csv', entry) is None
+
+
+def test_append_new_rows_keeps_existing_bytes(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, ['start_time', 'v', 'extra'], [[1, 1, 'a'], [2, 2, 'b']], newline_at_end=False)
+    existing = path.read_bytes()
+    new_rows_path = tmp_path / 'new.csv'
+    write_csv(new_rows_path, ['v', 'start_time'], [[20, 2], [30, 3], [40, 4]])
+
+    assert sync.append_new_rows(path, new_rows_path, 2) == (2, 4)
+    assert path.read_bytes().startswith(existing + b'\n')
+    # New rows follow the existing column order; missing columns stay empty
+    assert read_rows(path)[2:] == [{'start_time': '3', 'v': '30', 'extra': ''},
+                                   {'start_time': '4', 'v': '40', 'extra': ''}]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['data.csv', 'new.csv']
+
+
+def test_append_new_rows_without_new_data_leaves_the_file_alone(tmp_path):
+    path = tmp_path / 'data.csv'
+    write_csv(path, ['start_time', 'v'], [[1, 1], [2, 2]])
+    mtime_ns = path.stat().st_mtime_ns
+    new_rows_path = tmp_path / 'new.csv'
+    write_csv(new_rows_path, ['start_time', 'v'], [[1, 1], [2, 2]])
+
+    assert sync.append_new_rows(path, new_rows_path, 2) == (0, 2)
+    assert path.stat().st_mtime_ns == mtime_ns
+
+
+def test_append_new_rows_creates_the_dataset(tmp_path):
+    path = tmp_path / 'data.csv'
+    new_rows_path = tmp_path / 'new.csv'
+    write_csv(new_rows_path, ['start_time', 'v'], [[1, 1], [2, 2]])
+
+    assert sync.append_new_rows(path, new_rows_path, None) == (2, 2)
+    assert read_rows(path) == [{'start_time': '1', 'v': '1'}, {'start_time': '2', 'v': '2'}]
+
+
+def test_sync_fetches_only_rows_past_the_watermark(datasource, tmp_path):
+    rows = [{'start_time': START + i * DAY_MS, 'v': float(i)} for i in range(5)]
+    datasource.rows[ENDPOINT.path] = rows
+
+    assert run_sync(datasource, tmp_path) == {'velocity': 5}
+    manifest = sync.load_manifest(tmp_path)
+    entry = manifest[ENDPOINT.dataset]
+    assert entry['watermark'] == rows[-1]['start_time']
+    assert entry['size'] == (tmp_path / ENDPOINT.dataset).stat().st_size
+
+    rows.extend({'start_time': START + i * DAY_MS, 'v': float(i)} for i in range(5, 8))
+    datasource.requests.clear()
+    assert run_sync(datasource, tmp_path) == {'velocity': 3}
+    assert min(int(query['start_time']) for _, query, _ in datasource.requests) == \
+        entry['watermark'] + 1
+    assert [int(row['start_time']) for row in read_rows(tmp_path / ENDPOINT.dataset)] == \
+        [row['start_time'] for row in rows]
+    assert sync.load_manifest(tmp_path)[ENDPOINT.dataset]['watermark'] == rows[-1]['start_time']
+
+    # Nothing new: nothing appended and no temporary files left behind
+    assert run_sync(datasource, tmp_path) == {'velocity': 0}
+    assert sorted(p.name for p in tmp_path.iterdir()) == \
+        sorted([ENDPOINT.dataset, sync.MANIFEST_FILE])
@@ -0,0 +1,100 @@
+import numpy as np
+import pandas as pd
+import pytest
+from backtesting_framework.data.loader import DataLoader
+from backtesting_framework.data.preprocessor import DataPreprocessor
+from backtesting_framework.main import BacktestingEngine
+from backtesting_framework.optimization.parallel import open_shared_frame
+from backtesting_framework.optimization.sweep import ParameterSweep
+from backtesting_framework.optimization.walk_forward import (
+    WalkForwardOptimizer, slice_frame, walk_forward_windows
+)
+from backtesting_framework.strategies.network_metrics_strategy import NetworkMetricsStrategy
+from support import DATA_PATH, FailingStrategy
+
+GRID = {'address_threshold': [0.005, 0.05], 'hash_rate_threshold': [0.01, 0.1]}
+
+
+def truncated_features(data, end, fill_method):
+    """Features built from the data up to and including end only"""
+    def until(frame):
+        return frame[frame.index <= end]
+    return DataPreprocessor(fill_method=fill_method).create_features(
+        until(data['market']),
+        {name: until(frame) for name, frame in data['network'].items()},
+        {name: until(frame) for name, frame in data['miner'].items()}
+    )
+
+
+def test_windows_roll_or_anchor():
+    index = pd.RangeIndex(10)
+    assert [(f['train_start'], f['train_stop'], f['test_stop'])
+            for f in walk_forward_windows(index, 4, 2)] == [(0, 4, 6), (2, 6, 8), (4, 8, 10)]
+    assert [(f['train_start'], f['train_stop'], f['test_stop'])
+            for f in walk_forward_windows(index, 4, 2, step=3, anchored=True)] == \
+        [(0, 4, 6), (0, 7, 9)]
+    assert walk_forward_windows(index, 8, 3) == []
+    with pytest.raises(ValueError):
+        walk_forward_windows(index, 0, 2)
+
+
+@pytest.mark.parametrize('fill_method', ['ffill', 'expanding_mean', 'rolling_median'])
+def test_train_features_do_not_depend_on_later_data(tmp_path, fill_method):
+    with WalkForwardOptimizer(DATA_PATH, work_dir=tmp_path, fill_method=fill_method) as optimizer:
+        features = open_shared_frame(optimizer.runner.prepare() / 'features').copy()
+    data = DataLoader(str(DATA_PATH)).load_all_data()
+
+    for fold in walk_forward_windows(features.index, 500, 250)[::3]:
+        train = features.iloc[fold['train_start']:fold['train_stop']]
+        expected = truncated_features(data, train.index[-1], fill_method)
+        pd.testing.assert_frame_equal(train, expected.loc[train.index, train.columns])
+
+
+def test_column_mean_fill_leaks_later_data():
+    data = DataLoader(str(DATA_PATH)).load_all_data()
+    full = DataPreprocessor(fill_method='mean').create_features(
+        data['market'], data['network'], data['miner'])
+    end = full.index[500]
+    truncated = truncated_features(data, end, 'mean')
+    assert not full.loc[:end, truncated.columns].equals(truncated)
+
+
+def test_folds_match_a_sweep_and_an_engine_run(tmp_path):
+    with WalkForwardOptimizer(DATA_PATH, max_workers=2, work_dir=tmp_path) as optimizer:
+        result = optimizer.run(GRID, train_size=500, test_size=500)
+        shared_dir = optimizer.runner.prepare()
+        features = open_shared_frame(shared_dir / 'features').copy()
+        market = open_shared_frame(shared_dir / 'market').copy()
+    folds = result['folds']
+    windows = walk_forward_windows(features.index, 500, 500)
+    assert list(folds.index) == [fold['fold'] for fold in windows] and len(windows) > 1
+
+    for fold in windows:
+        row = folds.loc[fold['fold']]
+        sweep = ParameterSweep(str(DATA_PATH), NetworkMetricsStrategy)
+        train = slice_frame(features, fold['train_start'], fold['train_stop'])
+        sweep.market_data = market.loc[train.index[0]:train.index[-1]]
+        best = sweep.run_on_features(train, GRID).iloc[0]
+        assert row['train_sharpe_ratio'] == best['sharpe_ratio']
+        params = {key: row[key] for key in NetworkMetricsStrategy().params}
+        assert params == {key: best[key] for key in params}
+
+        test = slice_frame(features, fold['test_start'], fold['test_stop'])
+        expected = BacktestingEngine(str(DATA_PATH)).run_backtest_on_features(
+            NetworkMetricsStrategy(params), test, market.loc[test.index[0]:test.index[-1]],
+            execution='loop')
+        assert row['final_capital'] == pytest.approx(expected['final_capital'], rel=1e-9)
+        assert row['total_trades'] == expected['metrics']['total_trades']
+
+    equity = result['equity_curve']
+    assert equity.index.is_monotonic_increasing
+    assert np.isfinite(equity.to_numpy()).all()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_failed_folds_remove_the_shared_files(tmp_path):
+    optimizer = WalkForwardOptimizer(DATA_PATH, FailingStrategy, max_workers=1,
+                                     work_dir=tmp_path)
+    with pytest.raises(RuntimeError, match='signal generation failed'):
+        optimizer.run(GRID, train_size=1000, test_size=1000)
+    assert list(tmp_path.iterdir()) == []